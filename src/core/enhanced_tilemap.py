@@ -16,6 +16,19 @@ from .tile_indexer import TileIndexer
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Category codes stored in EnhancedTileset.cat_lut, 0 for any other type
+CATEGORY_OTHER = 0
+CATEGORY_GRASS = 1
+CATEGORY_TREES = 2
+CATEGORY_HOUSES = 3
+CATEGORY_DOORS = 4
+CATEGORY_CODES = {
+    "grass": CATEGORY_GRASS,
+    "trees": CATEGORY_TREES,
+    "houses": CATEGORY_HOUSES,
+    "doors": CATEGORY_DOORS,
+}
+
 # Add Perlin noise implementation for coherent map generation
 class PerlinNoise:
     """Simple implementation of Perlin noise for 2D map generation."""
@@ -205,6 +218,24 @@ class EnhancedTileset:
                     self.id_to_type[tile_id] = category
                     self.id_to_path[tile_id] = tile_path
                     self.type_to_ids[category].append(tile_id)
+        
+        # Category code per tile ID; the extra last slot stays CATEGORY_OTHER
+        # and absorbs IDs the tileset doesn't know
+        self.cat_lut = np.zeros(max(self.id_to_type, default=0) + 2, dtype=np.int8)
+        for tile_id, category in self.id_to_type.items():
+            self.cat_lut[tile_id] = CATEGORY_CODES.get(category, CATEGORY_OTHER)
+    
+    def get_category_codes(self, tiles) -> np.ndarray:
+        """Look up the category code of every tile in a grid.
+        
+        Args:
+            tiles: Grid of tile IDs
+            
+        Returns:
+            int8 array of CATEGORY_* codes with the same shape as tiles
+        """
+        tiles = np.asarray(tiles)
+        return self.cat_lut[np.minimum(tiles, len(self.cat_lut) - 1)]
     
     def get_tile(self, tile_id: int) -> Optional[pygame.Surface]:
         """Get a tile surface by its ID.
@@ -266,7 +297,7 @@ class EnhancedTileMap:
         self.width = width
         self.height = height
         self.tile_size = tile_size
-        self.map_data: List[List[int]] = [[0 for _ in range(width)] for _ in range(height)]
+        self.map_data: np.ndarray = np.zeros((height, width), dtype=np.uint16)
         self.tileset: Optional[EnhancedTileset] = None
         self.layers: Dict[str, List[List[Optional[int]]]] = {}
     
@@ -287,7 +318,7 @@ class EnhancedTileMap:
             tile_id: ID of the tile to set
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.map_data[y][x] = tile_id
+            self.map_data[y, x] = tile_id
     
     def get_tile_id(self, x: int, y: int) -> int:
         """Get the ID of the tile at the specified position.
@@ -300,9 +331,17 @@ class EnhancedTileMap:
             The ID of the tile at the specified position
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.map_data[y][x]
+            return int(self.map_data[y, x])
         return 0
     
+    def get_tile_id_array(self) -> np.ndarray:
+        """Get every tile ID at once as a (height, width) array.
+        
+        Returns:
+            The map's tile ID array
+        """
+        return self.map_data
+    
     def get_tile_type(self, x: int, y: int) -> str:
         """Get the type of the tile at the specified position.
         
@@ -337,8 +376,9 @@ class EnhancedTileMap:
         end_y = min(self.height, start_y + surface.get_height() // self.tile_size + 2)
         
         for y in range(start_y, end_y):
+            row = self.map_data[y].tolist()
             for x in range(start_x, end_x):
-                tile_id = self.map_data[y][x]
+                tile_id = row[x]
                 tile = self.tileset.get_tile(tile_id)
                 dest_x = x * self.tile_size - camera_x
                 dest_y = y * self.tile_size - camera_y
@@ -418,15 +458,13 @@ class EnhancedMapGenerator:
         elif zone_type == "forest":
             self._generate_forest_features(feature_layer, ground_layer)
         
-        # Apply layers to the map
-        for y in range(height):
-            for x in range(width):
-                # Set ground tile
-                tilemap.set_tile(x, y, ground_layer[y][x])
-                
-                # Set feature tile if present
-                if feature_layer[y][x] is not None:
-                    tilemap.set_tile(x, y, feature_layer[y][x])
+        # Apply layers to the map: ground tiles, overlaid by any feature tiles
+        tiles = np.array(ground_layer, dtype=np.uint16)
+        features = np.array([[-1 if tile_id is None else tile_id for tile_id in row]
+                             for row in feature_layer], dtype=np.int32)
+        has_feature = features >= 0
+        tiles[has_feature] = features[has_feature]
+        tilemap.map_data = tiles
         
         return tilemap
     
@@ -553,12 +591,8 @@ class EnhancedMapGenerator:
     
     def _find_house_locations(self, path_points: List[Tuple[int, int]], width: int, height: int) -> List[Tuple[int, int]]:
         """Find suitable locations for houses near paths."""
-        house_locations = []
-        for x, y in path_points:
-            # Add some random offset from the path
-            offset_x = random.randint(-3, 3)
-            offset_y = random.randint(-3, 3)
-            new_x = max(0, min(width-1, x + offset_x))
-            new_y = max(0, min(height-1, y + offset_y))
-            house_locations.append((new_x, new_y))
-        return house_locations 
\ No newline at end of file
+        # Add some random offset from the path, clamped to the map
+        randint = random.randint
+        return [(max(0, min(width-1, x + randint(-3, 3))),
+                 max(0, min(height-1, y + randint(-3, 3))))
+                for x, y in path_points] 
\ No newline at end of file
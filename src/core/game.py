@@ -8,7 +8,7 @@ from typing import Optional
 from pathlib import Path
 
 from .game_state import GameState
-from .scene import SceneManager, MainMenuScene, GameplayScene
+from .scene import SceneManager, SceneID, MainMenuScene, GameplayScene, CharacterCreationScene
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +31,6 @@ class Game:
         self.width = width
         self.height = height
         self.screen = pygame.display.set_mode((width, height))
-        self.clock = pygame.time.Clock()
         self.running = True
         
         # Initialize game state
@@ -42,17 +41,21 @@ class Game:
         self._register_scenes()
         
         # Start with main menu
-        self.scene_manager.change_scene("main_menu")
+        self.scene_manager.change_scene(SceneID.MAIN_MENU)
     
     def _register_scenes(self) -> None:
-        """Register all game scenes."""
-        self.scene_manager.register_scene("main_menu", MainMenuScene(self.game_state))
-        self.scene_manager.register_scene("gameplay", GameplayScene(self.game_state))
-        # TODO: Register other scenes (character creation, inventory, etc.)
+        """Register all game scenes.
+        
+        Scenes are registered by class so they are only constructed when first entered.
+        """
+        self.scene_manager.register_scene(SceneID.MAIN_MENU, MainMenuScene)
+        self.scene_manager.register_scene(SceneID.CHARACTER_CREATION, CharacterCreationScene)
+        self.scene_manager.register_scene(SceneID.GAMEPLAY, GameplayScene)
+        # TODO: Register other scenes (inventory, etc.)
     
     def handle_events(self) -> None:
         """Handle pygame events."""
-        for event in pygame.event.get():
+        for event in self.scene_manager.get_events():
             if event.type == pygame.QUIT:
                 self.running = False
             else:
@@ -68,15 +71,15 @@ class Game:
     
     def render(self) -> None:
         """Render the game."""
-        self.screen.fill((0, 0, 0))  # Clear screen
+        # Scenes paint their own background and report what changed
         self.scene_manager.render(self.screen)
-        pygame.display.flip()  # Update display
+        self.scene_manager.present()
     
     def run(self) -> None:
         """Run the main game loop."""
         while self.running:
-            # Calculate delta time
-            dt = self.clock.tick(60) / 1000.0  # Convert to seconds
+            # Cap the frame rate and get the delta time
+            dt = self.scene_manager.tick()
             
             # Handle events
             self.handle_events()
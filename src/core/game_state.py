@@ -5,11 +5,14 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from datetime import datetime
 import json
+import logging
 from pathlib import Path
 
 from src.tools.template_manager import TemplateManager
 from src.utils.document_manager import DocumentManager
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class PlayerState:
     """Player's current state."""
@@ -159,6 +162,56 @@ class GameState:
             updated_npc = self.template_manager.update_npc(npc_data, interaction)
             self.document_manager.save_npc_state(npc_id, updated_npc)
     
+    def update_quests_bulk(self, updates: List[Dict[str, Any]]) -> None:
+        """Apply several quest progress updates, loading and saving each quest once.
+        
+        All saves are written together in one document batch. Updates missing
+        a key are logged and skipped.
+        
+        Args:
+            updates: Update dicts with "quest_id", "objective" and "progress" keys
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for update in updates:
+            if not all(key in update for key in ("quest_id", "objective", "progress")):
+                logger.warning(f"Skipping malformed quest update: {update!r}")
+                continue
+            grouped.setdefault(update["quest_id"], []).append(update)
+        
+        self.document_manager.begin_batch()
+        try:
+            for quest_id, quest_updates in grouped.items():
+                quest_data = self.document_manager.get_quest_state(quest_id)
+                if not quest_data:
+                    logger.warning(f"Skipping updates for unknown quest {quest_id}")
+                    continue
+                for update in quest_updates:
+                    quest_data = self.template_manager.update_quest_progress(
+                        quest_data, update["objective"], update["progress"]
+                    )
+                self.document_manager.save_quest_state(quest_id, quest_data)
+        finally:
+            self.document_manager.commit_batch()
+    
+    def record_npc_interactions_bulk(self, interactions: Dict[str, Any]) -> None:
+        """Record interactions with several NPCs at once, in one document batch.
+        
+        Args:
+            interactions: Mapping of NPC ID to interaction data, or to the
+                NPC's response text as returned by the story agent
+        """
+        self.document_manager.begin_batch()
+        try:
+            for npc_id, interaction in interactions.items():
+                if isinstance(interaction, str):
+                    interaction = {"text": interaction}
+                elif not isinstance(interaction, dict):
+                    logger.warning(f"Skipping malformed interaction for NPC {npc_id}: {interaction!r}")
+                    continue
+                self.record_npc_interaction(npc_id, interaction)
+        finally:
+            self.document_manager.commit_batch()
+    
     def update_event_status(self, event_id: str, status: str, outcome: Optional[Dict[str, Any]] = None) -> None:
         """Update the status of a story event.
         
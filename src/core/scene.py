@@ -1,28 +1,132 @@
 """
 Scene system to manage different game screens and transitions.
 """
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Union, TYPE_CHECKING
 from abc import ABC, abstractmethod
+from enum import IntEnum
+import functools
 import pygame
 import logging
 import os
 import asyncio
 import re
 import random
+import string
+import time
 
 from .game_state import GameState
-from .enhanced_tilemap import EnhancedTileset
+from .config import FPS
 
-# Import zone management system
-from .zone import ZoneManager, Zone
-# Import enhanced zone system
-from .zone_tile_integration import EnhancedZoneManager
+if TYPE_CHECKING:
+    from .player import Player
+    from .zone import Zone
+    from .tilemap import TileMap
+    from .enhanced_tilemap import EnhancedTileset
+    from .zone_tile_integration import EnhancedZoneManager
 
 logger = logging.getLogger(__name__)
 
+# Event constants used by the handle_event hot paths, bound once at import
+_KEYDOWN = pygame.KEYDOWN
+_K_UP = pygame.K_UP
+_K_DOWN = pygame.K_DOWN
+_K_RETURN = pygame.K_RETURN
+_K_ESCAPE = pygame.K_ESCAPE
+_K_SPACE = pygame.K_SPACE
+_K_BACKSPACE = pygame.K_BACKSPACE
+_K_i = pygame.K_i
+_K_m = pygame.K_m
+
+# Size of the gameplay viewport in pixels
+VIEW_W, VIEW_H = 800, 600
+
+# Direction of the matching connection on the other side of a zone transition
+_REVERSE_DIR = {"north": "south", "south": "north", "east": "west", "west": "east"}
+
+# Story intro markup patterns
+_BRACKET_RE = re.compile(r'\[(.*?)\]')
+_VAR_RE = re.compile(r'\$\{(.*?)\}')
+_SPAN_RE = re.compile(r"<span style='color:#ffcc00'>|</span>")
+_BRACKET_TABLE = str.maketrans({"[": "*", "]": "*"})
+# Location keywords found in story highlights, mapped to the zone type generated for them
+_LOCATION_TO_MAP = {
+    "village": "village",
+    "town": "village",
+    "settlement": "village",
+    "forest": "forest",
+    "woods": "forest",
+    "jungle": "forest",
+    "mountains": "village",
+    "cave": "village",
+}
+
+# Default-font faces shared by all scenes, keyed by point size
+_fonts: Dict[int, pygame.font.Font] = {}
+
+def _get_font(size: int) -> pygame.font.Font:
+    """Get the shared default font at the given size, loading it on first use.
+    
+    The cache is dropped on pygame.quit(), since fonts can't be used once the
+    font module has been shut down.
+    
+    Args:
+        size: Font size in points
+        
+    Returns:
+        The shared font
+    """
+    font = _fonts.get(size)
+    if font is None:
+        if not _fonts:
+            pygame.register_quit(_clear_font_caches)
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+@functools.lru_cache(maxsize=512)
+def render_text(size: int, text: str, color: tuple, antialias: bool = True) -> pygame.Surface:
+    """Render text in the shared default font, reusing recent results.
+    
+    The returned surface is shared between callers and must not be drawn on.
+    Once a display mode is set it is converted to the display's pixel format
+    so blits take SDL's fast path.
+    
+    Args:
+        size: Font size in points
+        text: Text to render
+        color: RGB text color
+        antialias: Whether to antialias the text
+        
+    Returns:
+        The rendered text surface
+    """
+    surface = _get_font(size).render(text, antialias, color)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+def _clear_font_caches() -> None:
+    """Drop shared fonts and rendered text when pygame shuts down."""
+    _fonts.clear()
+    render_text.cache_clear()
+
+class SceneID(IntEnum):
+    """Identifiers for the game scenes, used to index the scene manager."""
+    MAIN_MENU = 0
+    GAMEPLAY = 1
+    CHARACTER_CREATION = 2
+    INVENTORY = 3
+    MAP = 4
+    LOAD_GAME = 5
+    SETTINGS = 6
+
 class Scene(ABC):
     """Base class for all game scenes."""
     
+    # Whether the scene changes on its own between input events; scenes that
+    # don't let the main loop sleep until the next event
+    needs_continuous_updates = True
+    
     def __init__(self, game_state: GameState):
         """Initialize the scene.
         
@@ -30,8 +134,16 @@ class Scene(ABC):
             game_state: The game state manager
         """
         self.game_state = game_state
-        self.next_scene: Optional[str] = None
+        self.next_scene: Optional[SceneID] = None
         self.is_running = True
+        self._text_cache: Dict[tuple, pygame.Surface] = {}
+        
+        # Set when the next render must repaint the whole surface
+        self._full_redraw = True
+    
+    def invalidate(self) -> None:
+        """Make the next render repaint the whole surface."""
+        self._full_redraw = True
     
     @abstractmethod
     def handle_event(self, event: pygame.event.Event) -> None:
@@ -52,19 +164,49 @@ class Scene(ABC):
         pass
     
     @abstractmethod
-    def render(self, surface: pygame.Surface) -> None:
+    def render(self, surface: pygame.Surface) -> Optional[List[pygame.Rect]]:
         """Render the scene.
         
+        Scenes paint their own background. A scene that only repainted part
+        of the surface returns the rects it changed (empty if nothing did),
+        so only those need to reach the display.
+        
         Args:
             surface: The surface to render to
+            
+        Returns:
+            Repainted rects, or None if the whole surface was repainted
         """
         pass
     
-    def change_scene(self, scene_name: str) -> None:
+    def _render_text(self, text: str, color: tuple, font: Optional[pygame.font.Font] = None) -> pygame.Surface:
+        """Render static text, reusing the surface from earlier frames.
+        
+        Only use this for text drawn from a small fixed set of strings; the
+        cache is never pruned.
+        
+        Args:
+            text: Text to render
+            color: RGB text color
+            font: Font to render with, defaults to the scene's font
+            
+        Returns:
+            The rendered text surface
+        """
+        if font is None:
+            font = self.font
+        key = (font, text, color)
+        rendered = self._text_cache.get(key)
+        if rendered is None:
+            rendered = font.render(text, True, color)
+            self._text_cache[key] = rendered
+        return rendered
+    
+    def change_scene(self, scene_name: SceneID) -> None:
         """Request a scene change.
         
         Args:
-            scene_name: Name of the scene to change to
+            scene_name: ID of the scene to change to
         """
         self.next_scene = scene_name
         self.is_running = False
@@ -72,10 +214,12 @@ class Scene(ABC):
 class MainMenuScene(Scene):
     """Main menu scene."""
     
+    needs_continuous_updates = False
+    
     def __init__(self, game_state: GameState):
         """Initialize the main menu scene."""
         super().__init__(game_state)
-        self.font = pygame.font.Font(None, 36)
+        self.font = _get_font(36)
         self.menu_items = [
             "New Game",
             "Load Game",
@@ -83,25 +227,40 @@ class MainMenuScene(Scene):
             "Quit"
         ]
         self.selected_item = 0
+        
+        # Pre-rendered title and menu items in both normal and highlighted colors
+        self._title = render_text(36, "AI-Driven RPG Adventure", (255, 255, 255))
+        self._item_white = [render_text(36, item, (255, 255, 255)) for item in self.menu_items]
+        self._item_yellow = [render_text(36, item, (255, 255, 0)) for item in self.menu_items]
+        
+        # Title and item rects in both colors, laid out for _layout_width
+        self._layout_width = -1
+        self._title_rect = self._title.get_rect()
+        self._white_rects: List[pygame.Rect] = []
+        self._yellow_rects: List[pygame.Rect] = []
+        
+        # Surface and selection as of the last render, for partial redraws
+        self._drawn_surface: Optional[pygame.Surface] = None
+        self._drawn_selected = -1
     
     def handle_event(self, event: pygame.event.Event) -> None:
         """Handle menu navigation and selection."""
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP:
+        if event.type == _KEYDOWN:
+            if event.key == _K_UP:
                 self.selected_item = (self.selected_item - 1) % len(self.menu_items)
-            elif event.key == pygame.K_DOWN:
+            elif event.key == _K_DOWN:
                 self.selected_item = (self.selected_item + 1) % len(self.menu_items)
-            elif event.key == pygame.K_RETURN:
+            elif event.key == _K_RETURN:
                 self._handle_selection()
     
     def _handle_selection(self) -> None:
         """Handle menu item selection."""
         if self.menu_items[self.selected_item] == "New Game":
-            self.change_scene("character_creation")
+            self.change_scene(SceneID.CHARACTER_CREATION)
         elif self.menu_items[self.selected_item] == "Load Game":
-            self.change_scene("load_game")
+            self.change_scene(SceneID.LOAD_GAME)
         elif self.menu_items[self.selected_item] == "Settings":
-            self.change_scene("settings")
+            self.change_scene(SceneID.SETTINGS)
         elif self.menu_items[self.selected_item] == "Quit":
             pygame.quit()
             exit()
@@ -110,21 +269,73 @@ class MainMenuScene(Scene):
         """Update menu state."""
         pass
     
-    def render(self, surface: pygame.Surface) -> None:
-        """Render the menu."""
+    def _layout(self, width: int) -> None:
+        """Center the title and menu items, recomputing only when the width changes.
+        
+        Args:
+            width: Width of the surface being rendered to
+        """
+        if width == self._layout_width:
+            return
+        center_x = width // 2
+        self._title_rect = self._title.get_rect(center=(center_x, 100))
+        self._white_rects = [text.get_rect(center=(center_x, 250 + i * 50))
+                             for i, text in enumerate(self._item_white)]
+        self._yellow_rects = [text.get_rect(center=(center_x, 250 + i * 50))
+                              for i, text in enumerate(self._item_yellow)]
+        self._layout_width = width
+    
+    def _render_item(self, surface: pygame.Surface, index: int) -> pygame.Rect:
+        """Draw one menu item in its current color.
+        
+        Args:
+            surface: The surface to render to
+            index: Index of the menu item
+            
+        Returns:
+            The rect the item was drawn in
+        """
+        if index == self.selected_item:
+            text, rect = self._item_yellow[index], self._yellow_rects[index]
+        else:
+            text, rect = self._item_white[index], self._white_rects[index]
+        surface.blit(text, rect)
+        return rect
+    
+    def _clear_item(self, surface: pygame.Surface, index: int) -> None:
+        """Paint the background over a menu item drawn in either color."""
+        surface.fill((0, 0, 0), self._white_rects[index])
+        surface.fill((0, 0, 0), self._yellow_rects[index])
+    
+    def render(self, surface: pygame.Surface) -> Optional[List[pygame.Rect]]:
+        """Render the menu, repainting only the items whose highlight changed."""
+        selected = self.selected_item
+        if not self._full_redraw and surface is self._drawn_surface:
+            if selected == self._drawn_selected:
+                return []
+            
+            # Repaint the previously and newly highlighted items
+            dirty = []
+            for index in (self._drawn_selected, selected):
+                self._clear_item(surface, index)
+                dirty.append(self._render_item(surface, index))
+            self._drawn_selected = selected
+            return dirty
+        
         surface.fill((0, 0, 0))  # Black background
+        self._layout(surface.get_width())
         
         # Render title
-        title = self.font.render("AI-Driven RPG Adventure", True, (255, 255, 255))
-        title_rect = title.get_rect(center=(surface.get_width() // 2, 100))
-        surface.blit(title, title_rect)
+        surface.blit(self._title, self._title_rect)
         
         # Render menu items
-        for i, item in enumerate(self.menu_items):
-            color = (255, 255, 0) if i == self.selected_item else (255, 255, 255)
-            text = self.font.render(item, True, color)
-            rect = text.get_rect(center=(surface.get_width() // 2, 250 + i * 50))
-            surface.blit(text, rect)
+        for i in range(len(self.menu_items)):
+            self._render_item(surface, i)
+        
+        self._full_redraw = False
+        self._drawn_surface = surface
+        self._drawn_selected = selected
+        return None
 
 class GameplayScene(Scene):
     """Main gameplay scene."""
@@ -132,29 +343,63 @@ class GameplayScene(Scene):
     def __init__(self, game_state: GameState):
         """Initialize the gameplay scene."""
         super().__init__(game_state)
-        self.font = pygame.font.Font(None, 24)
+        self.font = _get_font(24)
+        self._space_w = self.font.size(" ")[0]
+        self._line_h = self.font.get_linesize()
+        self._build_glyph_atlas()
         self.dialogue_active = False
         self.current_dialogue: Optional[Dict[str, Any]] = None
         self.story_initialized = False
         self.story_initializing = False
         self.story_init_failed = False
+        
+        # Story initialization task, and the private event loop stepping it when
+        # the scene isn't driven from inside a running asyncio loop
+        self._story_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         self.current_story_text = ""
         self.story_queue = []
         
-        # Game world components
-        self.tilemap = None
-        self.player = None
+        # Wrapped story text, re-rendered only when the text changes
+        self._story_surface: Optional[pygame.Surface] = None
+        self._cached_story_key: Optional[tuple] = None
+        
+        # HUD text surfaces by slot, as (text, surface)
+        self._ui_cache: Dict[str, tuple] = {}
+        
+        # Health bar background, and the fill width / info text derived from the last seen stats
+        self._health_bg = pygame.Surface((200, 20))
+        self._health_bg.fill((255, 0, 0))
+        self._health_stats: Optional[tuple] = None
+        self._health_fill = pygame.Rect(20, 20, 0, 20)
+        self._char_stats: Optional[tuple] = None
+        self._char_text = ""
+        
+        # Game world components, created on the first update
+        self.tilemap: Optional["TileMap"] = None
+        self.player: Optional["Player"] = None
         self.camera_x = 0
         self.camera_y = 0
-        self.zone_manager = None
-        self.current_zone = None
-        self.tileset = None
+        self._cam_max_x = 0
+        self._cam_max_y = 0
+        self.zone_manager: Optional["EnhancedZoneManager"] = None
+        self.current_zone: Optional["Zone"] = None
+        self.tileset: Optional["EnhancedTileset"] = None
+        self._initialized = False
+    
+    def _ensure_initialized(self) -> None:
+        """Load the tileset, zone manager and story agent the first time the scene runs."""
+        if self._initialized:
+            return
+        self._initialized = True
         
         # Import modules
         try:
-            # Import these at the class level to avoid circular imports
-            import src.core.player
-            self.Player = src.core.player.Player
+            # Imported here so the menu doesn't pay for them until a game starts
+            from .player import Player
+            from .enhanced_tilemap import EnhancedTileset
+            from .zone_tile_integration import EnhancedZoneManager
+            self.Player = Player
             
             # Initialize enhanced tileset
             assets_path = os.path.join("game", "assets", "images")
@@ -206,11 +451,11 @@ class GameplayScene(Scene):
                 # First extract any highlighted parts to preserve them
                 highlights = []
                 if "[" in story_intro and "]" in story_intro:
-                    highlights = re.findall(r'\[(.*?)\]', story_intro)
+                    highlights = _BRACKET_RE.findall(story_intro)
                 
                 # Process special variables like ${player.name} with actual values
                 if "${" in story_intro:
-                    for match in re.findall(r'\${(.*?)}', story_intro):
+                    for match in _VAR_RE.findall(story_intro):
                         try:
                             # Evaluate simple player attributes
                             if match.startswith("player."):
@@ -222,35 +467,26 @@ class GameplayScene(Scene):
                             logger.error(f"Error processing variable {match}: {e}")
                 
                 # Remove any HTML-style tags and replace with game-friendly formatting
-                formatted_story = story_intro.replace("<span style='color:#ffcc00'>", "*").replace("</span>", "*")
-                formatted_story = formatted_story.replace("[", "*").replace("]", "*")
+                formatted_story = _SPAN_RE.sub("*", story_intro).translate(_BRACKET_TABLE)
                 
                 # Split into paragraphs for display
                 paragraphs = formatted_story.split("\n\n")
                 self.current_story_text = paragraphs[0] if paragraphs else ""
                 self.story_queue = paragraphs[1:] if len(paragraphs) > 1 else []
                 
-                # Extract location information for map generation
-                location_type = "village"  # Default
-                for highlight in highlights:
-                    # Convert highlight to string and ensure it's lowercase
-                    highlight_str = str(highlight).lower()
-                    if any(keyword in highlight_str for keyword in ["village", "town", "forest", "mountains", "cave"]):
-                        for keyword in ["village", "town", "forest", "mountains", "cave"]:
+                # Pick the zone type from the first highlight naming a known location
+                map_type = "village"  # Default
+                if highlights:
+                    lowered = [str(highlight).lower() for highlight in highlights]
+                    for highlight_str in lowered:
+                        for keyword, zone_type in _LOCATION_TO_MAP.items():
                             if keyword in highlight_str:
-                                location_type = keyword
+                                map_type = zone_type
                                 break
+                        else:
+                            continue
                         break
                 
-                # Normalize location type for map generation
-                location_type_str = str(location_type).lower()
-                if any(keyword in location_type_str for keyword in ["town", "village", "settlement"]):
-                    map_type = "village"
-                elif any(keyword in location_type_str for keyword in ["forest", "woods", "jungle"]):
-                    map_type = "forest"
-                else:
-                    map_type = "village"  # Default
-                
                 # Generate starting zone
                 if self.zone_manager:
                     try:
@@ -270,6 +506,7 @@ class GameplayScene(Scene):
                         
                         # Use the map from the zone
                         self.tilemap = self.current_zone.map
+                        self._update_camera_bounds()
                         
                         # Create player at the center of the starting village
                         if hasattr(self, 'Player'):
@@ -296,8 +533,8 @@ class GameplayScene(Scene):
     
     def handle_event(self, event: pygame.event.Event) -> None:
         """Handle gameplay events."""
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_SPACE:
+        if event.type == _KEYDOWN:
+            if event.key == _K_SPACE:
                 if self.story_queue:
                     self.current_story_text = self.story_queue.pop(0)
                     if not self.story_queue and not self.current_story_text:
@@ -309,18 +546,23 @@ class GameplayScene(Scene):
                 elif not self.dialogue_active:
                     # Check for NPC interactions
                     pass
-            elif event.key == pygame.K_ESCAPE:
-                self.change_scene("main_menu")  # Changed from pause_menu to main_menu
-            elif event.key == pygame.K_i:
-                self.change_scene("inventory")
-            elif event.key == pygame.K_m:
-                self.change_scene("map")
+            elif event.key == _K_ESCAPE:
+                self.change_scene(SceneID.MAIN_MENU)  # Changed from pause_menu to main_menu
+            elif event.key == _K_i:
+                self.change_scene(SceneID.INVENTORY)
+            elif event.key == _K_m:
+                self.change_scene(SceneID.MAP)
     
     def update(self, dt: float) -> None:
         """Update gameplay state."""
-        if not self.story_initialized and not self.story_initializing:
-            # Initialize story asynchronously
-            asyncio.create_task(self.initialize_story())
+        if not self._initialized:
+            self._ensure_initialized()
+        
+        if not self.story_initialized:
+            # Initialize story asynchronously; the task handle guards against re-spawning
+            if self._story_task is None and not self.story_initializing:
+                self._start_story_task()
+            self._step_story_task()
         elif self.player and self.tilemap and not self.story_queue:
             # Only handle player movement when not displaying story text
             # Update player
@@ -331,62 +573,86 @@ class GameplayScene(Scene):
             if self.current_zone:
                 self._check_zone_transitions()
             
-            # Update camera to follow player
-            self.camera_x = self.player.pixel_x - (800 // 2)
-            self.camera_y = self.player.pixel_y - (600 // 2)
-            
-            # Keep camera within map bounds
-            self.camera_x = max(0, min(self.camera_x, self.tilemap.width * self.tilemap.tile_size - 800))
-            self.camera_y = max(0, min(self.camera_y, self.tilemap.height * self.tilemap.tile_size - 600))
+            # Update camera to follow player, kept within map bounds
+            camera_x = self.player.pixel_x - VIEW_W // 2
+            camera_y = self.player.pixel_y - VIEW_H // 2
+            max_x = self._cam_max_x
+            max_y = self._cam_max_y
+            self.camera_x = 0 if camera_x < 0 else max_x if camera_x > max_x else camera_x
+            self.camera_y = 0 if camera_y < 0 else max_y if camera_y > max_y else camera_y
+    
+    def _update_camera_bounds(self) -> None:
+        """Recompute the camera clamp limits for the current tilemap."""
+        self._cam_max_x = max(0, self.tilemap.width * self.tilemap.tile_size - VIEW_W)
+        self._cam_max_y = max(0, self.tilemap.height * self.tilemap.tile_size - VIEW_H)
+    
+    def _start_story_task(self) -> None:
+        """Schedule initialize_story on the running loop, or on a private loop if there is none."""
+        # Mark as initializing before the task gets a chance to run, so no frame can schedule it twice
+        self.story_initializing = True
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = asyncio.new_event_loop()
+            self._story_task = self._loop.create_task(self.initialize_story())
+        else:
+            self._story_task = asyncio.create_task(self.initialize_story())
+    
+    def _step_story_task(self) -> None:
+        """Run one iteration of the private event loop so the story task progresses between frames."""
+        loop = self._loop
+        if loop is None:
+            return
+        
+        if not self._story_task.done():
+            # stop() followed by run_forever() processes the ready callbacks once and returns
+            loop.stop()
+            loop.run_forever()
+        
+        if self._story_task.done():
+            loop.close()
+            self._loop = None
     
     def _check_zone_transitions(self):
         """Check if player has reached a zone transition point."""
         if not self.current_zone:
             return
             
-        # Check all connections in the current zone
-        for direction, connection in self.current_zone.connections.items():
-            target_zone_id = connection["target_zone_id"]
-            connection_x = connection["x"]
-            connection_y = connection["y"]
-            
-            # Check if player is at the connection point
-            if (self.player.tile_x == connection_x and 
-                self.player.tile_y == connection_y):
-                
-                # Get the target zone
-                target_zone = self.zone_manager.get_zone(target_zone_id)
-                if target_zone:
-                    # Find the reverse connection point
-                    reverse_direction = {
-                        "north": "south",
-                        "south": "north",
-                        "east": "west",
-                        "west": "east"
-                    }.get(direction)
-                    
-                    # Find the entry point in the target zone
-                    entry_x, entry_y = 0, 0
-                    if reverse_direction in target_zone.connections:
-                        rev_conn = target_zone.connections[reverse_direction]
-                        if rev_conn["target_zone_id"] == self.current_zone.zone_id:
-                            entry_x = rev_conn["x"]
-                            entry_y = rev_conn["y"]
-                    
-                    # Switch to the new zone
-                    self.zone_manager.set_current_zone(target_zone_id)
-                    self.current_zone = target_zone
-                    self.tilemap = target_zone.map
-                    
-                    # Position player at entry point
-                    self.player.tile_x = entry_x
-                    self.player.tile_y = entry_y
-                    self.player.pixel_x = entry_x * self.player.tile_size
-                    self.player.pixel_y = entry_y * self.player.tile_size
-                    
-                    # Add a story text about entering the new zone
-                    self.current_story_text = f"You have entered {target_zone.name}. {target_zone.description}"
-                    break
+        # Look up a connection at the player's tile
+        direction = self.current_zone.connection_points.get((self.player.tile_x, self.player.tile_y))
+        if direction is None:
+            return
+        
+        target_zone_id = self.current_zone.connections[direction]["target_zone_id"]
+        
+        # Get the target zone
+        target_zone = self.zone_manager.get_zone(target_zone_id)
+        if not target_zone:
+            return
+        
+        # Find the entry point in the target zone
+        reverse_direction = _REVERSE_DIR.get(direction)
+        entry_x, entry_y = 0, 0
+        if reverse_direction in target_zone.connections:
+            rev_conn = target_zone.connections[reverse_direction]
+            if rev_conn["target_zone_id"] == self.current_zone.zone_id:
+                entry_x = rev_conn["x"]
+                entry_y = rev_conn["y"]
+        
+        # Switch to the new zone
+        self.zone_manager.set_current_zone(target_zone_id)
+        self.current_zone = target_zone
+        self.tilemap = target_zone.map
+        self._update_camera_bounds()
+        
+        # Position player at entry point
+        self.player.tile_x = entry_x
+        self.player.tile_y = entry_y
+        self.player.pixel_x = entry_x * self.player.tile_size
+        self.player.pixel_y = entry_y * self.player.tile_size
+        
+        # Add a story text about entering the new zone
+        self.current_story_text = f"You have entered {target_zone.name}. {target_zone.description}"
 
     def render(self, surface: pygame.Surface) -> None:
         """Render the gameplay scene."""
@@ -394,7 +660,7 @@ class GameplayScene(Scene):
         
         if not self.story_initialized:
             # Show loading message
-            loading = self.font.render("Initializing your adventure...", True, (255, 255, 255))
+            loading = render_text(24, "Initializing your adventure...", (255, 255, 255))
             surface.blit(loading, (surface.get_width() // 2 - loading.get_width() // 2, 
                                  surface.get_height() // 2))
         elif self.current_story_text:
@@ -414,6 +680,66 @@ class GameplayScene(Scene):
             # Show gameplay
             self._render_gameplay(surface)
     
+    def _build_glyph_atlas(self) -> None:
+        """Pre-render the printable ASCII glyphs into one atlas surface per story text color."""
+        height = self.font.get_height()
+        self._glyph_rects: Dict[str, pygame.Rect] = {}
+        x = 0
+        for ch in string.printable:
+            if not ch.isprintable():
+                continue
+            width = self.font.size(ch)[0]
+            self._glyph_rects[ch] = pygame.Rect(x, 0, width, height)
+            x += width
+        
+        self._glyph_atlases: Dict[tuple, pygame.Surface] = {}
+        for color in ((255, 255, 255), (255, 255, 0)):
+            atlas = pygame.Surface((x, height), pygame.SRCALPHA)
+            for ch, rect in self._glyph_rects.items():
+                atlas.blit(self.font.render(ch, True, color), rect)
+            self._glyph_atlases[color] = atlas
+    
+    def _text_width(self, text: str) -> int:
+        """Measure text by summing atlas glyph widths.
+        
+        Args:
+            text: Text to measure
+            
+        Returns:
+            Width in pixels
+        """
+        rects = self._glyph_rects
+        return sum(rects[ch].width if ch in rects else self.font.size(ch)[0] for ch in text)
+    
+    def _blit_glyphs(self, surface: pygame.Surface, text: str, color: tuple, x: int, y: int) -> int:
+        """Draw text glyph by glyph from the atlas.
+        
+        Characters missing from the atlas fall back to a cached font render.
+        
+        Args:
+            surface: Surface to draw on
+            text: Text to draw
+            color: Text color, one of the atlas colors
+            x: Left edge in pixels
+            y: Top edge in pixels
+            
+        Returns:
+            X position just after the drawn text
+        """
+        atlas = self._glyph_atlases[color]
+        get_rect = self._glyph_rects.get
+        blit = surface.blit
+        for ch in text:
+            rect = get_rect(ch)
+            if rect is None:
+                glyph = self._render_text(ch, color)
+                blit(glyph, (x, y))
+                x += glyph.get_width()
+            else:
+                blit(atlas, (x, y), rect)
+                x += rect.width
+        return x
+    
     def _render_story(self, surface: pygame.Surface) -> None:
         """Render the story text."""
         # Create story box
@@ -421,64 +747,97 @@ class GameplayScene(Scene):
         pygame.draw.rect(surface, (0, 0, 0), box_rect)
         pygame.draw.rect(surface, (255, 255, 255), box_rect, 2)
         
-        # Render story text with word wrapping
-        max_line_width = box_rect.width - 40
-        max_lines = 5  # Maximum lines to show at once
-        
         if self.current_story_text:
-            # Process text with highlighting
-            # Use * as markers for highlighted text (e.g., *Village* would be highlighted)
-            text_parts = self.current_story_text.split('*')
-            highlight_mode = False
+            # Re-layout only when the text or box size changes
+            story_key = (self.current_story_text, box_rect.size)
+            if story_key != self._cached_story_key:
+                self._story_surface = self._compose_story(box_rect.width, box_rect.height)
+                self._cached_story_key = story_key
+            surface.blit(self._story_surface, box_rect.topleft)
+        
+        # Render continue prompt
+        if self.story_queue:
+            prompt = self._render_text("Press SPACE to continue...", (200, 200, 200))
+        else:
+            prompt = self._render_text("Press SPACE to start your adventure...", (200, 200, 200))
             
-            lines = []
-            current_line = []
-            current_line_text = ""
+        surface.blit(prompt, (box_rect.x + 20, box_rect.y + box_rect.height - 30))
+    
+    def _wrap(self, text: str, max_width: int) -> List[List[tuple]]:
+        """Greedy word-wrap story text using glyph metrics only.
+        
+        Text between * markers is highlighted.
+        
+        Args:
+            text: Story text to lay out
+            max_width: Maximum line width in pixels
             
-            for part in text_parts:
-                if not part:  # Skip empty parts
-                    highlight_mode = not highlight_mode
-                    continue
-                
-                color = (255, 255, 0) if highlight_mode else (255, 255, 255)
-                words = part.split()
-                
-                for word in words:
-                    test_line = current_line_text + (" " if current_line_text else "") + word
-                    text_surface = self.font.render(test_line, True, (255, 255, 255))
-                    
-                    if text_surface.get_width() < max_line_width:
-                        current_line.append((word, color))
-                        current_line_text = test_line
-                    else:
-                        if current_line:  # Only append if there are words
-                            lines.append(current_line)
-                        current_line = [(word, color)]
-                        current_line_text = word
-                
+        Returns:
+            Lines, each a list of (word, color) tuples
+        """
+        space_width = self._space_w
+        text_width = self._text_width
+        lines = []
+        current_line = []
+        current_line_width = 0
+        highlight_mode = False
+        
+        for part in text.split('*'):
+            if not part:  # Skip empty parts
                 highlight_mode = not highlight_mode
+                continue
             
-            if current_line:
-                lines.append(current_line)
+            color = (255, 255, 0) if highlight_mode else (255, 255, 255)
             
-            # Only show a subset of lines if there are many
-            visible_lines = lines[:max_lines]
+            for word in part.split():
+                # Measure only the new word and extend the running line width
+                word_width = text_width(word)
+                test_width = current_line_width + (space_width if current_line else 0) + word_width
+                
+                if test_width < max_width:
+                    current_line.append((word, color))
+                    current_line_width = test_width
+                else:
+                    if current_line:  # Only append if there are words
+                        lines.append(current_line)
+                    current_line = [(word, color)]
+                    current_line_width = word_width
             
-            # Render each line
-            for i, line in enumerate(visible_lines):
-                x_pos = box_rect.x + 20
-                for word, color in line:
-                    word_surface = self.font.render(word, True, color)
-                    surface.blit(word_surface, (x_pos, box_rect.y + 20 + i * 30))
-                    x_pos += word_surface.get_width() + self.font.size(" ")[0]  # Add space width
+            highlight_mode = not highlight_mode
         
-        # Render continue prompt
-        if self.story_queue:
-            prompt = self.font.render("Press SPACE to continue...", True, (200, 200, 200))
-        else:
-            prompt = self.font.render("Press SPACE to start your adventure...", True, (200, 200, 200))
+        if current_line:
+            lines.append(current_line)
+        
+        return lines
+    
+    def _compose_story(self, width: int, height: int) -> pygame.Surface:
+        """Word-wrap the current story text onto a transparent surface the size of the story box.
+        
+        Args:
+            width: Story box width
+            height: Story box height
             
-        surface.blit(prompt, (box_rect.x + 20, box_rect.y + box_rect.height - 30))
+        Returns:
+            Surface with the visible story lines drawn on it
+        """
+        story_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        max_lines = 5  # Maximum lines to show at once
+        
+        # Lay out first, then draw only the lines that fit
+        visible_lines = self._wrap(self.current_story_text, width - 40)[:max_lines]
+        
+        space_width = self._space_w
+        line_height = self._line_h
+        blit_glyphs = self._blit_glyphs
+        
+        # Render each line from the glyph atlas
+        for i, line in enumerate(visible_lines):
+            x_pos = 20
+            for word, color in line:
+                x_pos = blit_glyphs(story_surface, word, color, x_pos, 20 + i * line_height)
+                x_pos += space_width
+        
+        return story_surface
     
     def _render_gameplay(self, surface: pygame.Surface) -> None:
         """Render the main gameplay view."""
@@ -498,25 +857,50 @@ class GameplayScene(Scene):
         # Render UI elements
         self._render_ui(surface)
     
+    def _cached_render(self, slot: str, text: str, color: tuple) -> pygame.Surface:
+        """Render HUD text, re-rendering a slot only when its text changes.
+        
+        Args:
+            slot: Name of the HUD element
+            text: Text to show
+            color: RGB text color
+            
+        Returns:
+            The rendered text surface
+        """
+        cached = self._ui_cache.get(slot)
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        rendered = self.font.render(text, True, color)
+        self._ui_cache[slot] = (text, rendered)
+        return rendered
+    
     def _render_ui(self, surface: pygame.Surface) -> None:
         """Render UI elements."""
-        # Health bar
-        health_rect = pygame.Rect(20, 20, 200, 20)
-        pygame.draw.rect(surface, (255, 0, 0), health_rect)
-        health_fill = pygame.Rect(20, 20, 200 * (self.game_state.player.health / self.game_state.player.max_health), 20)
-        pygame.draw.rect(surface, (0, 255, 0), health_fill)
+        player = self.game_state.player
+        blit = surface.blit
+        
+        # Health bar (integer pixel width, clamped to the bar, recomputed on health change)
+        health_stats = (player.health, player.max_health)
+        if health_stats != self._health_stats:
+            self._health_stats = health_stats
+            fill_width = max(0, min(200, (200 * player.health) // player.max_health)) if player.max_health > 0 else 0
+            self._health_fill.width = fill_width
+        blit(self._health_bg, (20, 20))
+        pygame.draw.rect(surface, (0, 255, 0), self._health_fill)
         
         # Location name
-        location_name = self.current_zone.name if self.current_zone else self.game_state.player.location
-        location = self.font.render(location_name, True, (255, 255, 255))
-        surface.blit(location, (surface.get_width() - location.get_width() - 20, 20))
+        location_name = self.current_zone.name if self.current_zone else player.location
+        location = self._cached_render("location", location_name, (255, 255, 255))
+        blit(location, (surface.get_width() - location.get_width() - 20, 20))
         
         # Character info
-        char_info = self.font.render(
-            f"{self.game_state.player.name} - Level {self.game_state.player.level} {self.game_state.player.character_class}",
-            True, (255, 255, 255)
-        )
-        surface.blit(char_info, (20, 50))
+        char_stats = (player.name, player.level, player.character_class)
+        if char_stats != self._char_stats:
+            self._char_stats = char_stats
+            self._char_text = f"{player.name} - Level {player.level} {player.character_class}"
+        char_info = self._cached_render("char_info", self._char_text, (255, 255, 255))
+        blit(char_info, (20, 50))
 
 class CharacterCreationScene(Scene):
     """Character creation scene."""
@@ -524,8 +908,8 @@ class CharacterCreationScene(Scene):
     def __init__(self, game_state: GameState):
         """Initialize the character creation scene."""
         super().__init__(game_state)
-        self.font = pygame.font.Font(None, 36)
-        self.small_font = pygame.font.Font(None, 24)
+        self.font = _get_font(36)
+        self.small_font = _get_font(24)
         self.name = ""
         self.name_active = True
         self.selected_class = 0
@@ -538,24 +922,24 @@ class CharacterCreationScene(Scene):
     
     def handle_event(self, event: pygame.event.Event) -> None:
         """Handle character creation events."""
-        if event.type == pygame.KEYDOWN:
+        if event.type == _KEYDOWN:
             if self.name_active:
-                if event.key == pygame.K_RETURN and self.name:
+                if event.key == _K_RETURN and self.name:
                     self.name_active = False
-                elif event.key == pygame.K_BACKSPACE:
+                elif event.key == _K_BACKSPACE:
                     self.name = self.name[:-1]
-                elif event.key == pygame.K_ESCAPE:
-                    self.change_scene("main_menu")
+                elif event.key == _K_ESCAPE:
+                    self.change_scene(SceneID.MAIN_MENU)
                 elif len(self.name) < 20:  # Limit name length
                     self.name += event.unicode
             else:
-                if event.key == pygame.K_UP:
+                if event.key == _K_UP:
                     self.selected_class = (self.selected_class - 1) % len(self.classes)
-                elif event.key == pygame.K_DOWN:
+                elif event.key == _K_DOWN:
                     self.selected_class = (self.selected_class + 1) % len(self.classes)
-                elif event.key == pygame.K_RETURN:
+                elif event.key == _K_RETURN:
                     self._create_character()
-                elif event.key == pygame.K_ESCAPE:
+                elif event.key == _K_ESCAPE:
                     self.name_active = True
     
     def _create_character(self) -> None:
@@ -582,7 +966,7 @@ class CharacterCreationScene(Scene):
             self.game_state.player.stealth = 10
         
         # Start the game
-        self.change_scene("gameplay")
+        self.change_scene(SceneID.GAMEPLAY)
     
     def update(self, dt: float) -> None:
         """Update character creation state."""
@@ -593,83 +977,189 @@ class CharacterCreationScene(Scene):
         surface.fill((0, 0, 0))  # Black background
         
         # Render title
-        title = self.font.render("Create Your Character", True, (255, 255, 255))
+        title = self._render_text("Create Your Character", (255, 255, 255))
         title_rect = title.get_rect(center=(surface.get_width() // 2, 100))
         surface.blit(title, title_rect)
         
         # Render name input
-        name_label = self.font.render("Enter your name:", True, (255, 255, 255))
+        name_label = self._render_text("Enter your name:", (255, 255, 255))
         surface.blit(name_label, (surface.get_width() // 2 - 200, 200))
         
         name_box = pygame.Rect(surface.get_width() // 2 - 200, 250, 400, 40)
         pygame.draw.rect(surface, (255, 255, 255) if self.name_active else (100, 100, 100), name_box, 2)
         
-        name_text = self.font.render(self.name + ("|" if self.name_active else ""), True, (255, 255, 255))
+        name_text = render_text(36, self.name + ("|" if self.name_active else ""), (255, 255, 255))
         surface.blit(name_text, (name_box.x + 10, name_box.y + 5))
         
         if not self.name_active:
             # Render class selection
-            class_label = self.font.render("Choose your class:", True, (255, 255, 255))
+            class_label = self._render_text("Choose your class:", (255, 255, 255))
             surface.blit(class_label, (surface.get_width() // 2 - 200, 350))
             
             for i, class_name in enumerate(self.classes):
                 color = (255, 255, 0) if i == self.selected_class else (255, 255, 255)
-                class_text = self.font.render(class_name, True, color)
+                class_text = self._render_text(class_name, color)
                 surface.blit(class_text, (surface.get_width() // 2 - 200, 400 + i * 50))
                 
                 # Render class description
-                desc = self.small_font.render(self.class_descriptions[class_name], True, (200, 200, 200))
+                desc = self._render_text(self.class_descriptions[class_name], (200, 200, 200), self.small_font)
                 surface.blit(desc, (surface.get_width() // 2 - 200, 425 + i * 50))
             
             # Render instructions
-            instructions = self.small_font.render("Use UP/DOWN to select class, ENTER to confirm, ESC to go back", True, (150, 150, 150))
+            instructions = self._render_text("Use UP/DOWN to select class, ENTER to confirm, ESC to go back", (150, 150, 150), self.small_font)
             surface.blit(instructions, (surface.get_width() // 2 - 300, 600))
 
+# Largest frame delta passed to scenes, so a stall (window drag, debugger) can't cause a huge jump
+MAX_FRAME_DT = 0.25
+
+# Longest time get_events() blocks waiting for input while the scene is idle
+IDLE_WAIT_MS = 100
+
+# Past this many dirty rects, or this fraction of the screen, present() flips the whole display
+MAX_DIRTY_RECTS = 50
+DIRTY_FLIP_FRACTION = 0.4
+
+# Window events after which the display has to be fully repainted
+_EXPOSE_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
 class SceneManager:
     """Manages scene transitions and updates."""
     
-    def __init__(self, game_state: GameState):
+    # Clock callers should derive frame deltas from; unlike time.time() it never runs backwards
+    now = staticmethod(time.monotonic)
+    
+    def __init__(self, game_state: GameState, target_fps: int = FPS):
         """Initialize the scene manager.
         
         Args:
             game_state: The game state manager
+            target_fps: Frame rate tick() caps the main loop to
         """
         self.game_state = game_state
-        self.scenes: Dict[str, Scene] = {}
+        self._clock = pygame.time.Clock()
+        self._target_fps = target_fps
+        self._last_tick = self.now()
+        self.scenes: List[Optional[Scene]] = [None] * len(SceneID)
+        self._factories: List[Optional[Callable[[GameState], Scene]]] = [None] * len(SceneID)
         self.current_scene: Optional[Scene] = None
+        
+        # Bound methods of the current scene, rebound on every scene change
+        self._cur_update: Optional[Callable[[float], None]] = None
+        self._cur_render: Optional[Callable[[pygame.Surface], None]] = None
+        self._cur_handle: Optional[Callable[[pygame.event.Event], None]] = None
+        
+        # Rects the last render changed, or None if it repainted everything
+        self.dirty_rects: Optional[List[pygame.Rect]] = None
+    
+    @staticmethod
+    def _scene_id(scene_name: Union[SceneID, str]) -> SceneID:
+        """Resolve a scene ID, accepting legacy string names like "main_menu".
+        
+        Args:
+            scene_name: Scene ID or scene name
+            
+        Returns:
+            The matching scene ID
+        """
+        if isinstance(scene_name, int):
+            return SceneID(scene_name)
+        try:
+            return SceneID[scene_name.upper()]
+        except (KeyError, AttributeError):
+            raise ValueError(f"Scene {scene_name} not found")
     
-    def register_scene(self, scene_name: str, scene: Scene) -> None:
+    def register_scene(self, scene_name: Union[SceneID, str],
+                       scene: Union[Scene, Callable[[GameState], Scene]]) -> None:
         """Register a new scene.
         
+        Scenes can be registered as an instance, or as a factory (usually the
+        scene class) that is only called the first time the scene is entered.
+        
         Args:
-            scene_name: Name of the scene
-            scene: Scene instance
+            scene_name: ID of the scene
+            scene: Scene instance or factory taking the game state
         """
-        self.scenes[scene_name] = scene
+        scene_id = self._scene_id(scene_name)
+        if isinstance(scene, Scene):
+            self.scenes[scene_id] = scene
+            self._factories[scene_id] = None
+        else:
+            self.scenes[scene_id] = None
+            self._factories[scene_id] = scene
     
-    def change_scene(self, scene_name: str) -> None:
+    def change_scene(self, scene_name: Union[SceneID, str]) -> None:
         """Change to a different scene.
         
         Args:
-            scene_name: Name of the scene to change to
+            scene_name: ID of the scene to change to
         """
-        if scene_name not in self.scenes:
-            raise ValueError(f"Scene {scene_name} not found")
+        scene_id = self._scene_id(scene_name)
+        scene = self.scenes[scene_id]
+        if scene is None:
+            factory = self._factories[scene_id]
+            if factory is None:
+                raise ValueError(f"Scene {scene_id.name.lower()} not found")
+            scene = factory(self.game_state)
+            self.scenes[scene_id] = scene
+        
+        self.current_scene = scene
+        scene.invalidate()
+        self._cur_update = scene.update
+        self._cur_render = scene.render
+        self._cur_handle = scene.handle_event
+        self.game_state.current_scene = scene_id.name.lower()
+    
+    def get_events(self) -> List[pygame.event.Event]:
+        """Get pending events, sleeping until input arrives if the scene is idle.
+        
+        Scenes that don't need continuous updates block for up to
+        IDLE_WAIT_MS waiting for an event instead of spinning every frame.
+        
+        Returns:
+            Events to handle this frame
+        """
+        scene = self.current_scene
+        if scene is not None and not scene.needs_continuous_updates:
+            first = pygame.event.wait(IDLE_WAIT_MS)
+            if first.type == pygame.NOEVENT:
+                return []
+            events = pygame.event.get()
+            events.insert(0, first)
+            return events
+        return pygame.event.get()
+    
+    def tick(self) -> float:
+        """Wait out the rest of the frame at the target frame rate.
+        
+        Animated scenes use the busy-loop clock, which holds the frame rate
+        more precisely than the sleep-based one.
         
-        self.current_scene = self.scenes[scene_name]
-        self.game_state.current_scene = scene_name
+        Returns:
+            Seconds since the previous tick, measured with SceneManager.now
+        """
+        scene = self.current_scene
+        if scene is not None and scene.needs_continuous_updates:
+            self._clock.tick_busy_loop(self._target_fps)
+        else:
+            self._clock.tick(self._target_fps)
+        now = self.now()
+        dt = now - self._last_tick
+        self._last_tick = now
+        return dt
     
     def update(self, dt: float) -> None:
         """Update the current scene.
         
         Args:
-            dt: Time since last update in seconds
+            dt: Time since last update in seconds, measured with SceneManager.now
         """
-        if self.current_scene:
-            self.current_scene.update(dt)
+        update = self._cur_update
+        if update is not None:
+            update(0.0 if dt < 0 else (dt if dt < MAX_FRAME_DT else MAX_FRAME_DT))
             
-            if not self.current_scene.is_running:
-                self.change_scene(self.current_scene.next_scene)
+            scene = self.current_scene
+            if not scene.is_running:
+                self.change_scene(scene.next_scene)
     
     def handle_event(self, event: pygame.event.Event) -> None:
         """Handle events for the current scene.
@@ -677,8 +1167,12 @@ class SceneManager:
         Args:
             event: The pygame event to handle
         """
-        if self.current_scene:
-            self.current_scene.handle_event(event)
+        handle = self._cur_handle
+        if handle is not None:
+            # The window contents were lost, so the next frame repaints all
+            if event.type in _EXPOSE_EVENTS:
+                self.current_scene.invalidate()
+            handle(event)
     
     def render(self, surface: pygame.Surface) -> None:
         """Render the current scene.
@@ -686,5 +1180,25 @@ class SceneManager:
         Args:
             surface: The surface to render to
         """
-        if self.current_scene:
-            self.current_scene.render(surface) 
\ No newline at end of file
+        render = self._cur_render
+        self.dirty_rects = render(surface) if render is not None else None
+    
+    def present(self) -> None:
+        """Push the last rendered frame to the display.
+        
+        Only the dirty rects are updated, unless there are so many of them,
+        or they cover so much of the screen, that a full flip is cheaper.
+        """
+        dirty = self.dirty_rects
+        if dirty is None or len(dirty) > MAX_DIRTY_RECTS:
+            pygame.display.flip()
+            return
+        if not dirty:
+            return
+        
+        width, height = pygame.display.get_surface().get_size()
+        dirty_area = sum(rect.width * rect.height for rect in dirty)
+        if dirty_area > DIRTY_FLIP_FRACTION * width * height:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
@@ -1,14 +1,28 @@
 """
 Scene description system that composes game scenes from basic elements.
 """
+import functools
 import logging
+from types import MappingProxyType
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple, Union
 from enum import Enum, auto
 import random
+import re
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# One pass over a description finds every keyword group it mentions. Keywords
+# match anywhere, like substring tests, so compounds such as "farmhouse" and
+# "treehouse" count too; the lookahead lets keywords overlap.
+_KEYWORD_RE = re.compile(
+    r"(?=(?P<path>path|road)|(?P<water>water|river)|(?P<wild>wild|flower)"
+    r"|(?P<house>house|building)|(?P<forest>tree|forest)|(?P<market>market|shop)"
+    r"|(?P<village>village)|(?P<monster>monster))"
+)
+
 class SceneElement(Enum):
     """Basic elements that can appear in a scene."""
     # Base terrain
@@ -46,18 +60,167 @@ class SceneElement(Enum):
     MONSTER_SMALL = auto()
     MONSTER_LARGE = auto()
 
-@dataclass
+# Tile paths available for each scene element
+ELEMENT_TO_TILES: Tuple[Tuple[SceneElement, Tuple[str, ...]], ...] = (
+    # Base terrain
+    (SceneElement.GRASS_PLAIN, ("dc-dngn/floor/grass/grass0.png", "dc-dngn/floor/grass/grass1.png")),
+    (SceneElement.GRASS_WILD, ("dc-dngn/floor/grass/grass_flowers_blue1.png", "dc-dngn/floor/grass/grass_flowers_red1.png")),
+    (SceneElement.DIRT_PATH, ("dc-dngn/floor/dirt0.png", "dc-dngn/floor/dirt1.png")),
+    (SceneElement.STONE_PATH, ("dc-dngn/floor/pebble_brown0.png", "dc-dngn/floor/pebble_brown1.png")),
+    (SceneElement.WATER, ("dc-dngn/water/dngn_shallow_water.png", "dc-dngn/water/dngn_deep_water.png")),
+
+    # Structures
+    (SceneElement.WALL_STONE, ("dc-dngn/wall/brick_brown0.png", "dc-dngn/wall/brick_brown1.png")),
+    (SceneElement.WALL_WOOD, ("dc-dngn/wall/lair0.png", "dc-dngn/wall/lair1.png")),
+    (SceneElement.DOOR_WOOD, ("dc-dngn/dngn_closed_door.png", "dc-dngn/dngn_open_door.png")),
+    (SceneElement.DOOR_METAL, ("dc-dngn/gate_closed_middle.png", "dc-dngn/gate_open_middle.png")),
+    (SceneElement.FLOOR_STONE, ("dc-dngn/floor/grey_dirt0.png", "dc-dngn/floor/grey_dirt1.png")),
+    (SceneElement.FLOOR_WOOD, ("dc-dngn/floor/lair0.png", "dc-dngn/floor/lair1.png")),
+
+    # Features
+    (SceneElement.TREE, ("dc-dngn/tree1.png", "dc-dngn/tree2.png")),
+    (SceneElement.ROCK, ("dc-dngn/wall/brick_dark0.png", "dc-dngn/wall/brick_dark1.png")),
+    (SceneElement.BUSH, ("dc-dngn/bush1.png", "dc-dngn/bush2.png")),
+    (SceneElement.FLOWER, ("dc-dngn/floor/grass/grass_flowers_yellow1.png", "dc-dngn/floor/grass/grass_flowers_yellow2.png")),
+
+    # Objects
+    (SceneElement.CHEST, ("dc-dngn/chest_closed.png", "dc-dngn/chest_open.png")),
+    (SceneElement.BARREL, ("dc-dngn/barrel.png", "dc-dngn/barrel_burning.png")),
+    (SceneElement.TABLE, ("dc-dngn/table_wood.png", "dc-dngn/table_stone.png")),
+    (SceneElement.CHAIR, ("dc-dngn/chair_wood.png", "dc-dngn/chair_stone.png")),
+
+    # Characters
+    (SceneElement.PLAYER, ("player/base/human_m.png", "player/base/human_f.png")),
+    (SceneElement.VILLAGER, ("dc-mon/human.png",)),
+    (SceneElement.MERCHANT, ("dc-mon/human.png",)),
+    (SceneElement.GUARD, ("dc-mon/human.png",)),
+    (SceneElement.MONSTER_SMALL, ("dc-mon/kobold.png", "dc-mon/goblin.png", "dc-mon/hobgoblin.png")),
+    (SceneElement.MONSTER_LARGE, ("dc-mon/ogre.png", "dc-mon/troll.png", "dc-mon/hill_giant.png")),
+)
+
+# Ordered (element name token, tile category) rules; the first match wins
+_CATEGORY_RULES = (
+    ("GRASS", "grass"),
+    ("PATH", "paths"),
+    ("WATER", "water"),
+    ("WALL", "walls"),
+    ("DOOR", "doors"),
+    ("FLOOR", "floors"),
+    ("TREE", "trees"),
+    ("BUSH", "trees"),
+    ("FLOWER", "trees"),
+    ("ROCK", "mountains"),
+    ("CHEST", "items"),
+    ("BARREL", "items"),
+    ("TABLE", "items"),
+)
+
+# Tile indexer category for each scene element
+ELEMENT_CATEGORY: Dict[SceneElement, str] = {
+    element: next((c for token, c in _CATEGORY_RULES if token in element.name), "special")
+    for element in SceneElement
+}
+
+# Packed placement record: SceneElement value plus tile coordinates
+PLACEMENT_DTYPE = np.dtype([("element", np.int32), ("x", np.int16), ("y", np.int16)])
+
+def _placements(*items: Tuple[SceneElement, int, int]) -> np.ndarray:
+    """Pack element placements into a read-only structured array.
+    
+    Args:
+        *items: (element, x, y) placements
+        
+    Returns:
+        Array of PLACEMENT_DTYPE records
+    """
+    arr = np.array([(element.value, x, y) for element, x, y in items], dtype=PLACEMENT_DTYPE)
+    arr.flags.writeable = False
+    return arr
+
+# Fixed placement sets used by describe_scene, shared between compositions
+_NO_PLACEMENTS = _placements()
+_HOUSE_STRUCTURES = _placements(
+    (SceneElement.WALL_WOOD, 5, 5),
+    (SceneElement.DOOR_WOOD, 5, 6),
+    (SceneElement.FLOOR_WOOD, 5, 7)
+)
+_FOREST_FEATURES = _placements(
+    (SceneElement.TREE, 2, 2),
+    (SceneElement.TREE, 8, 3),
+    (SceneElement.BUSH, 3, 4)
+)
+_MARKET_OBJECTS = _placements(
+    (SceneElement.TABLE, 4, 4),
+    (SceneElement.BARREL, 6, 4)
+)
+_VILLAGE_CHARACTERS = _placements(
+    (SceneElement.VILLAGER, 3, 3),
+    (SceneElement.MERCHANT, 5, 5)
+)
+_MONSTER_CHARACTERS = _placements((SceneElement.MONSTER_SMALL, 7, 7))
+
+@dataclass(frozen=True, slots=True)
 class SceneComposition:
-    """Represents how a scene should be composed."""
+    """Represents how a scene should be composed.
+    
+    Placement groups are PLACEMENT_DTYPE arrays; use ``SceneElement(rec["element"])``
+    to recover the element of a record.
+    """
     base_terrain: SceneElement
-    structures: List[Tuple[SceneElement, int, int]]  # element, x, y
-    features: List[Tuple[SceneElement, int, int]]
-    objects: List[Tuple[SceneElement, int, int]]
-    characters: List[Tuple[SceneElement, int, int]]
+    structures: np.ndarray
+    features: np.ndarray
+    objects: np.ndarray
+    characters: np.ndarray
+
+@functools.lru_cache(maxsize=1024)
+def _compose_scene(description: str) -> SceneComposition:
+    """Build the scene composition for a lowercase description.
+    
+    Compositions are immutable and depend only on the text, so results are
+    shared between calls.
+    
+    Args:
+        description: Lowercase text description of the scene
+        
+    Returns:
+        A SceneComposition object
+    """
+    # Default to grass plain as base
+    base_terrain = SceneElement.GRASS_PLAIN
+    
+    # Collect the keyword groups present in the description
+    hits = {m.lastgroup for m in _KEYWORD_RE.finditer(description)}
+    
+    # Determine base terrain
+    if "path" in hits:
+        base_terrain = SceneElement.DIRT_PATH
+    elif "water" in hits:
+        base_terrain = SceneElement.WATER
+    elif "wild" in hits:
+        base_terrain = SceneElement.GRASS_WILD
+    
+    # Add characters
+    if "village" in hits:
+        characters = _VILLAGE_CHARACTERS
+    elif "monster" in hits:
+        characters = _MONSTER_CHARACTERS
+    else:
+        characters = _NO_PLACEMENTS
+    
+    return SceneComposition(
+        base_terrain=base_terrain,
+        structures=_HOUSE_STRUCTURES if "house" in hits else _NO_PLACEMENTS,
+        features=_FOREST_FEATURES if "forest" in hits else _NO_PLACEMENTS,
+        objects=_MARKET_OBJECTS if "market" in hits else _NO_PLACEMENTS,
+        characters=characters
+    )
 
 class SceneDescriber:
     """Converts high-level scene descriptions into specific tile arrangements."""
     
+    # Read-only element -> tile paths view shared by all instances
+    element_to_tiles = MappingProxyType(dict(ELEMENT_TO_TILES))
+    
     def __init__(self, tile_indexer):
         """Initialize the scene describer.
         
@@ -68,43 +231,18 @@ class SceneDescriber:
         self._initialize_element_mappings()
     
     def _initialize_element_mappings(self):
-        """Initialize mappings between scene elements and actual tiles."""
-        self.element_to_tiles = {
-            # Base terrain
-            SceneElement.GRASS_PLAIN: ["dc-dngn/floor/grass/grass0.png", "dc-dngn/floor/grass/grass1.png"],
-            SceneElement.GRASS_WILD: ["dc-dngn/floor/grass/grass_flowers_blue1.png", "dc-dngn/floor/grass/grass_flowers_red1.png"],
-            SceneElement.DIRT_PATH: ["dc-dngn/floor/dirt0.png", "dc-dngn/floor/dirt1.png"],
-            SceneElement.STONE_PATH: ["dc-dngn/floor/pebble_brown0.png", "dc-dngn/floor/pebble_brown1.png"],
-            SceneElement.WATER: ["dc-dngn/water/dngn_shallow_water.png", "dc-dngn/water/dngn_deep_water.png"],
-            
-            # Structures
-            SceneElement.WALL_STONE: ["dc-dngn/wall/brick_brown0.png", "dc-dngn/wall/brick_brown1.png"],
-            SceneElement.WALL_WOOD: ["dc-dngn/wall/lair0.png", "dc-dngn/wall/lair1.png"],
-            SceneElement.DOOR_WOOD: ["dc-dngn/dngn_closed_door.png", "dc-dngn/dngn_open_door.png"],
-            SceneElement.DOOR_METAL: ["dc-dngn/gate_closed_middle.png", "dc-dngn/gate_open_middle.png"],
-            SceneElement.FLOOR_STONE: ["dc-dngn/floor/grey_dirt0.png", "dc-dngn/floor/grey_dirt1.png"],
-            SceneElement.FLOOR_WOOD: ["dc-dngn/floor/lair0.png", "dc-dngn/floor/lair1.png"],
-            
-            # Features
-            SceneElement.TREE: ["dc-dngn/tree1.png", "dc-dngn/tree2.png"],
-            SceneElement.ROCK: ["dc-dngn/wall/brick_dark0.png", "dc-dngn/wall/brick_dark1.png"],
-            SceneElement.BUSH: ["dc-dngn/bush1.png", "dc-dngn/bush2.png"],
-            SceneElement.FLOWER: ["dc-dngn/floor/grass/grass_flowers_yellow1.png", "dc-dngn/floor/grass/grass_flowers_yellow2.png"],
-            
-            # Objects
-            SceneElement.CHEST: ["dc-dngn/chest_closed.png", "dc-dngn/chest_open.png"],
-            SceneElement.BARREL: ["dc-dngn/barrel.png", "dc-dngn/barrel_burning.png"],
-            SceneElement.TABLE: ["dc-dngn/table_wood.png", "dc-dngn/table_stone.png"],
-            SceneElement.CHAIR: ["dc-dngn/chair_wood.png", "dc-dngn/chair_stone.png"],
-            
-            # Characters
-            SceneElement.PLAYER: ["player/base/human_m.png", "player/base/human_f.png"],
-            SceneElement.VILLAGER: ["dc-mon/human.png"],
-            SceneElement.MERCHANT: ["dc-mon/human.png"],
-            SceneElement.GUARD: ["dc-mon/human.png"],
-            SceneElement.MONSTER_SMALL: ["dc-mon/kobold.png", "dc-mon/goblin.png", "dc-mon/hobgoblin.png"],
-            SceneElement.MONSTER_LARGE: ["dc-mon/ogre.png", "dc-mon/troll.png", "dc-mon/hill_giant.png"]
-        }
+        """Resolve the shared element tile paths to this indexer's tile IDs."""
+        # Resolve every path to its tile ID once so placement is a single lookup.
+        # Elements with only one usable tile store the bare ID and skip the RNG.
+        self._element_to_ids: Dict[SceneElement, Union[int, Tuple[int, ...]]] = {}
+        for element, tile_paths in self.element_to_tiles.items():
+            ids = (self.tile_indexer.get_tile_id(path) for path in tile_paths)
+            ids = tuple(i for i in ids if i is not None)
+            if len(ids) == 1:
+                self._element_to_ids[element] = ids[0]
+            elif ids:
+                self._element_to_ids[element] = ids
+        self._randrange = random.Random().randrange
     
     def get_tile_for_element(self, element: 'SceneElement') -> Optional[int]:
         """Get a tile ID for a scene element.
@@ -115,25 +253,13 @@ class SceneDescriber:
         Returns:
             A tile ID for the element, or None if not found
         """
-        if element not in self.element_to_tiles:
-            logger.warning(f"No tiles defined for element: {element}")
-            return None
-            
-        # Get the list of possible tiles for this element
-        tile_paths = self.element_to_tiles[element]
-        if not tile_paths:
-            logger.warning(f"Empty tile list for element: {element}")
+        ids = self._element_to_ids.get(element)
+        if ids is None:
+            logger.warning("No tiles available for element: %s", element)
             return None
-            
-        # Pick a random tile from the list
-        tile_path = random.choice(tile_paths)
-            
-        # Get the tile ID from the indexer
-        tile_id = self.tile_indexer.get_tile_id(tile_path)
-        if tile_id is None:
-            logger.warning(f"Could not get tile ID for path: {tile_path}")
-            
-        return tile_id
+        if isinstance(ids, tuple):
+            return ids[self._randrange(len(ids))]
+        return ids
 
     def describe_scene(self, description: str) -> SceneComposition:
         """Convert a text description into a scene composition.
@@ -144,60 +270,4 @@ class SceneDescriber:
         Returns:
             A SceneComposition object
         """
-        # Default to grass plain as base
-        base_terrain = SceneElement.GRASS_PLAIN
-        structures = []
-        features = []
-        objects = []
-        characters = []
-        
-        # Simple keyword matching for now
-        description = description.lower()
-        
-        # Determine base terrain
-        if "path" in description or "road" in description:
-            base_terrain = SceneElement.DIRT_PATH
-        elif "water" in description or "river" in description:
-            base_terrain = SceneElement.WATER
-        elif "wild" in description or "flower" in description:
-            base_terrain = SceneElement.GRASS_WILD
-            
-        # Look for structures
-        if "house" in description or "building" in description:
-            structures.extend([
-                (SceneElement.WALL_WOOD, 5, 5),
-                (SceneElement.DOOR_WOOD, 5, 6),
-                (SceneElement.FLOOR_WOOD, 5, 7)
-            ])
-            
-        # Add features
-        if "tree" in description or "forest" in description:
-            features.extend([
-                (SceneElement.TREE, 2, 2),
-                (SceneElement.TREE, 8, 3),
-                (SceneElement.BUSH, 3, 4)
-            ])
-            
-        # Add objects
-        if "market" in description or "shop" in description:
-            objects.extend([
-                (SceneElement.TABLE, 4, 4),
-                (SceneElement.BARREL, 6, 4)
-            ])
-            
-        # Add characters
-        if "village" in description:
-            characters.extend([
-                (SceneElement.VILLAGER, 3, 3),
-                (SceneElement.MERCHANT, 5, 5)
-            ])
-        elif "monster" in description:
-            characters.append((SceneElement.MONSTER_SMALL, 7, 7))
-        
-        return SceneComposition(
-            base_terrain=base_terrain,
-            structures=structures,
-            features=features,
-            objects=objects,
-            characters=characters
-        ) 
\ No newline at end of file
+        return _compose_scene(description.lower())
@@ -1,9 +1,12 @@
 """
 System for mapping high-level tile concepts to actual available tiles.
 """
+import functools
 import logging
+import random
+import sys
 from enum import Enum, auto
-from typing import Dict, List, Optional, Set, Union
+from typing import Dict, FrozenSet, List, Optional, Union
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
@@ -39,24 +42,42 @@ class TileConcept(Enum):
     MAGIC_EFFECT = auto()
     NATURAL_EFFECT = auto()
 
-@dataclass
+def _tags(*words: str) -> FrozenSet[str]:
+    """Build an interned, lowercase tag set for a concept.
+    
+    Args:
+        *words: Tag words
+        
+    Returns:
+        Frozen set of interned tags
+    """
+    return frozenset(sys.intern(word.lower()) for word in words)
+
+@dataclass(frozen=True, slots=True)
 class ConceptMatch:
     """Represents a match between a concept and actual tiles."""
     concept: TileConcept
     priority: int
-    tags: Set[str]
+    tags: FrozenSet[str]
 
 class ConceptMapper:
     """Maps high-level concepts to actual available tiles."""
     
-    def __init__(self, tile_indexer):
+    def __init__(self, tile_indexer, seed: Optional[int] = None):
         """Initialize the concept mapper.
         
         Args:
             tile_indexer: The TileIndexer instance to use
+            seed: Optional random seed for reproducible tile picks
         """
         self.tile_indexer = tile_indexer
+        
+        # Private generator so tile picks don't share global state
+        self.rng = random.Random(seed)
         self._initialize_concept_mappings()
+        
+        # Scoring depends only on the lowercased string, so memoize it per mapper
+        self._score_string = functools.lru_cache(maxsize=4096)(self._score_string)
     
     def _initialize_concept_mappings(self):
         """Initialize the mappings between concepts and tile categories/patterns."""
@@ -65,107 +86,117 @@ class ConceptMapper:
             TileConcept.GRASS: ConceptMatch(
                 TileConcept.GRASS,
                 1,
-                {"grass", "natural", "ground"}
+                _tags("grass", "natural", "ground")
             ),
             TileConcept.WATER: ConceptMatch(
                 TileConcept.WATER,
                 1,
-                {"water", "liquid", "pool", "river"}
+                _tags("water", "liquid", "pool", "river")
             ),
             TileConcept.PATH: ConceptMatch(
                 TileConcept.PATH,
                 1,
-                {"path", "road", "dirt", "cobble"}
+                _tags("path", "road", "dirt", "cobble")
             ),
             TileConcept.WALL: ConceptMatch(
                 TileConcept.WALL,
                 1,
-                {"wall", "barrier", "stone", "brick"}
+                _tags("wall", "barrier", "stone", "brick")
             ),
             TileConcept.FLOOR: ConceptMatch(
                 TileConcept.FLOOR,
                 1,
-                {"floor", "ground", "indoor"}
+                _tags("floor", "ground", "indoor")
             ),
             
             # Structures
             TileConcept.BUILDING: ConceptMatch(
                 TileConcept.BUILDING,
                 2,
-                {"house", "building", "structure", "shop"}
+                _tags("house", "building", "structure", "shop")
             ),
             TileConcept.DOOR: ConceptMatch(
                 TileConcept.DOOR,
                 2,
-                {"door", "gate", "entrance"}
+                _tags("door", "gate", "entrance")
             ),
             TileConcept.SHRINE: ConceptMatch(
                 TileConcept.SHRINE,
                 2,
-                {"altar", "shrine", "statue", "monument"}
+                _tags("altar", "shrine", "statue", "monument")
             ),
             TileConcept.DECORATION: ConceptMatch(
                 TileConcept.DECORATION,
                 3,
-                {"decoration", "ornament", "feature"}
+                _tags("decoration", "ornament", "feature")
             ),
             
             # Characters
             TileConcept.HUMANOID: ConceptMatch(
                 TileConcept.HUMANOID,
                 1,
-                {"human", "elf", "dwarf", "player"}
+                _tags("human", "elf", "dwarf", "player")
             ),
             TileConcept.MONSTER: ConceptMatch(
                 TileConcept.MONSTER,
                 1,
-                {"monster", "creature", "demon", "undead"}
+                _tags("monster", "creature", "demon", "undead")
             ),
             TileConcept.BEAST: ConceptMatch(
                 TileConcept.BEAST,
                 1,
-                {"beast", "animal", "wolf", "bear"}
+                _tags("beast", "animal", "wolf", "bear")
             ),
             TileConcept.MAGICAL_BEING: ConceptMatch(
                 TileConcept.MAGICAL_BEING,
                 2,
-                {"magical", "elemental", "spirit", "ghost"}
+                _tags("magical", "elemental", "spirit", "ghost")
             ),
             
             # Items
             TileConcept.WEAPON: ConceptMatch(
                 TileConcept.WEAPON,
                 1,
-                {"weapon", "sword", "axe", "staff"}
+                _tags("weapon", "sword", "axe", "staff")
             ),
             TileConcept.ARMOR: ConceptMatch(
                 TileConcept.ARMOR,
                 1,
-                {"armor", "shield", "helmet", "boots"}
+                _tags("armor", "shield", "helmet", "boots")
             ),
             TileConcept.MAGICAL_ITEM: ConceptMatch(
                 TileConcept.MAGICAL_ITEM,
                 2,
-                {"magic", "scroll", "potion", "ring"}
+                _tags("magic", "scroll", "potion", "ring")
             ),
             TileConcept.TREASURE: ConceptMatch(
                 TileConcept.TREASURE,
                 2,
-                {"treasure", "gold", "gem", "valuable"}
+                _tags("treasure", "gold", "gem", "valuable")
             ),
             
             # Effects
             TileConcept.MAGIC_EFFECT: ConceptMatch(
                 TileConcept.MAGIC_EFFECT,
                 3,
-                {"effect", "magic", "spell", "rune"}
+                _tags("effect", "magic", "spell", "rune")
             ),
             TileConcept.NATURAL_EFFECT: ConceptMatch(
                 TileConcept.NATURAL_EFFECT,
                 3,
-                {"effect", "natural", "mist", "fire"}
+                _tags("effect", "natural", "mist", "fire")
             )
         }
+        
+        # Invert the tags so each distinct tag is searched for only once when
+        # scoring a string; concepts are referenced by their position in
+        # concept_matches to keep its ordering for tie-breaks
+        self._concept_order = tuple(self.concept_matches)
+        tag_index: Dict[str, List[int]] = {}
+        for i, match in enumerate(self.concept_matches.values()):
+            for tag in match.tags:
+                tag_index.setdefault(tag, []).append(i)
+        self._tag_index = tuple((tag, tuple(ids)) for tag, ids in tag_index.items())
     
     def get_tile_for_concept(self, concept: Union[TileConcept, str], context: Optional[Dict[str, str]] = None) -> Optional[int]:
         """Get a tile ID that best represents a concept.
@@ -193,34 +224,37 @@ class ConceptMapper:
         if not match:
             return None
             
-        # Try to find a tile that matches the concept
-        best_tile = None
+        # Lowercase the context hints once rather than per tile
+        hints = [hint.lower() for hint in context.values()] if context else None
         
-        # First try category-based matching
-        for category, tiles in self.tile_indexer.tile_categories.items():
-            if any(tag in category.lower() for tag in match.tags):
-                if tiles:
-                    # Use context to pick the best tile if available
-                    if context:
-                        for tile in tiles:
-                            if any(hint.lower() in str(tile).lower() for hint in context.values()):
-                                return self.tile_indexer.get_tile_id(tile)
-                    # Otherwise pick a random appropriate tile
-                    import random
-                    return self.tile_indexer.get_tile_id(random.choice(tiles))
+        # First try category-based matching on whole category words
+        indexer = self.tile_indexer
+        for category, tiles in indexer.tile_categories.items():
+            if tiles and not match.tags.isdisjoint(indexer.get_category_words(category)):
+                # Use context to pick the best tile if available
+                if hints:
+                    for tile in tiles:
+                        tile_lower = tile.lower()
+                        if any(hint in tile_lower for hint in hints):
+                            return indexer.get_tile_id(tile)
+                # Otherwise pick a random appropriate tile
+                return indexer.get_tile_id(self.rng.choice(tiles))
         
-        # If no category match, try individual tile matching
-        for category, tiles in self.tile_indexer.tile_categories.items():
-            for tile in tiles:
-                tile_str = str(tile).lower()
-                if any(tag in tile_str for tag in match.tags):
+        # If no category match, sample one tile in a single pass (A-Res weighted
+        # reservoir), weighting each tile by tag overlap times concept priority
+        best_tile = None
+        best_key = 0.0
+        rand = self.rng.random
+        for tile, tokens in indexer.get_tile_tokens().items():
+            weight = len(match.tags & tokens) * match.priority
+            if weight > 0:
+                key = rand() ** (1.0 / weight)
+                if key > best_key:
+                    best_key = key
                     best_tile = tile
-                    break
-            if best_tile:
-                break
         
         if best_tile:
-            return self.tile_indexer.get_tile_id(best_tile)
+            return indexer.get_tile_id(best_tile)
             
         return None
     
@@ -233,16 +267,26 @@ class ConceptMapper:
         Returns:
             The most appropriate concept, or None if no good match
         """
-        string = string.lower()
-        
-        # Try to match against concept tags
-        best_match = None
-        best_score = 0
+        return self._score_string(string.lower())
+    
+    def _score_string(self, string: str) -> Optional[TileConcept]:
+        """Pick the concept whose tags best match a lowercase string.
         
-        for concept, match in self.concept_matches.items():
-            score = sum(1 for tag in match.tags if tag in string)
-            if score > best_score:
-                best_score = score
-                best_match = concept
+        Args:
+            string: Lowercase string to score
+            
+        Returns:
+            The highest scoring concept, or None if no tag matched
+        """
+        # Score every concept in one pass over the distinct tags
+        scores = [0] * len(self._concept_order)
+        for tag, concept_ids in self._tag_index:
+            if tag in string:
+                for i in concept_ids:
+                    scores[i] += 1
         
-        return best_match 
\ No newline at end of file
+        # The first concept with the highest score wins, as before
+        best_score = max(scores, default=0)
+        if not best_score:
+            return None
+        return self._concept_order[scores.index(best_score)]
@@ -3,24 +3,61 @@ Tile indexing system that maps organized tile folders to usable game tiles.
 """
 import os
 import json
+import math
 import random
-import pygame
+import re
+import sys
+from collections import OrderedDict
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Set, Union
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Tuple, Optional, Set, Union, TYPE_CHECKING
+
+from .scene_description import ELEMENT_CATEGORY, ELEMENT_TO_TILES
+
+# pygame is imported where surfaces are built so that indexing and config
+# generation do not pay for initializing SDL
+if TYPE_CHECKING:
+    import pygame
 
 # Configure logger
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+# Maximum number of decoded tile surfaces kept in memory at once
+TILE_CACHE_SIZE = 512
+
+# Snapshot of the tile index written next to the assets, and its format version
+INDEX_CACHE_NAME = "tile_index.cache.json"
+INDEX_CACHE_VERSION = 1
+
+_WORD_SPLIT_RE = re.compile(r"[^a-z]+")
+
+def _tokenize(text: str) -> frozenset:
+    """Split a category name or tile path into lowercase word tokens.
+    
+    Plural words also contribute their singular form so that a tag such as
+    "house" still matches the "houses" category.
+    
+    Args:
+        text: Category name or tile path
+        
+    Returns:
+        Frozen set of word tokens
+    """
+    words = {w for w in _WORD_SPLIT_RE.split(text.lower()) if w}
+    words.update(w[:-1] for w in list(words) if len(w) > 3 and w.endswith("s"))
+    return frozenset(words)
+
 class TileIndexer:
     """Class for indexing and organizing tiles from structured tile directories."""
     
-    def __init__(self, base_path: str = "game/assets/images"):
+    def __init__(self, base_path: str = "game/assets/images", rebuild_index: bool = False):
         """Initialize the tile indexer.
         
         Args:
             base_path: Path to the image assets
+            rebuild_index: Ignore any cached index snapshot and re-scan the tiles
         """
         self.base_path = Path(base_path)
         self.crawl_tiles_path = self.base_path / "crawl-tiles Oct-5-2010"
@@ -30,8 +67,15 @@ class TileIndexer:
         if not self.crawl_tiles_path.exists():
             raise RuntimeError(f"Crawl tiles directory not found at: {self.crawl_tiles_path}")
         
-        # Cached tile surfaces
-        self.tiles_cache: Dict[str, pygame.Surface] = {}
+        # Cached tile surfaces, least recently used first
+        self.tiles_cache: "OrderedDict[str, pygame.Surface]" = OrderedDict()
+        
+        # Remembered results of tile file existence checks
+        self._existence_cache: Dict[str, bool] = {}
+        
+        # Single surface holding every indexed tile, keyed by tile ID
+        self.atlas: Optional["pygame.Surface"] = None
+        self._atlas_rects: Dict[int, "pygame.Rect"] = {}
         
         # Tile type categories and paths
         self.tile_categories = {
@@ -50,13 +94,35 @@ class TileIndexer:
             "monster": []
         }
         
+        # Set view of each category list for constant-time duplicate checks
+        self._category_members: Dict[str, Set[str]] = {
+            category: set() for category in self.tile_categories
+        }
+        
+        # Word tokens for category names and registered tile paths, used for
+        # set-intersection matching against concept tags
+        self._lower_category_words: Dict[str, frozenset] = {
+            category: _tokenize(category) for category in self.tile_categories
+        }
+        self._tile_tokens: Dict[str, frozenset] = {}
+        
         # Map tile names to numeric IDs
         self.name_to_id: Dict[str, int] = {}
         self.id_to_name: Dict[int, str] = {}
         self.current_id = 1  # Start from 1, 0 reserved for empty
         
-        # Initialize by indexing only the tiles we use
-        self._index_tiles()
+        # Initialize by indexing only the tiles we use, reusing the on-disk
+        # snapshot when the tile directories have not changed since it was written
+        self.index_cache_path = self.base_path / INDEX_CACHE_NAME
+        if rebuild_index or not self._load_index_cache():
+            self._index_tiles()
+            self._save_index_cache()
+        
+        # Converting surfaces needs a display, so only preload when one exists
+        # (which also means pygame has already been imported)
+        display = getattr(sys.modules.get("pygame"), "display", None)
+        if display is not None and display.get_surface() is not None:
+            self.build_atlas()
     
     def _register_tile(self, tile_path: str, category: str):
         """Register a tile with a unique ID.
@@ -67,64 +133,54 @@ class TileIndexer:
         """
         try:
             tile_path_str = str(tile_path)
-            logger.debug(f"Registering tile: {tile_path_str} in category: {category}")
+            logger.debug("Registering tile: %s in category: %s", tile_path_str, category)
             
             # Check if the tile file exists
             full_path = self.crawl_tiles_path / tile_path_str
-            if not full_path.exists():
-                logger.warning(f"Tile file does not exist: {full_path}")
+            exists = self._existence_cache.get(tile_path_str)
+            if exists is None:
+                exists = self._existence_cache[tile_path_str] = full_path.exists()
+            if not exists:
+                logger.warning("Tile file does not exist: %s", full_path)
                 return
                 
             if tile_path_str not in self.name_to_id:
                 self.name_to_id[tile_path_str] = self.current_id
                 self.id_to_name[self.current_id] = tile_path_str
+                self._tile_tokens[tile_path_str] = _tokenize(tile_path_str)
                 self.current_id += 1
-                logger.debug(f"Assigned ID {self.current_id-1} to tile: {tile_path_str}")
+                logger.debug("Assigned ID %d to tile: %s", self.current_id - 1, tile_path_str)
             
             category_str = str(category)
-            if category_str in self.tile_categories:
-                if tile_path_str not in self.tile_categories[category_str]:
+            members = self._category_members.get(category_str)
+            if members is not None:
+                if tile_path_str not in members:
+                    members.add(tile_path_str)
                     self.tile_categories[category_str].append(tile_path_str)
-                    logger.debug(f"Added tile to category {category_str}: {tile_path_str}")
+                    logger.debug("Added tile to category %s: %s", category_str, tile_path_str)
         except Exception as e:
             logger.error(f"Error registering tile {tile_path} in category {category}: {e}")
 
+    def _reset_categories(self):
+        """Empty every tile category along with its membership set."""
+        for category in self.tile_categories:
+            self.tile_categories[category] = []
+            self._category_members[category] = set()
+
     def _index_tiles(self):
         """Index all available tiles in the directory structure."""
         # Reset all categories before indexing
-        for category in self.tile_categories:
-            self.tile_categories[category] = []
+        self._reset_categories()
             
         # Reset ID mappings
         self.name_to_id.clear()
         self.id_to_name.clear()
+        self._tile_tokens.clear()
         self.current_id = 1  # Start from 1, 0 reserved for empty
         
-        # Get the structured paths from scene_description.py
-        from .scene_description import SceneElement, SceneDescriber
-        
-        # Import the scene element mappings
-        scene_describer = SceneDescriber(self)
-        
-        # Index only the specific tiles we use
-        for element, tile_paths in scene_describer.element_to_tiles.items():
-            # Determine the category based on the element name
-            if "GRASS" in element.name or "PATH" in element.name or "WATER" in element.name:
-                category = "grass" if "GRASS" in element.name else "paths" if "PATH" in element.name else "water"
-            elif "WALL" in element.name:
-                category = "walls"
-            elif "DOOR" in element.name:
-                category = "doors"
-            elif "FLOOR" in element.name:
-                category = "floors"
-            elif "TREE" in element.name or "BUSH" in element.name or "FLOWER" in element.name:
-                category = "trees"
-            elif "ROCK" in element.name:
-                category = "mountains"
-            elif "CHEST" in element.name or "BARREL" in element.name or "TABLE" in element.name:
-                category = "items"
-            else:
-                category = "special"
+        # Index only the specific tiles the scene elements use
+        for element, tile_paths in ELEMENT_TO_TILES:
+            category = ELEMENT_CATEGORY[element]
             
             # Register each tile path for this element
             for tile_path in tile_paths:
@@ -134,7 +190,7 @@ class TileIndexer:
         for category, tiles in self.tile_categories.items():
             if tiles:
                 logger.info(f"Indexed {len(tiles)} {category} tiles")
-                logger.debug(f"Sample tiles for {category}: {tiles[:3]}")
+                logger.debug("Sample tiles for %s: %s", category, tiles[:3])
                 
     def get_tile_id(self, identifier: Union[str, int]) -> Optional[int]:
         """Get the numeric ID for a tile identifier.
@@ -149,33 +205,28 @@ class TileIndexer:
         if isinstance(identifier, int):
             return identifier if identifier in self.id_to_name else None
             
-        # Convert to string for all other cases
-        try:
-            identifier_str = str(identifier)
-            logger.debug(f"Looking up tile ID for identifier: {identifier_str}")
-            
-            # If it's already a registered path, return its ID
-            if identifier_str in self.name_to_id:
-                logger.debug(f"Found registered path: {identifier_str}")
-                return self.name_to_id[identifier_str]
-            
-            # Try to find a matching tile path in our categories
-            for category, tiles in self.tile_categories.items():
-                logger.debug(f"Searching in category {category} with {len(tiles)} tiles")
-                for tile in tiles:
-                    logger.debug(f"Comparing with tile: {tile}")
-                    if identifier_str == tile:  # Use exact matching
-                        logger.debug(f"Found matching tile: {tile}")
-                        return self.name_to_id.get(str(tile))
-            
-            # If no match found, log a warning and return None
-            logger.warning(f"Could not find tile ID for identifier: {identifier}")
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error looking up tile ID for {identifier}: {e}")
-            return None
+        # Every categorized tile is registered in name_to_id, so one probe suffices
+        return self.name_to_id.get(str(identifier))
 
+    def get_category_words(self, category: str) -> FrozenSet[str]:
+        """Get the lowercase word tokens of a category name.
+        
+        Args:
+            category: Tile category (grass, water, trees, etc.)
+            
+        Returns:
+            The category's words, empty for an unknown category
+        """
+        return self._lower_category_words.get(category, frozenset())
+    
+    def get_tile_tokens(self) -> Mapping[str, FrozenSet[str]]:
+        """Get the lowercase word tokens of every registered tile path.
+        
+        Returns:
+            Read-only view of tile path -> words, in registration order
+        """
+        return MappingProxyType(self._tile_tokens)
+    
     def get_random_tile(self, category: str) -> Optional[str]:
         """Get a random tile path from the specified category.
         
@@ -207,7 +258,56 @@ class TileIndexer:
             logger.error(f"Error resolving path for tile {tile_id}: {e}")
             return self.crawl_tiles_path / tile_id
     
-    def get_tile_surface(self, tile_id: str) -> Optional[pygame.Surface]:
+    def build_atlas(self) -> Optional["pygame.Surface"]:
+        """Load every indexed tile once into a single atlas surface.
+        
+        Tile IDs map to atlas cells in row-major order, so callers can blit
+        with ``surface.blit(indexer.atlas, dest, indexer.get_atlas_rect(id))``.
+        Requires an active display for ``convert_alpha``.
+        
+        Returns:
+            The atlas surface, or None if there are no tiles to load
+        """
+        import pygame
+        
+        self.atlas = None
+        self._atlas_rects.clear()
+        if not self.id_to_name:
+            return None
+        
+        ts = self.tile_size
+        cols = math.ceil(math.sqrt(self.current_id))
+        rows = math.ceil(self.current_id / cols)
+        atlas = pygame.Surface((cols * ts, rows * ts), pygame.SRCALPHA).convert_alpha()
+        
+        for tile_id, tile_path in self.id_to_name.items():
+            try:
+                surface = pygame.image.load(str(self.get_tile_path(tile_path))).convert_alpha()
+            except Exception as e:
+                logger.error(f"Error loading tile {tile_path} into atlas: {e}")
+                continue
+            if surface.get_width() != ts or surface.get_height() != ts:
+                surface = pygame.transform.scale(surface, (ts, ts))
+            rect = pygame.Rect(tile_id % cols * ts, tile_id // cols * ts, ts, ts)
+            atlas.blit(surface, rect)
+            self._atlas_rects[tile_id] = rect
+        
+        self.atlas = atlas
+        logger.info(f"Built tile atlas with {len(self._atlas_rects)} tiles")
+        return atlas
+    
+    def get_atlas_rect(self, tile_id: int) -> Optional["pygame.Rect"]:
+        """Get the atlas area holding a tile.
+        
+        Args:
+            tile_id: Numeric tile ID
+            
+        Returns:
+            Source rect within the atlas, or None if the tile is not in it
+        """
+        return self._atlas_rects.get(tile_id)
+    
+    def get_tile_surface(self, tile_id: str) -> Optional["pygame.Surface"]:
         """Get a pygame surface for the specified tile.
         
         Args:
@@ -216,29 +316,117 @@ class TileIndexer:
         Returns:
             Pygame surface for the tile, or None if not found
         """
-        if tile_id in self.tiles_cache:
-            return self.tiles_cache[tile_id]
+        cache = self.tiles_cache
+        surface = cache.get(tile_id)
+        if surface is not None:
+            cache.move_to_end(tile_id)
+            return surface
+        
+        # Tiles already in the atlas are served as views without reloading
+        rect = self._atlas_rects.get(self.name_to_id.get(tile_id))
+        if rect is not None:
+            surface = cache[tile_id] = self.atlas.subsurface(rect)
+            if len(cache) > TILE_CACHE_SIZE:
+                cache.popitem(last=False)
+            return surface
         
         try:
             path = self.get_tile_path(tile_id)
-            logger.debug(f"Loading tile from path: {path}")
-            if not path.exists():
-                logger.warning(f"Tile file does not exist: {path}")
+            exists = self._existence_cache.get(tile_id)
+            if exists is None:
+                exists = self._existence_cache[tile_id] = path.exists()
+            if not exists:
+                logger.warning("Tile file does not exist: %s", path)
                 return None
-                
+            
+            import pygame
             surface = pygame.image.load(str(path)).convert_alpha()
             
             # Resize if needed
             if surface.get_width() != self.tile_size or surface.get_height() != self.tile_size:
                 surface = pygame.transform.scale(surface, (self.tile_size, self.tile_size))
                 
-            # Cache the surface
-            self.tiles_cache[tile_id] = surface
+            # Cache the surface, evicting the least recently used one when full
+            cache[tile_id] = surface
+            if len(cache) > TILE_CACHE_SIZE:
+                cache.popitem(last=False)
             return surface
         except Exception as e:
             logger.error(f"Error loading tile {tile_id}: {e}")
             return None
     
+    def _index_signature(self) -> Dict:
+        """Describe the inputs the tile index was built from.
+        
+        Adding or removing a file changes the modification time of its
+        directory, so the directories holding referenced tiles are stat'd
+        instead of every tile file.
+        
+        Returns:
+            Element tile table and directory modification times
+        """
+        dirs = sorted({str(Path(path).parent) for _, paths in ELEMENT_TO_TILES for path in paths})
+        mtimes = {}
+        for d in dirs:
+            try:
+                mtimes[d] = (self.crawl_tiles_path / d).stat().st_mtime_ns
+            except OSError:
+                mtimes[d] = None
+        return {
+            "version": INDEX_CACHE_VERSION,
+            "tiles": [[element.name, list(paths)] for element, paths in ELEMENT_TO_TILES],
+            "dir_mtimes": mtimes,
+        }
+
+    def _load_index_cache(self) -> bool:
+        """Restore the tile index from its on-disk snapshot.
+        
+        Returns:
+            True if a current snapshot was loaded, False otherwise
+        """
+        try:
+            with open(self.index_cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        if cache.get("signature") != self._index_signature():
+            return False
+        
+        try:
+            name_to_id = {str(name): int(tile_id) for name, tile_id in cache["name_to_id"].items()}
+            categories = cache["tile_categories"]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            logger.warning("Ignoring malformed tile index cache: %s", self.index_cache_path)
+            return False
+        
+        self._reset_categories()
+        self.name_to_id = name_to_id
+        self.id_to_name = {tile_id: name for name, tile_id in name_to_id.items()}
+        self.current_id = max(self.id_to_name, default=0) + 1
+        self._tile_tokens = {name: _tokenize(name) for name in name_to_id}
+        self._existence_cache.update(dict.fromkeys(name_to_id, True))
+        for category, tiles in categories.items():
+            if category in self.tile_categories:
+                self.tile_categories[category] = list(tiles)
+                self._category_members[category] = set(tiles)
+        
+        logger.info("Loaded %d tiles from index cache", len(name_to_id))
+        return True
+
+    def _save_index_cache(self):
+        """Write the current tile index to its on-disk snapshot."""
+        cache = {
+            "signature": self._index_signature(),
+            "name_to_id": self.name_to_id,
+            "tile_categories": self.tile_categories,
+        }
+        try:
+            with open(self.index_cache_path, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            logger.warning(f"Could not write tile index cache: {e}")
+
     def generate_tileset_config(self, output_path: Optional[str] = None) -> Dict[str, List[str]]:
         """Generate a tileset configuration based on the indexed tiles.
         
@@ -276,8 +464,7 @@ class TileIndexer:
                 return False
                 
             # Clear existing categories
-            for category in self.tile_categories:
-                self.tile_categories[category] = []
+            self._reset_categories()
                 
             # Load categories and generate IDs
             for category, tile_paths in tile_config.items():
@@ -3,8 +3,10 @@ Tile-based map system for game world.
 """
 import pygame
 import random
+import numpy as np
 import json
 import os
+import functools
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 import logging
@@ -12,6 +14,21 @@ import logging
 # Configure logger
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
+def _load_tile_config() -> Dict:
+    """Load the default tileset configuration once per process.
+    
+    Returns:
+        The parsed configuration (shared, treat as read-only), or an empty
+        dict if it could not be loaded
+    """
+    try:
+        with open("game/config/tileset.json", "r") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Error loading tile configuration: {e}")
+        return {}
+
 class Tileset:
     """Manages tileset images and provides methods for accessing tiles."""
     
@@ -30,8 +47,15 @@ class Tileset:
         self.tileset_width = self.tileset_image.get_width() // tile_size
         self.tileset_height = self.tileset_image.get_height() // tile_size
         
-        # Dictionary to cache extracted tiles
-        self.tiles: Dict[int, pygame.Surface] = {}
+        # Extract every tile up front so lookups are a plain list index
+        self.tiles: List[pygame.Surface] = [
+            self.tileset_image.subsurface(pygame.Rect(
+                (i % self.tileset_width) * tile_size,
+                (i // self.tileset_width) * tile_size,
+                tile_size, tile_size
+            )).convert_alpha()
+            for i in range(self.tileset_width * self.tileset_height)
+        ]
         
         # Load tile configuration if it exists
         config_path = os.path.splitext(tileset_path)[0] + "_config.json"
@@ -46,6 +70,12 @@ class Tileset:
         else:
             logger.info(f"No tile configuration found at {config_path}, using defaults")
             self._set_default_tile_types()
+        
+        # Array form of each tile type for vectorized sampling and lookups
+        self.tile_type_arrays: Dict[str, np.ndarray] = {
+            tile_type: np.asarray(tile_ids, dtype=np.uint16)
+            for tile_type, tile_ids in self.tile_types.items()
+        }
     
     def _set_default_tile_types(self):
         """Set default tile type mappings based on visual inspection of common tilesets."""
@@ -78,21 +108,7 @@ class Tileset:
         Returns:
             The requested tile surface
         """
-        if tile_id in self.tiles:
-            return self.tiles[tile_id]
-        
-        # Calculate the position of the tile in the tileset
-        tile_x = (tile_id % self.tileset_width) * self.tile_size
-        tile_y = (tile_id // self.tileset_width) * self.tile_size
-        
-        # Extract the tile from the tileset
-        tile_rect = pygame.Rect(tile_x, tile_y, self.tile_size, self.tile_size)
-        tile = self.tileset_image.subsurface(tile_rect)
-        
-        # Cache the tile for future use
-        self.tiles[tile_id] = tile
-        
-        return tile
+        return self.tiles[tile_id]
     
     def get_random_tile(self, tile_type: str) -> pygame.Surface:
         """Get a random tile of the specified type.
@@ -124,16 +140,35 @@ class TileMap:
         self.width = width
         self.height = height
         self.tile_size = tile_size
-        self.map_data: List[List[int]] = [[0 for _ in range(width)] for _ in range(height)]
         self.tileset: Optional[Tileset] = None
         
-        # Try to load default tileset configuration
-        try:
-            with open("game/config/tileset.json", "r") as f:
-                self.tile_config = json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading tile configuration: {e}")
-            self.tile_config = {}
+        # Pre-rendered copy of the whole map, patched with tiles changed via
+        # set_tile and rebuilt when the tiles or tileset are replaced
+        self._cached_surface: Optional[pygame.Surface] = None
+        self._dirty_tiles: set = set()
+        self.map_data = np.zeros((height, width), dtype=np.uint16)
+        
+        # Default tileset configuration, shared by all maps
+        self.tile_config = _load_tile_config()
+    
+    @property
+    def map_data(self) -> np.ndarray:
+        """Tile IDs as a (height, width) uint16 array.
+        
+        Code that writes into the array in place rather than through set_tile
+        must call invalidate() afterwards.
+        """
+        return self._map_data
+    
+    @map_data.setter
+    def map_data(self, data: np.ndarray):
+        self._map_data = data
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drop the pre-rendered map so the next render redraws every tile."""
+        self._cached_surface = None
+        self._dirty_tiles.clear()
     
     def set_tileset(self, tileset: Tileset):
         """Set the tileset to use for this map.
@@ -142,6 +177,7 @@ class TileMap:
             tileset: The tileset to use
         """
         self.tileset = tileset
+        self.invalidate()
     
     def set_tile(self, x: int, y: int, tile_id: int):
         """Set a tile at the specified position.
@@ -152,7 +188,9 @@ class TileMap:
             tile_id: ID of the tile to set
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            self.map_data[y][x] = tile_id
+            self._map_data[y, x] = tile_id
+            if self._cached_surface is not None:
+                self._dirty_tiles.add((x, y))
     
     def get_tile_id(self, x: int, y: int) -> int:
         """Get the ID of the tile at the specified position.
@@ -165,9 +203,17 @@ class TileMap:
             The ID of the tile at the specified position
         """
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.map_data[y][x]
+            return int(self.map_data[y, x])
         return 0
     
+    def get_tile_id_array(self) -> np.ndarray:
+        """Get every tile ID at once as a (height, width) array.
+        
+        Returns:
+            The map's tile ID array; in-place writes require invalidate()
+        """
+        return self._map_data
+    
     def render(self, surface: pygame.Surface, camera_x: int = 0, camera_y: int = 0):
         """Render the tile map.
         
@@ -179,60 +225,159 @@ class TileMap:
         if not self.tileset:
             return
         
-        # Calculate the range of tiles to render based on the camera position
-        start_x = max(0, camera_x // self.tile_size)
-        start_y = max(0, camera_y // self.tile_size)
-        end_x = min(self.width, start_x + surface.get_width() // self.tile_size + 2)
-        end_y = min(self.height, start_y + surface.get_height() // self.tile_size + 2)
-        
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                tile_id = self.map_data[y][x]
-                tile = self.tileset.get_tile(tile_id)
-                dest_x = x * self.tile_size - camera_x
-                dest_y = y * self.tile_size - camera_y
-                surface.blit(tile, (dest_x, dest_y))
+        if self._cached_surface is None:
+            self._build_cached_surface()
+        elif self._dirty_tiles:
+            self._redraw_dirty_tiles()
+        
+        # Tiles only change through the cache, so a frame is a single blit of
+        # the part of the map that falls inside the view
+        src_x = max(0, camera_x)
+        src_y = max(0, camera_y)
+        dest_x = src_x - camera_x
+        dest_y = src_y - camera_y
+        area = (src_x, src_y, surface.get_width() - dest_x, surface.get_height() - dest_y)
+        surface.blit(self._cached_surface, (dest_x, dest_y), area)
+    
+    def _build_cached_surface(self):
+        """Render every tile of the map into the cached map surface."""
+        tile_size = self.tile_size
+        cached = pygame.Surface((self.width * tile_size, self.height * tile_size)).convert()
+        cached.fill((0, 0, 0))
+        
+        # Resolve each distinct tile once, then issue a single batched blit
+        get_tile = self.tileset.get_tile
+        tiles = {tile_id: get_tile(tile_id) for tile_id in np.unique(self._map_data).tolist()}
+        
+        # Tiles never overlap, so cells can be drawn grouped by tile ID; runs of
+        # the same source surface keep its pixels hot in cache during the blits
+        flat = self._map_data.ravel()
+        order = np.argsort(flat, kind="stable")
+        rows, cols = np.divmod(order, self.width)
+        blit_seq = [
+            (tiles[tile_id], (dest_x, dest_y))
+            for tile_id, dest_x, dest_y in zip(flat[order].tolist(),
+                                               (cols * tile_size).tolist(),
+                                               (rows * tile_size).tolist())
+        ]
+        cached.blits(blit_seq, doreturn=False)
+        
+        self._cached_surface = cached
+        self._dirty_tiles.clear()
+    
+    def _redraw_dirty_tiles(self):
+        """Patch tiles changed since the last render into the cached map surface."""
+        tile_size = self.tile_size
+        cols, rows = np.array(list(self._dirty_tiles), dtype=np.int32).T
+        tile_ids = self._map_data[rows, cols].tolist()
+        
+        # Pixel offsets for every dirty cell in one vectorized step
+        xs, ys = (cols * tile_size).tolist(), (rows * tile_size).tolist()
+        
+        cached = self._cached_surface
+        get_tile = self.tileset.get_tile
+        for tile_id, x, y in zip(tile_ids, xs, ys):
+            dest = (x, y, tile_size, tile_size)
+            cached.fill((0, 0, 0), dest)
+            cached.blit(get_tile(tile_id), dest)
+        self._dirty_tiles.clear()
     
     def save(self, file_path: str):
         """Save the map to a file.
         
+        The map is written as an uncompressed NumPy .npz archive holding the
+        tile grid and its dimensions, written to file_path as given.
+        
         Args:
             file_path: Path to save the map to
         """
-        map_data = {
-            "width": self.width,
-            "height": self.height,
-            "tile_size": self.tile_size,
-            "tiles": self.map_data
-        }
-        
-        with open(file_path, "w") as f:
-            json.dump(map_data, f)
+        with open(file_path, "wb") as f:
+            np.savez(f,
+                     width=self.width,
+                     height=self.height,
+                     tile_size=self.tile_size,
+                     tiles=self._map_data)
     
     def load(self, file_path: str):
         """Load a map from a file.
         
+        Maps saved in the older JSON format are still accepted.
+        
         Args:
             file_path: Path to load the map from
         """
-        with open(file_path, "r") as f:
-            map_data = json.load(f)
+        with open(file_path, "rb") as f:
+            is_archive = f.read(len(_NPZ_MAGIC)) == _NPZ_MAGIC
+        
+        if not is_archive:
+            with open(file_path, "r") as f:
+                map_data = json.load(f)
+            self.width = map_data["width"]
+            self.height = map_data["height"]
+            self.tile_size = map_data["tile_size"]
+            self.map_data = np.array(map_data["tiles"], dtype=np.uint16)
+            return
         
-        self.width = map_data["width"]
-        self.height = map_data["height"]
-        self.tile_size = map_data["tile_size"]
-        self.map_data = map_data["tiles"]
+        with np.load(file_path) as map_data:
+            self.width = int(map_data["width"])
+            self.height = int(map_data["height"])
+            self.tile_size = int(map_data["tile_size"])
+            self.map_data = map_data["tiles"].astype(np.uint16, copy=False)
+
+# .npz archives are zip files
+_NPZ_MAGIC = b"PK\x03\x04"
+
+# Tile IDs used when a tileset has no grass tiles
+_DEFAULT_TILES = np.zeros(1, dtype=np.uint16)
+
+def _polyline_cells(points: List[Tuple[int, int]], width: int, height: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the tile cells covered by straight segments joining consecutive points.
+    
+    Args:
+        points: (x, y) points to join in order
+        width: Map width, used to clip cells
+        height: Map height, used to clip cells
+        
+    Returns:
+        Row and column index arrays of the covered cells
+    """
+    ys, xs = [], []
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        steps = max(abs(x2 - x1), abs(y2 - y1))
+        xs.append(np.linspace(x1, x2, steps + 1).astype(np.int32))
+        ys.append(np.linspace(y1, y2, steps + 1).astype(np.int32))
+    if not xs:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+    return (np.clip(np.concatenate(ys), 0, height - 1),
+            np.clip(np.concatenate(xs), 0, width - 1))
 
 class MapGenerator:
     """Generates game maps based on story elements."""
     
-    def __init__(self, tileset: Tileset):
+    def __init__(self, tileset: Tileset, seed: Optional[int] = None):
         """Initialize the map generator.
         
         Args:
             tileset: The tileset to use for generating maps
+            seed: Optional random seed for reproducible maps
         """
         self.tileset = tileset
+        
+        # Single generator so randomness is sampled in batches
+        self.rng = np.random.default_rng(seed)
+    
+    def _tile_array(self, tile_type: str, fallback: np.ndarray) -> np.ndarray:
+        """Get the tile IDs of a type as an array.
+        
+        Args:
+            tile_type: Type of tile to get
+            fallback: IDs to use if the type is missing or empty
+            
+        Returns:
+            Array of tile IDs
+        """
+        tile_ids = self.tileset.tile_type_arrays.get(tile_type)
+        return tile_ids if tile_ids is not None and tile_ids.size else fallback
     
     def generate_village(self, width: int = 30, height: int = 30) -> TileMap:
         """Generate a village map.
@@ -248,84 +393,69 @@ class MapGenerator:
         map = TileMap(width, height, self.tileset.tile_size)
         map.set_tileset(self.tileset)
         
-        # Get tile types
-        grass_tiles = self.tileset.tile_types.get("grass", [0])
-        path_tiles = self.tileset.tile_types.get("paths", [0])
-        house_tiles = self.tileset.tile_types.get("houses", [0])
-        tree_tiles = self.tileset.tile_types.get("trees", [0])
-        
-        # If any category is empty, use grass tiles as fallback
-        if not grass_tiles:
-            grass_tiles = [0]
-        if not path_tiles:
-            path_tiles = grass_tiles
-        if not house_tiles:
-            house_tiles = grass_tiles
-        if not tree_tiles:
-            tree_tiles = grass_tiles
+        # Get tile types, using grass tiles as fallback for any empty category
+        grass_tiles = self._tile_array("grass", _DEFAULT_TILES)
+        path_tiles = self._tile_array("paths", grass_tiles)
+        house_tiles = self._tile_array("houses", grass_tiles)
+        tree_tiles = self._tile_array("trees", grass_tiles)
+        
+        rng = self.rng
         
         # Fill the map with grass
-        for y in range(height):
-            for x in range(width):
-                map.set_tile(x, y, random.choice(grass_tiles))
+        map.map_data = rng.choice(grass_tiles, size=(height, width))
         
         # Generate a path through the village
-        path_start_x = random.randint(0, width // 4)
+        path_start_x = int(rng.integers(0, width // 4, endpoint=True))
         path_width = 2
         
+        tiles = map.map_data
+        
         # Horizontal main path
-        for x in range(path_start_x, width):
-            for pw in range(path_width):
-                y = height // 2 + pw
-                if 0 <= y < height:
-                    map.set_tile(x, y, random.choice(path_tiles))
+        strip = tiles[height // 2:height // 2 + path_width, path_start_x:]
+        strip[:] = rng.choice(path_tiles, size=strip.shape)
         
         # Add a vertical crossing path
         cross_x = width // 2
-        for y in range(height):
-            for pw in range(path_width):
-                x = cross_x + pw
-                if 0 <= x < width:
-                    map.set_tile(x, y, random.choice(path_tiles))
-        
-        # Add houses along the path (but not on the path)
-        for _ in range(8):
+        strip = tiles[:, cross_x:cross_x + path_width]
+        strip[:] = rng.choice(path_tiles, size=strip.shape)
+        map.invalidate()
+        
+        # Add houses along the path (but not on the path), tracking their
+        # footprints so spacing checks don't rescan the map
+        house_mask = np.zeros((height, width), dtype=bool)
+        
+        # Candidate spots for 8 houses with up to 10 attempts each, and the
+        # tile each house would use, sampled up front
+        house_spots = rng.integers((2, 2), (width - 4, height - 4), size=(8, 10, 2),
+                                   endpoint=True).tolist()
+        house_choices = rng.choice(house_tiles, size=8)
+        for spots, base_house_tile in zip(house_spots, house_choices):
             # Try to place houses in appropriate locations
-            for attempt in range(10):  # Try up to 10 times to find a good spot
-                # Choose random spot near path
-                house_x = random.randint(2, width - 4)
-                house_y = random.randint(2, height - 4)
+            for house_x, house_y in spots:
                 
                 # Check if we're not on a path
                 if (abs(house_y - height // 2) > 3 or abs(house_x - cross_x) > 3):
                     # Check if we're not too close to another house
-                    valid_spot = True
-                    for check_y in range(house_y - 2, house_y + 4):
-                        for check_x in range(house_x - 2, house_x + 4):
-                            if 0 <= check_x < width and 0 <= check_y < height:
-                                tile_id = map.get_tile_id(check_x, check_y)
-                                if tile_id in house_tiles:
-                                    valid_spot = False
-                                    break
-                    
-                    if valid_spot:
+                    nearby = house_mask[max(0, house_y - 2):house_y + 4, max(0, house_x - 2):house_x + 4]
+                    if not nearby.any():
                         # Place a 2x2 house
-                        base_house_tile = random.choice(house_tiles)
                         map.set_tile(house_x, house_y, base_house_tile)
                         map.set_tile(house_x + 1, house_y, base_house_tile)
                         map.set_tile(house_x, house_y + 1, base_house_tile)
                         map.set_tile(house_x + 1, house_y + 1, base_house_tile)
+                        house_mask[house_y:house_y + 2, house_x:house_x + 2] = True
                         break
         
-        # Add trees around the edges and in empty areas
-        for _ in range(width * 3):
-            tree_x = random.randint(0, width - 1)
-            tree_y = random.randint(0, height - 1)
-            
-            # Don't place trees on paths or houses
-            tile_id = map.get_tile_id(tree_x, tree_y)
-            if tile_id not in path_tiles and tile_id not in house_tiles:
-                map.set_tile(tree_x, tree_y, random.choice(tree_tiles))
+        # Add trees around the edges and in empty areas, sampling every
+        # position at once
+        num_trees = width * 3
+        tree_ys, tree_xs = rng.integers(0, (height, width), size=(num_trees, 2)).T
+        
+        # Don't place trees on paths or houses
+        tile_ids = tiles[tree_ys, tree_xs]
+        keep = ~(np.isin(tile_ids, path_tiles) | np.isin(tile_ids, house_tiles))
+        tiles[tree_ys[keep], tree_xs[keep]] = rng.choice(tree_tiles, size=int(keep.sum()))
+        map.invalidate()
         
         return map
     
@@ -343,94 +473,64 @@ class MapGenerator:
         map = TileMap(width, height, self.tileset.tile_size)
         map.set_tileset(self.tileset)
         
-        # Get tile types
-        grass_tiles = self.tileset.tile_types.get("grass", [0])
-        tree_tiles = self.tileset.tile_types.get("trees", [0])
-        path_tiles = self.tileset.tile_types.get("paths", [0])
+        # Get tile types, using grass tiles as fallback for any empty category
+        grass_tiles = self._tile_array("grass", _DEFAULT_TILES)
+        tree_tiles = self._tile_array("trees", grass_tiles)
+        path_tiles = self._tile_array("paths", grass_tiles)
         
-        # If any category is empty, use grass tiles as fallback
-        if not grass_tiles:
-            grass_tiles = [0]
-        if not tree_tiles:
-            tree_tiles = grass_tiles
-        if not path_tiles:
-            path_tiles = grass_tiles
+        rng = self.rng
         
         # Fill the map with grass
-        for y in range(height):
-            for x in range(width):
-                map.set_tile(x, y, random.choice(grass_tiles))
+        map.map_data = rng.choice(grass_tiles, size=(height, width))
         
         # Create a winding path through the forest
         path_points = []
         
         # Start at a random edge point
-        if random.choice([True, False]):
+        along_x, along_y, side = rng.integers(0, (width, height, 2)).tolist()
+        if rng.random() < 0.5:
             # Horizontal edge
-            start_x = random.randint(0, width - 1)
-            start_y = random.choice([0, height - 1])
+            start_x, start_y = along_x, (0, height - 1)[side]
         else:
             # Vertical edge
-            start_x = random.choice([0, width - 1])
-            start_y = random.randint(0, height - 1)
+            start_x, start_y = (0, width - 1)[side], along_y
         
         path_points.append((start_x, start_y))
         
         # Generate a few random points for the path to go through
-        num_points = random.randint(3, 5)
-        for _ in range(num_points):
-            point_x = random.randint(width // 4, width * 3 // 4)
-            point_y = random.randint(height // 4, height * 3 // 4)
-            path_points.append((point_x, point_y))
-        
-        # Connect the points with path tiles
-        for i in range(len(path_points) - 1):
-            x1, y1 = path_points[i]
-            x2, y2 = path_points[i + 1]
-            
-            # Draw a line between the points
-            if x1 == x2:  # Vertical line
-                for y in range(min(y1, y2), max(y1, y2) + 1):
-                    map.set_tile(x1, y, random.choice(path_tiles))
-            elif y1 == y2:  # Horizontal line
-                for x in range(min(x1, x2), max(x1, x2) + 1):
-                    map.set_tile(x, y1, random.choice(path_tiles))
-            else:  # Diagonal-ish line
-                dx = x2 - x1
-                dy = y2 - y1
-                steps = max(abs(dx), abs(dy))
-                x_inc = dx / steps
-                y_inc = dy / steps
-                
-                x, y = x1, y1
-                for _ in range(steps + 1):
-                    map.set_tile(int(x), int(y), random.choice(path_tiles))
-                    x += x_inc
-                    y += y_inc
+        num_points = int(rng.integers(3, 5, endpoint=True))
+        points = rng.integers((width // 4, height // 4), (width * 3 // 4, height * 3 // 4),
+                              size=(num_points, 2), endpoint=True)
+        path_points.extend((point_x, point_y) for point_x, point_y in points.tolist())
+        
+        # Connect the points with path tiles in a single assignment
+        tiles = map.map_data
+        ys, xs = _polyline_cells(path_points, width, height)
+        tiles[ys, xs] = rng.choice(path_tiles, size=len(xs))
         
         # Add trees (avoiding the path)
-        tree_density = random.uniform(0.3, 0.5)  # 30-50% tree coverage
-        for y in range(height):
-            for x in range(width):
-                # Don't place trees on the path
-                if map.get_tile_id(x, y) not in path_tiles and random.random() < tree_density:
-                    map.set_tile(x, y, random.choice(tree_tiles))
+        tree_density = rng.uniform(0.3, 0.5)  # 30-50% tree coverage
+        tree_mask = ~np.isin(tiles, path_tiles) & (rng.random((height, width)) < tree_density)
+        tiles[tree_mask] = rng.choice(tree_tiles, size=int(tree_mask.sum()))
+        map.invalidate()
         
         # Add a clearing in the center or at a random path point
-        clearing_center = random.choice(path_points[1:])  # Skip the edge start point
+        clearing_center = path_points[int(rng.integers(1, len(path_points)))]  # Skip the edge start point
         clearing_x, clearing_y = clearing_center
-        clearing_radius = random.randint(3, 6)
-        
-        for y in range(clearing_y - clearing_radius, clearing_y + clearing_radius + 1):
-            for x in range(clearing_x - clearing_radius, clearing_x + clearing_radius + 1):
-                if 0 <= x < width and 0 <= y < height:
-                    # Calculate distance from clearing center
-                    distance = ((x - clearing_x) ** 2 + (y - clearing_y) ** 2) ** 0.5
-                    
-                    # Clear trees in the clearing, but keep the path
-                    if distance < clearing_radius:
-                        if map.get_tile_id(x, y) not in path_tiles:
-                            map.set_tile(x, y, random.choice(grass_tiles))
+        clearing_radius = int(rng.integers(3, 6, endpoint=True))
+        
+        # Cells strictly inside the radius, compared as squared distances over
+        # the clearing's bounding box clipped to the map
+        top, bottom = max(0, clearing_y - clearing_radius), min(height, clearing_y + clearing_radius + 1)
+        left, right = max(0, clearing_x - clearing_radius), min(width, clearing_x + clearing_radius + 1)
+        ys, xs = np.ogrid[top:bottom, left:right]
+        in_clearing = (xs - clearing_x) ** 2 + (ys - clearing_y) ** 2 < clearing_radius * clearing_radius
+        
+        # Clear trees in the clearing, but keep the path
+        region = tiles[top:bottom, left:right]
+        clear_mask = in_clearing & ~np.isin(region, path_tiles)
+        region[clear_mask] = rng.choice(grass_tiles, size=int(clear_mask.sum()))
+        map.invalidate()
         
         return map
     
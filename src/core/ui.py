@@ -5,6 +5,55 @@ import pygame
 from typing import Tuple, Optional, List, Dict, Any
 from dataclasses import dataclass
 
+# UIElement fields that change where an element is and how big it is
+_GEOMETRY_FIELDS = frozenset(("x", "y", "width", "height"))
+
+# Bumped whenever any element moves or resizes or a panel gains a child, so
+# UIManager knows its pointer lookup is out of date
+_layout_version = 0
+
+def _layout_changed() -> None:
+    """Record that some element's bounds may have changed."""
+    global _layout_version
+    _layout_version += 1
+
+def _render_elements(surface: pygame.Surface, elements) -> None:
+    """Render elements in order, batching those that are a single blit.
+    
+    Consecutive elements that provide a blit entry are drawn with one
+    fblits/blits call; the batch is flushed before any element that renders
+    itself so that draw order is preserved.
+    
+    Args:
+        surface: Surface to render to
+        elements: UI elements to render
+    """
+    batch = []
+    for element in elements:
+        entry = element.get_fblit_entry()
+        if entry is not None:
+            batch.append(entry)
+            continue
+        if batch:
+            _blit_batch(surface, batch)
+            batch = []
+        element.render(surface)
+    if batch:
+        _blit_batch(surface, batch)
+
+def _blit_batch(surface: pygame.Surface, batch: list) -> None:
+    """Blit a sequence of (surface, position) pairs in one call.
+    
+    Args:
+        surface: Surface to blit onto
+        batch: Blit entries
+    """
+    # fblits is only available in pygame-ce
+    if hasattr(surface, "fblits"):
+        surface.fblits(batch)
+    else:
+        surface.blits(batch, doreturn=False)
+
 @dataclass
 class UIElement:
     """Base class for UI elements."""
@@ -15,10 +64,47 @@ class UIElement:
     visible: bool = True
     enabled: bool = True
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute, dropping the hit-test rect when the geometry changes."""
+        object.__setattr__(self, name, value)
+        if name in _GEOMETRY_FIELDS:
+            object.__setattr__(self, "_rect", None)
+            _layout_changed()
+    
+    def set_rect(self, x: int, y: int, width: int, height: int) -> None:
+        """Move or resize the element.
+        
+        Args:
+            x: X position
+            y: Y position
+            width: Element width
+            height: Element height
+        """
+        self.x, self.y, self.width, self.height = x, y, width, height
+    
     def contains_point(self, point: Tuple[int, int]) -> bool:
         """Check if point is within element bounds."""
-        return (self.x <= point[0] <= self.x + self.width and
-                self.y <= point[1] <= self.y + self.height)
+        rect = self._rect
+        if rect is None:
+            # Bounds are inclusive on every edge, Rect excludes right and bottom
+            rect = self._rect = pygame.Rect(self.x, self.y, self.width + 1, self.height + 1)
+        return rect.collidepoint(point)
+    
+    def get_bounds(self) -> Tuple[int, int, int, int]:
+        """Get the area in which the element reacts to pointer events.
+        
+        Returns:
+            (x, y, width, height) of the area
+        """
+        return self.x, self.y, self.width, self.height
+    
+    def get_fblit_entry(self) -> Optional[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """Get a (surface, position) pair if the element draws as a single blit.
+        
+        Returns:
+            Blit entry, or None if the element must render itself
+        """
+        return None
     
     def render(self, surface: pygame.Surface) -> None:
         """Render the element."""
@@ -53,6 +139,10 @@ class Button(UIElement):
         self.font = pygame.font.Font(None, font_size)
         self.hovered = False
         self.on_click = None
+        
+        # Pre-rendered button per hover state, for the look it was drawn with
+        self._cache: Dict[bool, pygame.Surface] = {}
+        self._cached_look: Optional[tuple] = None
     
     def handle_event(self, event: pygame.event.Event) -> bool:
         """Handle pygame events.
@@ -78,23 +168,45 @@ class Button(UIElement):
                 
         return False
     
+    def _get_surface(self) -> pygame.Surface:
+        """Get the pre-rendered button for the current look and hover state."""
+        # Everything but the position ends up in the pixels, so attributes
+        # assigned directly are picked up too
+        look = (self.text, self.width, self.height, self.color,
+                self.hover_color, self.text_color, self.font)
+        if self._cached_look != look:
+            self._cache.clear()
+            self._cached_look = look
+        
+        button = self._cache.get(self.hovered)
+        if button is None:
+            button = pygame.Surface((self.width, self.height))
+            
+            # Draw button background
+            button.fill(self.hover_color if self.hovered else self.color)
+            
+            # Draw button border
+            pygame.draw.rect(button, (0, 0, 0), (0, 0, self.width, self.height), 2)
+            
+            # Draw text
+            text_surface = self.font.render(self.text, True, self.text_color)
+            text_rect = text_surface.get_rect(center=(self.width/2, self.height/2))
+            button.blit(text_surface, text_rect)
+            
+            self._cache[self.hovered] = button
+        return button
+    
+    def get_fblit_entry(self) -> Optional[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """Get the pre-rendered button and its position."""
+        if not self.visible:
+            return None
+        return self._get_surface(), (self.x, self.y)
+    
     def render(self, surface: pygame.Surface) -> None:
         """Render the button."""
         if not self.visible:
             return
-            
-        # Draw button background
-        color = self.hover_color if self.hovered else self.color
-        pygame.draw.rect(surface, color, (self.x, self.y, self.width, self.height))
-        
-        # Draw button border
-        pygame.draw.rect(surface, (0, 0, 0), (self.x, self.y, self.width, self.height), 2)
-        
-        # Draw text
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=(self.x + self.width/2,
-                                                 self.y + self.height/2))
-        surface.blit(text_surface, text_rect)
+        surface.blit(self._get_surface(), (self.x, self.y))
 
 class TextBox(UIElement):
     """Text display element."""
@@ -120,10 +232,15 @@ class TextBox(UIElement):
         self.color = color
         self.background_color = background_color
         self.font = pygame.font.Font(None, font_size)
+        
+        # Pre-rendered box and its position, keyed by everything that affects either
+        self._cache_key: Optional[tuple] = None
+        self._cache_entry: Optional[Tuple[pygame.Surface, Tuple[int, int]]] = None
     
     def set_text(self, text: str) -> None:
         """Update text content."""
         self.text = text
+        self._cache_key = None
     
     def handle_event(self, event: pygame.event.Event) -> bool:
         """Handle pygame events.
@@ -137,21 +254,34 @@ class TextBox(UIElement):
         # TextBox doesn't handle any events by default
         return False
     
-    def render(self, surface: pygame.Surface) -> None:
-        """Render the text box."""
+    def get_fblit_entry(self) -> Optional[Tuple[pygame.Surface, Tuple[int, int]]]:
+        """Get the pre-rendered text box and its position."""
         if not self.visible:
-            return
+            return None
+        key = (self.text, self.x, self.y, self.width, self.height,
+               self.color, self.background_color, self.font)
+        if self._cache_key != key:
+            text_surface = self.font.render(self.text, True, self.color)
             
-        # Draw background if specified
-        if self.background_color:
-            pygame.draw.rect(surface, self.background_color,
-                           (self.x, self.y, self.width, self.height))
-        
-        # Draw text
-        text_surface = self.font.render(self.text, True, self.color)
-        text_rect = text_surface.get_rect(center=(self.x + self.width/2,
-                                                 self.y + self.height/2))
-        surface.blit(text_surface, text_rect)
+            if self.background_color:
+                # Compose the text onto its background once
+                box = pygame.Surface((self.width, self.height))
+                box.fill(self.background_color)
+                box.blit(text_surface, text_surface.get_rect(center=(self.width/2, self.height/2)))
+                self._cache_entry = (box, (self.x, self.y))
+            else:
+                # Without a background the text alone is the whole element
+                text_rect = text_surface.get_rect(center=(self.x + self.width/2,
+                                                          self.y + self.height/2))
+                self._cache_entry = (text_surface, text_rect.topleft)
+            self._cache_key = key
+        return self._cache_entry
+    
+    def render(self, surface: pygame.Surface) -> None:
+        """Render the text box."""
+        entry = self.get_fblit_entry()
+        if entry is not None:
+            surface.blit(*entry)
 
 class Panel(UIElement):
     """Container for other UI elements."""
@@ -177,6 +307,17 @@ class Panel(UIElement):
     def add_element(self, element: UIElement) -> None:
         """Add a UI element to the panel."""
         self.elements.append(element)
+        _layout_changed()
+    
+    def get_bounds(self) -> Tuple[int, int, int, int]:
+        """Get the area covered by the panel and all of its children."""
+        left, top = self.x, self.y
+        right, bottom = self.x + self.width, self.y + self.height
+        for element in self.elements:
+            x, y, width, height = element.get_bounds()
+            left, top = min(left, x), min(top, y)
+            right, bottom = max(right, x + width), max(bottom, y + height)
+        return left, top, right - left, bottom - top
     
     def handle_event(self, event: pygame.event.Event) -> bool:
         """Handle pygame events for all child elements."""
@@ -201,15 +342,26 @@ class Panel(UIElement):
                         (self.x, self.y, self.width, self.height), 2)
         
         # Render child elements
-        for element in self.elements:
-            element.render(surface)
+        _render_elements(surface, self.elements)
 
 class UIManager:
     """Manages all UI elements."""
     
+    # Size in pixels of the grid cells used to find elements under the pointer
+    BUCKET_SIZE = 128
+    
     def __init__(self):
         """Initialize UI manager."""
         self.elements: Dict[str, UIElement] = {}
+        
+        # Grid cell -> {insertion index: element} for elements whose bounds
+        # touch the cell; rebuilt lazily after the layout changes
+        self._buckets: Optional[Dict[Tuple[int, int], Dict[int, UIElement]]] = None
+        self._buckets_version = -1
+        
+        # Elements that received the previous pointer event, so they also see
+        # the next one (e.g. to clear their hover state when the pointer leaves)
+        self._last_targets: Dict[int, UIElement] = {}
     
     def add_element(self, name: str, element: UIElement) -> None:
         """Add a UI element.
@@ -219,19 +371,57 @@ class UIManager:
             element: UI element
         """
         self.elements[name] = element
+        self.invalidate_layout()
     
     def get_element(self, name: str) -> Optional[UIElement]:
         """Get a UI element by name."""
         return self.elements.get(name)
     
+    def invalidate_layout(self) -> None:
+        """Rebuild pointer lookup after elements were moved, resized or added.
+        
+        Element and panel changes are detected automatically; this is only
+        needed after replacing elements some other way.
+        """
+        self._buckets = None
+        self._last_targets = {}
+    
+    def _build_buckets(self) -> Dict[Tuple[int, int], Dict[int, UIElement]]:
+        """Index every element by the grid cells its bounds overlap."""
+        size = self.BUCKET_SIZE
+        buckets: Dict[Tuple[int, int], Dict[int, UIElement]] = {}
+        for order, element in enumerate(self.elements.values()):
+            x, y, width, height = element.get_bounds()
+            for cell_x in range(x // size, (x + width) // size + 1):
+                for cell_y in range(y // size, (y + height) // size + 1):
+                    buckets.setdefault((cell_x, cell_y), {})[order] = element
+        self._buckets = buckets
+        self._buckets_version = _layout_version
+        return buckets
+    
     def handle_event(self, event: pygame.event.Event) -> bool:
         """Handle pygame events for all elements."""
-        for element in self.elements.values():
-            if element.handle_event(event):
+        pos = getattr(event, "pos", None)
+        if pos is None:
+            for element in self.elements.values():
+                if element.handle_event(event):
+                    return True
+            return False
+        
+        # Pointer events only go to elements near the pointer, plus those
+        # that saw the previous pointer event, in insertion order
+        buckets = self._buckets
+        if buckets is None or self._buckets_version != _layout_version:
+            buckets = self._build_buckets()
+        size = self.BUCKET_SIZE
+        candidates = buckets.get((pos[0] // size, pos[1] // size), {})
+        targets = {**self._last_targets, **candidates}
+        self._last_targets = candidates
+        for order in sorted(targets):
+            if targets[order].handle_event(event):
                 return True
         return False
     
     def render(self, surface: pygame.Surface) -> None:
         """Render all UI elements."""
-        for element in self.elements.values():
-            element.render(surface) 
\ No newline at end of file
+        _render_elements(surface, self.elements.values())
\ No newline at end of file
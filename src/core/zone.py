@@ -2,14 +2,57 @@
 Zone management system for creating structured game areas.
 """
 import random
-from typing import Dict, List, Any, Tuple, Optional
+from types import MappingProxyType
+from typing import Dict, List, Any, Callable, Mapping, Tuple, Optional
 import pygame
+import numpy as np
 
 from .tilemap import TileMap, Tileset, MapGenerator
 
+# Entities are drawn as 32px sprites at tile positions
+ENTITY_SIZE = 32
+
+# Zone spatial hash cells are 2**GRID_CELL_SHIFT (8) tiles wide
+GRID_CELL_SHIFT = 3
+
+# Values of Zone.entity_kind
+ENTITY_NPC = 0
+ENTITY_ENEMY = 1
+
+# Initial capacity of the Zone entity arrays, doubled as they fill
+_ENTITY_CAPACITY = 16
+
+# Read-only dialogue shared by every NPC of the same kind
+MERCHANT_DIALOGUE = MappingProxyType({
+    "greeting": "Welcome to my shop, traveler! I have the finest goods in all of Eldergrove.",
+    "farewell": "Come back soon!",
+    "quest": "I need help restocking my supplies. The forest has grown dangerous lately..."
+})
+
+INNKEEPER_DIALOGUE = MappingProxyType({
+    "greeting": "Welcome to the Sleeping Dragon Inn! Can I get you a room or a drink?",
+    "farewell": "Rest well, adventurer!",
+    "quest": "We've been having trouble with rats in the cellar. Could you help clear them out?"
+})
+
+_VILLAGER_ROLES = ("Farmer", "Blacksmith", "Guard", "Child", "Elder")
+
+_VILLAGER_DIALOGUES = {
+    role: MappingProxyType({
+        "greeting": f"Hello there! I'm a {role.lower()} in this village.",
+        "farewell": "Goodbye!",
+        "gossip": "I hear there are strange things happening in the forest lately..."
+    })
+    for role in _VILLAGER_ROLES
+}
+
 class NPC:
     """Represents a non-player character in the game world."""
     
+    # Placeholder sprite shared by all NPCs, created on first use; copy it
+    # before drawing on an individual NPC's sprite
+    _DEFAULT_SPRITE: Optional[pygame.Surface] = None
+    
     def __init__(self, npc_id: str, name: str, role: str, x: int, y: int, sprite_id: int):
         """Initialize an NPC.
         
@@ -30,11 +73,13 @@ class NPC:
         self.dialogue = {}
         self.quests = []
         
-        # Create sprite
-        self.sprite = pygame.Surface((32, 32))
-        self.sprite.fill((255, 255, 0))  # Yellow default
+        # Use the shared sprite
+        if NPC._DEFAULT_SPRITE is None:
+            NPC._DEFAULT_SPRITE = pygame.Surface((32, 32))
+            NPC._DEFAULT_SPRITE.fill((255, 255, 0))  # Yellow default
+        self.sprite = NPC._DEFAULT_SPRITE
     
-    def set_dialogue(self, dialogue: Dict[str, str]):
+    def set_dialogue(self, dialogue: Mapping[str, str]):
         """Set dialogue options for the NPC.
         
         Args:
@@ -58,13 +103,17 @@ class NPC:
             camera_x: Camera X offset
             camera_y: Camera Y offset
         """
-        screen_x = self.x * 32 - camera_x
-        screen_y = self.y * 32 - camera_y
+        screen_x = self.x * ENTITY_SIZE - camera_x
+        screen_y = self.y * ENTITY_SIZE - camera_y
         surface.blit(self.sprite, (screen_x, screen_y))
 
 class Enemy:
     """Represents an enemy in the game world."""
     
+    # Placeholder sprite shared by all enemies, created on first use; copy it
+    # before drawing on an individual enemy's sprite
+    _DEFAULT_SPRITE: Optional[pygame.Surface] = None
+    
     def __init__(self, enemy_id: str, name: str, x: int, y: int, sprite_id: int, health: int = 10):
         """Initialize an enemy.
         
@@ -87,13 +136,17 @@ class Enemy:
         self.is_aggressive = True
         self.patrol_area = [(x, y)]
         
-        # Create sprite
-        self.sprite = pygame.Surface((32, 32))
-        self.sprite.fill((255, 0, 0))  # Red default
+        # Use the shared sprite
+        if Enemy._DEFAULT_SPRITE is None:
+            Enemy._DEFAULT_SPRITE = pygame.Surface((32, 32))
+            Enemy._DEFAULT_SPRITE.fill((255, 0, 0))  # Red default
+        self.sprite = Enemy._DEFAULT_SPRITE
     
     def set_patrol_area(self, points: List[Tuple[int, int]]):
         """Set the patrol area for the enemy.
         
+        An enemy in a zone walks between these points with Zone.move_entity.
+        
         Args:
             points: List of (x, y) points to patrol
         """
@@ -107,8 +160,8 @@ class Enemy:
             camera_x: Camera X offset
             camera_y: Camera Y offset
         """
-        screen_x = self.x * 32 - camera_x
-        screen_y = self.y * 32 - camera_y
+        screen_x = self.x * ENTITY_SIZE - camera_x
+        screen_y = self.y * ENTITY_SIZE - camera_y
         surface.blit(self.sprite, (screen_x, screen_y))
 
 class Quest:
@@ -130,6 +183,10 @@ class Quest:
         self.objectives = []
         self.rewards = {}
         self.completed = False
+        
+        # Objectives by target, and how many are still short of their amount
+        self._target_to_objectives: Dict[str, List[Dict[str, Any]]] = {}
+        self._remaining = 0
     
     def add_objective(self, description: str, target: str, amount: int):
         """Add an objective to the quest.
@@ -139,12 +196,16 @@ class Quest:
             target: Target object or enemy
             amount: Amount needed
         """
-        self.objectives.append({
+        objective = {
             "description": description,
             "target": target,
             "amount": amount,
             "current": 0
-        })
+        }
+        self.objectives.append(objective)
+        self._target_to_objectives.setdefault(target, []).append(objective)
+        if objective["current"] < amount:
+            self._remaining += 1
     
     def set_rewards(self, rewards: Dict[str, Any]):
         """Set the rewards for completing the quest.
@@ -161,12 +222,20 @@ class Quest:
             target: Target object or enemy
             amount: Amount to add
         """
-        for objective in self.objectives:
-            if objective["target"] == target:
-                objective["current"] += amount
-                # Check if completed
-                if all(obj["current"] >= obj["amount"] for obj in self.objectives):
-                    self.completed = True
+        objectives = self._target_to_objectives.get(target)
+        if not objectives:
+            return
+        
+        for objective in objectives:
+            was_met = objective["current"] >= objective["amount"]
+            objective["current"] += amount
+            is_met = objective["current"] >= objective["amount"]
+            if is_met != was_met:
+                self._remaining += -1 if is_met else 1
+        
+        # Check if completed
+        if self._remaining == 0:
+            self.completed = True
 
 class Zone:
     """Represents a game zone with a map, NPCs, enemies, and quests."""
@@ -187,11 +256,55 @@ class Zone:
         self.zone_type = zone_type
         self.level_range = level_range
         self.map = None
-        self.npcs = {}
-        self.enemies = {}
-        self.quests = {}
-        self.landmarks = []
+        self._npcs = {}
+        self._enemies = {}
+        self._quests = {}
+        self._landmarks = []
         self.connections = {}  # Connections to other zones
+        self.connection_points = {}  # (x, y) -> direction of the connection there
+        
+        # Spatial hash of NPCs and enemies: (cell_x, cell_y) -> entities;
+        # entities must be moved with move_entity to keep it current
+        self.grid: Dict[Tuple[int, int], List[Any]] = {}
+        
+        # NPCs and enemies as parallel arrays for bulk culling and drawing;
+        # only the first _entity_count slots are in use
+        self.entity_x = np.zeros(_ENTITY_CAPACITY, dtype=np.int32)
+        self.entity_y = np.zeros(_ENTITY_CAPACITY, dtype=np.int32)
+        self.entity_kind = np.zeros(_ENTITY_CAPACITY, dtype=np.int32)
+        self.entity_sprite_id = np.zeros(_ENTITY_CAPACITY, dtype=np.int32)
+        self._entity_count = 0
+        self._entities: List[Any] = []  # Slot -> NPC or Enemy object
+        self._entity_slots: Dict[Tuple[int, str], int] = {}  # (kind, id) -> slot
+        
+        # Population (NPCs, enemies, quests, landmarks) can be deferred until
+        # the zone is first visited; see set_populator and realize
+        self.realized = False
+        self._populator: Optional[Callable[["Zone"], None]] = None
+    
+    @property
+    def npcs(self) -> Dict[str, NPC]:
+        """NPCs in the zone by ID, populating the zone first if needed."""
+        self.realize()
+        return self._npcs
+    
+    @property
+    def enemies(self) -> Dict[str, Enemy]:
+        """Enemies in the zone by ID, populating the zone first if needed."""
+        self.realize()
+        return self._enemies
+    
+    @property
+    def quests(self) -> Dict[str, Quest]:
+        """Quests in the zone by ID, populating the zone first if needed."""
+        self.realize()
+        return self._quests
+    
+    @property
+    def landmarks(self) -> List[Dict[str, Any]]:
+        """Landmarks in the zone, populating the zone first if needed."""
+        self.realize()
+        return self._landmarks
         
     def set_map(self, tile_map: TileMap):
         """Set the map for the zone.
@@ -201,13 +314,37 @@ class Zone:
         """
         self.map = tile_map
     
+    def set_populator(self, populator: Callable[["Zone"], None]):
+        """Defer populating the zone until realize() is called.
+        
+        Args:
+            populator: Function that adds the zone's NPCs, enemies, quests and
+                landmarks
+        """
+        self._populator = populator
+        self.realized = False
+    
+    def realize(self):
+        """Run the deferred populator, if any, the first time this is called."""
+        if self.realized:
+            return
+        self.realized = True
+        populator, self._populator = self._populator, None
+        if populator is not None:
+            populator(self)
+    
     def add_npc(self, npc: NPC):
         """Add an NPC to the zone.
         
         Args:
             npc: The NPC to add
         """
-        self.npcs[npc.npc_id] = npc
+        old_npc = self._npcs.get(npc.npc_id)
+        if old_npc is not None:
+            self._grid_remove(old_npc)
+        self._npcs[npc.npc_id] = npc
+        self._grid_insert(npc)
+        self._store_entity(npc, ENTITY_NPC, npc.npc_id)
     
     def add_enemy(self, enemy: Enemy):
         """Add an enemy to the zone.
@@ -215,7 +352,113 @@ class Zone:
         Args:
             enemy: The enemy to add
         """
-        self.enemies[enemy.enemy_id] = enemy
+        old_enemy = self._enemies.get(enemy.enemy_id)
+        if old_enemy is not None:
+            self._grid_remove(old_enemy)
+        self._enemies[enemy.enemy_id] = enemy
+        self._grid_insert(enemy)
+        self._store_entity(enemy, ENTITY_ENEMY, enemy.enemy_id)
+    
+    def move_entity(self, entity, x: int, y: int):
+        """Move an NPC or enemy of this zone to a new tile.
+        
+        The spatial hash and entity arrays mirror entity positions, so
+        entities in a zone must be moved through here rather than by
+        assigning x and y directly.
+        
+        Args:
+            entity: The NPC or enemy to move
+            x: New X position in tiles
+            y: New Y position in tiles
+        """
+        if isinstance(entity, Enemy):
+            slot = self._entity_slots[(ENTITY_ENEMY, entity.enemy_id)]
+        else:
+            slot = self._entity_slots[(ENTITY_NPC, entity.npc_id)]
+        
+        self._grid_remove(entity)
+        entity.x = x
+        entity.y = y
+        self._grid_insert(entity)
+        self.entity_x[slot] = x
+        self.entity_y[slot] = y
+    
+    def _store_entity(self, entity, kind: int, entity_id: str):
+        """Write an NPC or enemy into the entity arrays.
+        
+        An entity replacing one with the same kind and ID reuses its slot.
+        
+        Args:
+            entity: The NPC or enemy
+            kind: ENTITY_NPC or ENTITY_ENEMY
+            entity_id: ID of the entity
+        """
+        slot = self._entity_slots.get((kind, entity_id))
+        if slot is None:
+            slot = self._entity_count
+            if slot == len(self.entity_x):
+                capacity = 2 * slot
+                for name in ("entity_x", "entity_y", "entity_kind", "entity_sprite_id"):
+                    grown = np.zeros(capacity, dtype=np.int32)
+                    grown[:slot] = getattr(self, name)
+                    setattr(self, name, grown)
+            self._entity_count += 1
+            self._entity_slots[(kind, entity_id)] = slot
+            self._entities.append(entity)
+        else:
+            self._entities[slot] = entity
+        
+        self.entity_x[slot] = entity.x
+        self.entity_y[slot] = entity.y
+        self.entity_kind[slot] = kind
+        self.entity_sprite_id[slot] = entity.sprite_id
+    
+    def _grid_insert(self, entity):
+        """Add an NPC or enemy to the spatial hash."""
+        key = (entity.x >> GRID_CELL_SHIFT, entity.y >> GRID_CELL_SHIFT)
+        self.grid.setdefault(key, []).append(entity)
+    
+    def _grid_remove(self, entity):
+        """Remove an NPC or enemy from the spatial hash."""
+        key = (entity.x >> GRID_CELL_SHIFT, entity.y >> GRID_CELL_SHIFT)
+        cell = self.grid.get(key)
+        if cell and entity in cell:
+            cell.remove(entity)
+            if not cell:
+                del self.grid[key]
+    
+    def _cells_in_range(self, x0: int, y0: int, x1: int, y1: int):
+        """Yield the entity lists of grid cells covering a tile rectangle.
+        
+        Args:
+            x0: Left tile (inclusive)
+            y0: Top tile (inclusive)
+            x1: Right tile (inclusive)
+            y1: Bottom tile (inclusive)
+        """
+        grid = self.grid
+        for cell_y in range(y0 >> GRID_CELL_SHIFT, (y1 >> GRID_CELL_SHIFT) + 1):
+            for cell_x in range(x0 >> GRID_CELL_SHIFT, (x1 >> GRID_CELL_SHIFT) + 1):
+                entities = grid.get((cell_x, cell_y))
+                if entities:
+                    yield entities
+    
+    def query_radius(self, x: int, y: int, radius: int) -> List[Any]:
+        """Find the NPCs and enemies within a distance of a tile.
+        
+        Args:
+            x: X position in tiles
+            y: Y position in tiles
+            radius: Maximum distance in tiles
+            
+        Returns:
+            Entities whose tile lies within the radius
+        """
+        radius_sq = radius * radius
+        return [entity
+                for entities in self._cells_in_range(x - radius, y - radius, x + radius, y + radius)
+                for entity in entities
+                if (entity.x - x) ** 2 + (entity.y - y) ** 2 <= radius_sq]
     
     def add_quest(self, quest: Quest):
         """Add a quest to the zone.
@@ -223,7 +466,7 @@ class Zone:
         Args:
             quest: The quest to add
         """
-        self.quests[quest.quest_id] = quest
+        self._quests[quest.quest_id] = quest
     
     def add_landmark(self, name: str, x: int, y: int, description: str):
         """Add a landmark to the zone.
@@ -234,7 +477,7 @@ class Zone:
             y: Y position in tiles
             description: Description of the landmark
         """
-        self.landmarks.append({
+        self._landmarks.append({
             "name": name,
             "x": x,
             "y": y,
@@ -250,11 +493,16 @@ class Zone:
             x: X position of the connection point
             y: Y position of the connection point
         """
+        old_connection = self.connections.get(direction)
+        if old_connection is not None:
+            self.connection_points.pop((old_connection["x"], old_connection["y"]), None)
+        
         self.connections[direction] = {
             "target_zone_id": target_zone_id,
             "x": x,
             "y": y
         }
+        self.connection_points[(x, y)] = direction
     
     def render(self, surface: pygame.Surface, camera_x: int, camera_y: int):
         """Render the zone.
@@ -264,29 +512,55 @@ class Zone:
             camera_x: Camera X offset
             camera_y: Camera Y offset
         """
+        # A zone being drawn is being visited
+        if not self.realized:
+            self.realize()
+        
         # Render map
         if self.map:
             self.map.render(surface, camera_x, camera_y)
         
-        # Render NPCs
-        for npc in self.npcs.values():
-            npc.render(surface, camera_x, camera_y)
-        
-        # Render enemies
-        for enemy in self.enemies.values():
-            enemy.render(surface, camera_x, camera_y)
+        count = self._entity_count
+        if not count:
+            return
+        
+        # Find sprites overlapping the camera rect in one pass over the arrays
+        width, height = surface.get_size()
+        screen_x = self.entity_x[:count] * ENTITY_SIZE - camera_x
+        screen_y = self.entity_y[:count] * ENTITY_SIZE - camera_y
+        visible = ((screen_x > -ENTITY_SIZE) & (screen_x < width) &
+                   (screen_y > -ENTITY_SIZE) & (screen_y < height))
+        
+        # NPCs first so enemies draw on top, all blitted in one call
+        kinds = self.entity_kind[:count]
+        slots = np.concatenate((np.flatnonzero(visible & (kinds == ENTITY_NPC)),
+                                np.flatnonzero(visible & (kinds == ENTITY_ENEMY))))
+        if not len(slots):
+            return
+        
+        entities = self._entities
+        surface.blits([(entities[slot].sprite, (x, y))
+                       for slot, x, y in zip(slots.tolist(),
+                                             screen_x[slots].tolist(),
+                                             screen_y[slots].tolist())],
+                      doreturn=False)
 
 class ZoneManager:
     """Manages zones and zone generation."""
     
-    def __init__(self, tileset: Tileset):
+    def __init__(self, tileset: Tileset, seed: Optional[int] = None):
         """Initialize the zone manager.
         
         Args:
             tileset: Tileset to use for map generation
+            seed: Optional random seed for reproducible zones
         """
         self.tileset = tileset
-        self.map_generator = MapGenerator(tileset)
+        self.map_generator = MapGenerator(tileset, seed)
+        
+        # Private generator so zone generation doesn't share global state
+        self.seed = seed
+        self.rng = random.Random(seed)
         self.zones = {}
         self.current_zone_id = None
     
@@ -302,14 +576,14 @@ class ZoneManager:
             The generated zone
         """
         # Generate zone ID and name if not provided
-        zone_id = f"{zone_type}_{level_range[0]}_{level_range[1]}_{random.randint(1000, 9999)}"
+        zone_id = f"{zone_type}_{level_range[0]}_{level_range[1]}_{self.rng.getrandbits(32):08x}"
         if not name:
             if zone_type == "village":
-                name = random.choice(["Eldergrove", "Riversend", "Oakvale", "Willowhaven"])
+                name = self.rng.choice(["Eldergrove", "Riversend", "Oakvale", "Willowhaven"])
             elif zone_type == "forest":
-                name = random.choice(["Darkwood", "Whispering Forest", "Ancient Grove", "Misty Woods"])
+                name = self.rng.choice(["Darkwood", "Whispering Forest", "Ancient Grove", "Misty Woods"])
             else:
-                name = f"{zone_type.capitalize()} {random.randint(1, 10)}"
+                name = f"{zone_type.capitalize()} {self.rng.randint(1, 10)}"
         
         # Create zone
         zone = Zone(zone_id, name, f"A {zone_type} area for levels {level_range[0]}-{level_range[1]}", zone_type, level_range)
@@ -324,26 +598,44 @@ class ZoneManager:
         
         zone.set_map(tile_map)
         
-        # Generate NPCs
+        # Generate NPCs when the zone is first visited
         if zone_type == "village":
-            self._populate_village(zone)
+            zone.set_populator(self._populate_village)
         elif zone_type == "forest":
-            self._populate_forest(zone)
+            zone.set_populator(self._populate_forest)
         
         # Store and return the zone
         self.zones[zone_id] = zone
         return zone
     
+    def _zone_rng(self, zone: Zone) -> random.Random:
+        """Create the generator used to populate one zone.
+        
+        It is derived from the manager's seed and the zone's ID, so a zone's
+        population doesn't depend on the order zones are first visited in.
+        
+        Args:
+            zone: The zone being populated
+            
+        Returns:
+            A generator private to this population pass
+        """
+        if self.seed is None:
+            return random.Random()
+        return random.Random(f"{self.seed}:{zone.zone_id}")
+    
     def _populate_village(self, zone: Zone):
         """Populate a village zone with NPCs and quests.
         
         Args:
             zone: The zone to populate
         """
+        rng = self._zone_rng(zone)
+        
         # Add NPCs
         self._add_merchant(zone)
         self._add_innkeeper(zone)
-        self._add_villagers(zone, random.randint(3, 6))
+        self._add_villagers(zone, rng.randint(3, 6), rng)
         
         # Add quests
         self._add_starter_quests(zone)
@@ -356,15 +648,16 @@ class ZoneManager:
         """
         # Add enemies
         min_level, max_level = zone.level_range
-        num_enemies = random.randint(5, 10)
+        randint = self._zone_rng(zone).randint
+        num_enemies = randint(5, 10)
         
         for i in range(num_enemies):
-            enemy_level = random.randint(min_level, max_level)
+            enemy_level = randint(min_level, max_level)
             enemy = Enemy(
                 f"wolf_{i}",
                 "Wolf",
-                random.randint(5, zone.map.width - 5),
-                random.randint(5, zone.map.height - 5),
+                randint(5, zone.map.width - 5),
+                randint(5, zone.map.height - 5),
                 300,  # Placeholder sprite ID
                 health=enemy_level * 10
             )
@@ -396,11 +689,7 @@ class ZoneManager:
         )
         
         # Add dialogue
-        merchant.set_dialogue({
-            "greeting": "Welcome to my shop, traveler! I have the finest goods in all of Eldergrove.",
-            "farewell": "Come back soon!",
-            "quest": "I need help restocking my supplies. The forest has grown dangerous lately..."
-        })
+        merchant.set_dialogue(MERCHANT_DIALOGUE)
         
         # Add a quest
         quest = Quest(
@@ -431,39 +720,32 @@ class ZoneManager:
             101  # Placeholder sprite ID
         )
         
-        innkeeper.set_dialogue({
-            "greeting": "Welcome to the Sleeping Dragon Inn! Can I get you a room or a drink?",
-            "farewell": "Rest well, adventurer!",
-            "quest": "We've been having trouble with rats in the cellar. Could you help clear them out?"
-        })
+        innkeeper.set_dialogue(INNKEEPER_DIALOGUE)
         
         zone.add_npc(innkeeper)
     
-    def _add_villagers(self, zone: Zone, count: int):
+    def _add_villagers(self, zone: Zone, count: int, rng: random.Random):
         """Add random villagers to a zone.
         
         Args:
             zone: The zone to add villagers to
             count: Number of villagers to add
+            rng: Generator for the villagers' roles and positions
         """
-        roles = ["Farmer", "Blacksmith", "Guard", "Child", "Elder"]
+        picked_roles = rng.choices(_VILLAGER_ROLES, k=count)
+        randint = rng.randint
         
-        for i in range(count):
-            role = random.choice(roles)
+        for i, role in enumerate(picked_roles):
             villager = NPC(
                 f"villager_{i}",
                 f"Villager {i+1}",
                 role,
-                random.randint(5, zone.map.width - 5),
-                random.randint(5, zone.map.height - 5),
+                randint(5, zone.map.width - 5),
+                randint(5, zone.map.height - 5),
                 102 + i  # Placeholder sprite ID
             )
             
-            villager.set_dialogue({
-                "greeting": f"Hello there! I'm a {role.lower()} in this village.",
-                "farewell": "Goodbye!",
-                "gossip": "I hear there are strange things happening in the forest lately..."
-            })
+            villager.set_dialogue(_VILLAGER_DIALOGUES[role])
             
             zone.add_npc(villager)
     
@@ -488,13 +770,14 @@ class ZoneManager:
         return self.zones.get(zone_id)
     
     def set_current_zone(self, zone_id: str):
-        """Set the current active zone.
+        """Set the current active zone, populating it on its first visit.
         
         Args:
             zone_id: ID of the zone to set as current
         """
         if zone_id in self.zones:
             self.current_zone_id = zone_id
+            self.zones[zone_id].realize()
     
     def get_current_zone(self) -> Optional[Zone]:
         """Get the current active zone.
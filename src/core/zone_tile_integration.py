@@ -4,29 +4,67 @@ Integration between the zone system and enhanced tile system.
 import random
 import os
 import json
-import uuid
+import functools
+import itertools
 import logging
+import threading
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
+import numpy as np
 
-from .zone import Zone, ZoneManager
-from .tilemap import TileMap
-from .enhanced_tilemap import EnhancedTileset, EnhancedMapGenerator, EnhancedTileMap
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .zone import Zone, ZoneManager, NPC, Enemy, Quest, MERCHANT_DIALOGUE
+from .tilemap import Tileset, TileMap
+from .enhanced_tilemap import (EnhancedTileset, EnhancedMapGenerator, EnhancedTileMap,
+                               CATEGORY_GRASS, CATEGORY_TREES, CATEGORY_HOUSES, CATEGORY_DOORS)
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=1)
+def _load_zone_config() -> Dict:
+    """Load the zone configuration once per process.
+    
+    Uses orjson when it is installed, falling back to the json module.
+    
+    Returns:
+        The parsed configuration (shared, treat as read-only), or an empty
+        dict if there is none
+    """
+    config_path = Path("game", "config", "zones.json")
+    if config_path.exists():
+        try:
+            data = config_path.read_bytes()
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except Exception as e:
+            logger.error(f"Error loading zone config: {e}")
+    return {}
+
 class EnhancedZoneGenerator:
     """Enhanced zone generator that uses the structured tile folders."""
     
-    def __init__(self, base_path: str = "game/assets/images"):
+    def __init__(self, base_path: str = "game/assets/images", seed: Optional[int] = None):
         """Initialize the enhanced zone generator.
         
         Args:
             base_path: Path to the image assets directory
+            seed: Optional random seed for reproducible zone population
         """
         self.base_path = base_path
+        
+        # Private generator so zone generation doesn't share global state
+        self.rng = random.Random(seed)
         self.tileset = EnhancedTileset(base_path)
         self.map_generator = EnhancedMapGenerator(self.tileset)
+        
+        # Standard tileset shared by every converted map, loaded on first use;
+        # the lock keeps zones generated on several threads from loading it twice
+        self._standard_tileset: Optional[Tileset] = None
+        self._tileset_lock = threading.Lock()
     
     def generate_zone(self, zone_type: str, level_range: Tuple[int, int], 
                       name: Optional[str] = None, width: int = 40, height: int = 40) -> Zone:
@@ -43,14 +81,14 @@ class EnhancedZoneGenerator:
             The generated zone
         """
         # Generate zone ID and name if not provided
-        zone_id = f"{zone_type}_{level_range[0]}_{level_range[1]}_{random.randint(1000, 9999)}"
+        zone_id = f"{zone_type}_{level_range[0]}_{level_range[1]}_{self.rng.getrandbits(32):08x}"
         if not name:
             if zone_type == "village":
-                name = random.choice(["Eldergrove", "Riversend", "Oakvale", "Willowhaven"])
+                name = self.rng.choice(["Eldergrove", "Riversend", "Oakvale", "Willowhaven"])
             elif zone_type == "forest":
-                name = random.choice(["Darkwood", "Whispering Forest", "Ancient Grove", "Misty Woods"])
+                name = self.rng.choice(["Darkwood", "Whispering Forest", "Ancient Grove", "Misty Woods"])
             else:
-                name = f"{zone_type.capitalize()} {random.randint(1, 10)}"
+                name = f"{zone_type.capitalize()} {self.rng.randint(1, 10)}"
         
         # Create zone
         zone = Zone(zone_id, name, f"A {zone_type} area for levels {level_range[0]}-{level_range[1]}", 
@@ -81,20 +119,21 @@ class EnhancedZoneGenerator:
         Returns:
             A standard TileMap
         """
-        from .tilemap import Tileset, TileMap
-        
         # Create a standard map with the same dimensions
         standard_map = TileMap(enhanced_map.width, enhanced_map.height, enhanced_map.tile_size)
         
         # We need to assign a proper tileset to the standard map
         # First, check if we already have a standard tileset
-        tileset_path = os.path.join("game", "assets", "images", "tileset.png")
-        if os.path.exists(tileset_path):
-            standard_tileset = Tileset(tileset_path)
-            standard_map.set_tileset(standard_tileset)
+        if self._standard_tileset is None:
+            with self._tileset_lock:
+                tileset_path = os.path.join("game", "assets", "images", "tileset.png")
+                if self._standard_tileset is None and os.path.exists(tileset_path):
+                    self._standard_tileset = Tileset(tileset_path)
+        if self._standard_tileset is not None:
+            standard_map.set_tileset(self._standard_tileset)
         
         # Copy the map data
-        standard_map.map_data = enhanced_map.map_data
+        standard_map.map_data = enhanced_map.get_tile_id_array().astype(np.uint16)
         
         return standard_map
     
@@ -110,18 +149,13 @@ class EnhancedZoneGenerator:
         # Add some NPCs based on the map locations
         if zone.map:
             # Find suitable house tiles for NPCs
-            house_locations = []
-            for y in range(zone.map.height):
-                for x in range(zone.map.width):
-                    tile_id = zone.map.get_tile_id(x, y)
-                    tile_type = self.tileset.id_to_type.get(tile_id)
-                    if tile_type in ["houses", "doors"]:
-                        house_locations.append((x, y))
+            cats = self.tileset.get_category_codes(zone.map.get_tile_id_array())
+            house_ys, house_xs = np.nonzero((cats == CATEGORY_HOUSES) | (cats == CATEGORY_DOORS))
+            house_locations = list(zip(house_xs.tolist(), house_ys.tolist()))
             
             # Add a merchant near one of the houses
             if house_locations:
-                merchant_pos = random.choice(house_locations)
-                from .zone import NPC
+                merchant_pos = self.rng.choice(house_locations)
                 merchant = NPC(
                     "merchant_01",
                     "Marcus",
@@ -129,15 +163,10 @@ class EnhancedZoneGenerator:
                     merchant_pos[0], merchant_pos[1],
                     100  # Placeholder sprite ID
                 )
-                merchant.set_dialogue({
-                    "greeting": "Welcome to my shop, traveler! I have the finest goods in all of Eldergrove.",
-                    "farewell": "Come back soon!",
-                    "quest": "I need help restocking my supplies. The forest has grown dangerous lately..."
-                })
+                merchant.set_dialogue(MERCHANT_DIALOGUE)
                 zone.add_npc(merchant)
                 
                 # Add a quest
-                from .zone import Quest
                 quest = Quest(
                     "gather_supplies",
                     "Gather Supplies",
@@ -159,57 +188,44 @@ class EnhancedZoneGenerator:
         # Again, similar to ZoneManager but using our enhanced map data
         # Add enemies in appropriate locations
         if zone.map:
+            cats = self.tileset.get_category_codes(zone.map.get_tile_id_array())
+            grass = cats == CATEGORY_GRASS
+            
             # Find suitable locations for enemies (not on paths)
-            enemy_locations = []
-            for y in range(zone.map.height):
-                for x in range(zone.map.width):
-                    tile_id = zone.map.get_tile_id(x, y)
-                    tile_type = self.tileset.id_to_type.get(tile_id)
-                    if tile_type == "grass" or tile_type == "trees":
-                        enemy_locations.append((x, y))
+            enemy_ys, enemy_xs = np.nonzero(grass | (cats == CATEGORY_TREES))
             
             # Add some wolves in the forest
             min_level, max_level = zone.level_range
-            num_enemies = random.randint(5, 10)
+            randint = self.rng.randint
+            num_enemies = randint(5, 10)
             
-            for i in range(num_enemies):
-                if enemy_locations:
-                    pos = random.choice(enemy_locations)
-                    enemy_locations.remove(pos)  # Don't place two enemies at the same spot
-                    
-                    from .zone import Enemy
-                    enemy_level = random.randint(min_level, max_level)
-                    enemy = Enemy(
-                        f"wolf_{i}",
-                        "Wolf",
-                        pos[0], pos[1],
-                        300,  # Placeholder sprite ID
-                        health=enemy_level * 10
-                    )
-                    zone.add_enemy(enemy)
+            # Pick distinct spots so no two enemies share a tile
+            picked = self.rng.sample(range(len(enemy_xs)), min(num_enemies, len(enemy_xs)))
+            for i, index in enumerate(picked):
+                enemy_level = randint(min_level, max_level)
+                enemy = Enemy(
+                    f"wolf_{i}",
+                    "Wolf",
+                    int(enemy_xs[index]), int(enemy_ys[index]),
+                    300,  # Placeholder sprite ID
+                    health=enemy_level * 10
+                )
+                zone.add_enemy(enemy)
             
             # Add a landmark in a clearing
-            # Look for a cluster of grass tiles away from paths
-            clearing_locations = []
-            for y in range(2, zone.map.height - 2):
-                for x in range(2, zone.map.width - 2):
-                    # Check if we have a 3x3 area of grass
-                    is_clearing = True
-                    for dy in range(-1, 2):
-                        for dx in range(-1, 2):
-                            tile_id = zone.map.get_tile_id(x + dx, y + dy)
-                            tile_type = self.tileset.id_to_type.get(tile_id)
-                            if tile_type != "grass":
-                                is_clearing = False
-                                break
-                        if not is_clearing:
-                            break
-                    
-                    if is_clearing:
-                        clearing_locations.append((x, y))
+            # Look for a cluster of grass tiles away from paths: a cell is a
+            # clearing when it and its 8 neighbours are all grass. The 3x3
+            # test is separable, so AND each column's three rows first and
+            # then three neighbouring columns of that result
+            vertical = grass[:-2] & grass[1:-1] & grass[2:]
+            clearing = vertical[:, :-2] & vertical[:, 1:-1] & vertical[:, 2:]
+            
+            # Keep centres at least two tiles from the map edge
+            clearing_ys, clearing_xs = np.nonzero(clearing[1:-1, 1:-1])
+            clearing_locations = list(zip((clearing_xs + 2).tolist(), (clearing_ys + 2).tolist()))
             
             if clearing_locations:
-                pos = random.choice(clearing_locations)
+                pos = self.rng.choice(clearing_locations)
                 zone.add_landmark(
                     "Ancient Tree",
                     pos[0], pos[1],
@@ -240,23 +256,14 @@ class EnhancedZoneManager:
         self.zones = {}
         self.current_zone_id = None
         
+        # Source of unique zone ID suffixes
+        self._next_id = itertools.count()
+        
         # Initialize the map generator with the tileset
-        from .enhanced_tilemap import EnhancedMapGenerator
         self.map_generator = EnhancedMapGenerator(self.tileset)
         
-        # Load zone configuration if available
-        self.zone_config = self._load_zone_config()
-    
-    def _load_zone_config(self):
-        """Load zone configuration from file."""
-        config_path = os.path.join("game", "config", "zones.json")
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, "r") as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading zone config: {e}")
-        return {}
+        # Load zone configuration if available, shared by all managers
+        self.zone_config = _load_zone_config()
     
     def generate_zone(self, zone_type: str, level_range: Tuple[int, int], name: str) -> Zone:
         """Generate a new zone.
@@ -270,7 +277,7 @@ class EnhancedZoneManager:
             The generated zone
         """
         # Generate a unique ID for this zone
-        zone_id = str(uuid.uuid4())
+        zone_id = f"{zone_type}_{next(self._next_id):08x}"
         
         # Get zone size from config or use defaults
         zone_config = self.zone_config.get(zone_type, {})
@@ -316,13 +323,14 @@ class EnhancedZoneManager:
         return self.zones.get(zone_id)
     
     def set_current_zone(self, zone_id: str) -> None:
-        """Set the current zone.
+        """Set the current zone, populating it on its first visit.
         
         Args:
             zone_id: ID of the zone to set as current
         """
         if zone_id in self.zones:
             self.current_zone_id = zone_id
+            self.zones[zone_id].realize()
     
     def get_current_zone(self) -> Optional[Zone]:
         """Get the current zone.
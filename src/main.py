@@ -9,6 +9,11 @@ import asyncio
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.DEBUG,
@@ -28,7 +33,40 @@ sys.path.append(str(project_root))
 load_dotenv()
 
 from src.core.game_state import GameState
-from src.core.scene import SceneManager, MainMenuScene, GameplayScene, CharacterCreationScene
+from src.core.scene import (SceneManager, SceneID, MainMenuScene, GameplayScene,
+                            CharacterCreationScene, render_text)
+
+# How often the window is serviced while the game state loads
+LOADING_POLL_SECONDS = 1 / 60
+
+def show_loading_screen(screen: pygame.Surface) -> None:
+    """Draw a minimal loading screen and present it immediately.
+    
+    Args:
+        screen: The display surface
+    """
+    screen.fill((0, 0, 0))
+    text = render_text(24, "Loading...", (255, 255, 255))
+    screen.blit(text, text.get_rect(center=screen.get_rect().center))
+    pygame.display.flip()
+
+async def load_game_state():
+    """Build the game state on a worker thread while the window stays responsive.
+    
+    Template and document loading is blocking file I/O, so it runs in the
+    default executor while this coroutine keeps pumping window events.
+    
+    Returns:
+        The loaded GameState, or None if the window was closed while loading
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(None, GameState)
+    while not future.done():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return None
+        await asyncio.wait({future}, timeout=LOADING_POLL_SECONDS)
+    return future.result()
 
 async def main():
     """Initialize and run the game."""
@@ -39,40 +77,42 @@ async def main():
     screen = pygame.display.set_mode((800, 600))
     pygame.display.set_caption("AI-Driven RPG Adventure")
     
-    # Create game state
-    game_state = GameState()
+    # Create game state behind a loading screen
+    show_loading_screen(screen)
+    game_state = await load_game_state()
+    if game_state is None:
+        pygame.quit()
+        sys.exit()
     
     # Create scene manager
     scene_manager = SceneManager(game_state)
     
-    # Register scenes
-    scene_manager.register_scene("main_menu", MainMenuScene(game_state))
-    scene_manager.register_scene("character_creation", CharacterCreationScene(game_state))
-    scene_manager.register_scene("gameplay", GameplayScene(game_state))
+    # Register scenes (constructed lazily on first entry)
+    scene_manager.register_scene(SceneID.MAIN_MENU, MainMenuScene)
+    scene_manager.register_scene(SceneID.CHARACTER_CREATION, CharacterCreationScene)
+    scene_manager.register_scene(SceneID.GAMEPLAY, GameplayScene)
     
     # Start with main menu
-    scene_manager.change_scene("main_menu")
+    scene_manager.change_scene(SceneID.MAIN_MENU)
     
     # Main game loop
-    clock = pygame.time.Clock()
     running = True
     
     while running:
         # Handle events
-        for event in pygame.event.get():
+        for event in scene_manager.get_events():
             if event.type == pygame.QUIT:
                 running = False
             else:
                 scene_manager.handle_event(event)
         
         # Update
-        dt = clock.tick(60) / 1000.0  # Convert to seconds
+        dt = scene_manager.tick()
         scene_manager.update(dt)
         
-        # Render
-        screen.fill((0, 0, 0))  # Clear screen
+        # Render; scenes paint their own background and report what changed
         scene_manager.render(screen)
-        pygame.display.flip()
+        scene_manager.present()
         
         # Allow other tasks to run
         await asyncio.sleep(0)
@@ -82,4 +122,8 @@ async def main():
     sys.exit()
 
 if __name__ == "__main__":
+    # The story agent's LLM calls run as tasks on this loop, so it stays async;
+    # uvloop just makes each per-frame loop iteration cheaper where available
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main()) 
\ No newline at end of file
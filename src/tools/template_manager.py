@@ -4,15 +4,45 @@ Template manager to coordinate all template systems.
 from typing import Dict, Any, Optional
 from pathlib import Path
 import json
+import os
 import logging
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .templates.npc import NPCTemplate, NPCGenerator
 from .templates.quest import QuestTemplate, QuestGenerator
 from .templates.story_event import StoryEventTemplate, StoryEventGenerator
 
 logger = logging.getLogger(__name__)
 
+def _decode_template(data: bytes) -> Dict[str, Any]:
+    """Decode template file contents.
+    
+    Args:
+        data: Raw file contents
+        
+    Returns:
+        Template data
+    """
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _encode_template(template_data: Dict[str, Any]) -> bytes:
+    """Encode template data for saving.
+    
+    Args:
+        template_data: Template data to encode
+        
+    Returns:
+        The encoded template as indented JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(template_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(template_data, indent=2).encode()
+
 class TemplateManager:
     """Manages all template systems and their interactions."""
     
@@ -30,46 +60,44 @@ class TemplateManager:
         self.quest_generator = QuestGenerator()
         self.story_event_generator = StoryEventGenerator()
         
+        # Template class and generator for each template type; files live in "<type>s/"
+        self._categories = {
+            "npc": (NPCTemplate, self.npc_generator),
+            "quest": (QuestTemplate, self.quest_generator),
+            "event": (StoryEventTemplate, self.story_event_generator),
+        }
+        
         # Load templates
         self._load_templates()
     
     def _load_templates(self):
         """Load all templates from files."""
-        # Load NPC templates
-        npc_dir = self.template_dir / "npcs"
-        npc_dir.mkdir(exist_ok=True)
-        for template_file in npc_dir.glob("*.json"):
-            try:
-                with open(template_file, "r") as f:
-                    template_data = json.load(f)
-                template = NPCTemplate.from_dict(template_data)
-                self.npc_generator.register_template(template_file.stem, template)
-            except Exception as e:
-                logger.error(f"Failed to load NPC template {template_file}: {e}")
-        
-        # Load quest templates
-        quest_dir = self.template_dir / "quests"
-        quest_dir.mkdir(exist_ok=True)
-        for template_file in quest_dir.glob("*.json"):
-            try:
-                with open(template_file, "r") as f:
-                    template_data = json.load(f)
-                template = QuestTemplate.from_dict(template_data)
-                self.quest_generator.register_template(template_file.stem, template)
-            except Exception as e:
-                logger.error(f"Failed to load quest template {template_file}: {e}")
-        
-        # Load story event templates
-        event_dir = self.template_dir / "events"
-        event_dir.mkdir(exist_ok=True)
-        for template_file in event_dir.glob("*.json"):
-            try:
-                with open(template_file, "r") as f:
-                    template_data = json.load(f)
-                template = StoryEventTemplate.from_dict(template_data)
-                self.story_event_generator.register_template(template_file.stem, template)
-            except Exception as e:
-                logger.error(f"Failed to load story event template {template_file}: {e}")
+        for template_type, (template_cls, generator) in self._categories.items():
+            self._load_category(f"{template_type}s", template_cls, generator)
+    
+    def _load_category(self, subdir: str, template_cls, generator):
+        """Load and register every template file in one template subdirectory.
+        
+        Args:
+            subdir: Subdirectory of the template directory to scan
+            template_cls: Template class providing from_dict
+            generator: Generator to register the templates with
+        """
+        category_dir = self.template_dir / subdir
+        category_dir.mkdir(exist_ok=True)
+        with os.scandir(category_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                template_id, suffix = os.path.splitext(name)
+                if suffix != ".json" or name.startswith(".") or not entry.is_file():
+                    continue
+                template_file = Path(entry.path)
+                try:
+                    with open(template_file, "rb") as f:
+                        template = template_cls.from_dict(_decode_template(f.read()))
+                    generator.register_template(template_id, template)
+                except Exception as e:
+                    logger.error(f"Failed to load {template_cls.__name__} {template_file}: {e}")
     
     def save_template(self, template_type: str, template_id: str, template_data: Dict[str, Any]):
         """Save a template to file.
@@ -83,11 +111,18 @@ class TemplateManager:
         template_dir.mkdir(exist_ok=True)
         
         template_file = template_dir / f"{template_id}.json"
-        with open(template_file, "w") as f:
-            json.dump(template_data, f, indent=2)
+        with open(template_file, "wb") as f:
+            f.write(_encode_template(template_data))
         
-        # Reload templates
-        self._load_templates()
+        # Swap in the saved template directly instead of re-reading every file
+        if template_type not in self._categories:
+            logger.warning(f"Unknown template type {template_type}, template saved but not registered")
+            return
+        template_cls, generator = self._categories[template_type]
+        
+        generator.invalidate(template_id)
+        template = template_cls.from_dict(template_data)
+        generator.register_template(template_id, template)
     
     def generate_npc(self, template_id: str, **kwargs) -> Dict[str, Any]:
         """Generate an NPC instance.
@@ -0,0 +1,22 @@
+"""
+Copying of JSON-style template data for new instances.
+"""
+from typing import Any
+
+def copy_json(value: Any) -> Any:
+    """Copy the dicts and lists of a JSON-style value, sharing its immutable leaves.
+    
+    Template data only holds dicts, lists and scalars, so this skips the memo
+    and type dispatch that copy.deepcopy does for arbitrary objects.
+    
+    Args:
+        value: Value made of dicts, lists, strings, numbers, booleans and None
+    
+    Returns:
+        Copy that shares no dicts or lists with the original
+    """
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
@@ -3,9 +3,15 @@ NPC template system for generating NPC instances.
 """
 from typing import Dict, Any, List
 from dataclasses import dataclass
+import sys
 from datetime import datetime
+from .copying import copy_json
+from .timestamps import iso_now
 
-@dataclass
+# Most recent interactions kept per NPC instance
+MAX_INTERACTION_HISTORY = 256
+
+@dataclass(slots=True, frozen=True)
 class NPCTemplate:
     """Template for generating NPCs."""
     name: str
@@ -23,16 +29,17 @@ class NPCTemplate:
         Returns:
             Dictionary representation of the template
         """
+        # Copy the containers so instances never share lists or dicts with the template
         return {
             "name": self.name,
             "role": self.role,
             "background": self.background,
-            "personality": self.personality,
+            "personality": dict(self.personality),
             "dialogue_style": self.dialogue_style,
-            "appearance": self.appearance,
-            "skills": self.skills,
-            "relationships": self.relationships,
-            "created_at": datetime.now().isoformat()
+            "appearance": copy_json(self.appearance),
+            "skills": list(self.skills),
+            "relationships": dict(self.relationships),
+            "created_at": iso_now()
         }
     
     @classmethod
@@ -46,8 +53,8 @@ class NPCTemplate:
             NPCTemplate instance
         """
         return cls(
-            name=data["name"],
-            role=data["role"],
+            name=sys.intern(data["name"]),
+            role=sys.intern(data["role"]),
             background=data["background"],
             personality=data["personality"],
             dialogue_style=data["dialogue_style"],
@@ -72,6 +79,14 @@ class NPCGenerator:
         """
         self.templates[template_id] = template
     
+    def invalidate(self, template_id: str):
+        """Forget a registered NPC template whose definition has changed.
+        
+        Args:
+            template_id: Identifier of the template to drop
+        """
+        self.templates.pop(template_id, None)
+    
     def generate_npc(self, template_id: str, **kwargs) -> Dict[str, Any]:
         """Generate an NPC instance from a template.
         
@@ -95,7 +110,6 @@ class NPCGenerator:
         
         # Add instance-specific data
         npc_data["instance_id"] = f"{template_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        npc_data["created_at"] = datetime.now().isoformat()
         npc_data["interaction_history"] = []
         
         return npc_data
@@ -110,8 +124,14 @@ class NPCGenerator:
         Returns:
             Updated NPC data
         """
-        npc_data["interaction_history"].append({
-            "timestamp": datetime.now().isoformat(),
+        history = npc_data["interaction_history"]
+        history.append({
+            "timestamp": iso_now(),
             **interaction
         })
+        
+        # Drop the oldest entries so long sessions don't grow the history without bound;
+        # it stays a list so the NPC data can still be saved as JSON
+        if len(history) > MAX_INTERACTION_HISTORY:
+            del history[:-MAX_INTERACTION_HISTORY]
         return npc_data 
\ No newline at end of file
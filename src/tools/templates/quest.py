@@ -2,8 +2,12 @@
 Quest template system for generating quest instances.
 """
 from typing import Dict, Any, List, Optional
+from collections import OrderedDict
 from dataclasses import dataclass
+import sys
 from datetime import datetime
+from .copying import copy_json
+from .timestamps import iso_now
 from enum import Enum
 
 class QuestType(Enum):
@@ -21,7 +25,13 @@ class QuestStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
-@dataclass
+# Direct value-to-member lookups, cheaper than calling the enum class
+_QUEST_TYPES = {member.value: member for member in QuestType}
+
+# In-progress quests whose remaining objective counts are tracked at once
+MAX_TRACKED_QUESTS = 256
+
+@dataclass(slots=True, frozen=True)
 class QuestObjective:
     """Individual objective within a quest."""
     description: str
@@ -44,14 +54,14 @@ class QuestObjective:
     def from_dict(cls, data: Dict[str, Any]) -> 'QuestObjective':
         """Create objective from dictionary."""
         return cls(
-            description=data["description"],
-            target=data["target"],
+            description=sys.intern(data["description"]),
+            target=sys.intern(data["target"]),
             count=data["count"],
             current=data.get("current", 0),
             is_optional=data.get("is_optional", False)
         )
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QuestTemplate:
     """Template for generating quests."""
     title: str
@@ -65,16 +75,17 @@ class QuestTemplate:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert template to dictionary format."""
+        # Copy the containers so instances never share lists or dicts with the template
         return {
             "title": self.title,
             "description": self.description,
             "quest_type": self.quest_type.value,
             "objectives": [obj.to_dict() for obj in self.objectives],
-            "rewards": self.rewards,
-            "prerequisites": self.prerequisites,
+            "rewards": copy_json(self.rewards),
+            "prerequisites": list(self.prerequisites),
             "time_limit": self.time_limit,
             "repeatable": self.repeatable,
-            "created_at": datetime.now().isoformat()
+            "created_at": iso_now()
         }
     
     @classmethod
@@ -83,7 +94,7 @@ class QuestTemplate:
         return cls(
             title=data["title"],
             description=data["description"],
-            quest_type=QuestType(data["quest_type"]),
+            quest_type=_QUEST_TYPES[data["quest_type"]],
             objectives=[QuestObjective.from_dict(obj) for obj in data["objectives"]],
             rewards=data["rewards"],
             prerequisites=data["prerequisites"],
@@ -91,12 +102,22 @@ class QuestTemplate:
             repeatable=data.get("repeatable", False)
         )
 
+@dataclass(slots=True)
+class _ProgressTracker:
+    """Required objective counts of an in-progress quest and how many are still unmet."""
+    objectives: List[Dict[str, Any]]
+    progress: Dict[str, int]
+    required: Dict[str, int]
+    remaining: int
+
 class QuestGenerator:
     """Generates quest instances from templates."""
     
     def __init__(self):
         """Initialize the quest generator."""
         self.templates: Dict[str, QuestTemplate] = {}
+        # Progress trackers per in-progress quest ID, least recently updated first
+        self._trackers: "OrderedDict[str, _ProgressTracker]" = OrderedDict()
     
     def register_template(self, template_id: str, template: QuestTemplate):
         """Register a new quest template.
@@ -107,6 +128,14 @@ class QuestGenerator:
         """
         self.templates[template_id] = template
     
+    def invalidate(self, template_id: str):
+        """Forget a registered quest template whose definition has changed.
+        
+        Args:
+            template_id: Identifier of the template to drop
+        """
+        self.templates.pop(template_id, None)
+    
     def generate_quest(self, template_id: str, **kwargs) -> Dict[str, Any]:
         """Generate a quest instance from a template.
         
@@ -137,6 +166,42 @@ class QuestGenerator:
         
         return quest_data
     
+    def _tracker(self, quest_data: Dict[str, Any]) -> _ProgressTracker:
+        """Return the progress tracker for an in-progress quest.
+        
+        Trackers live on the generator, so nothing extra is stored in the quest
+        document. One is rebuilt whenever the quest's objectives or progress
+        were replaced, such as after loading it from disk. Objectives sharing a
+        description share one progress entry, so they share one requirement:
+        the largest count among the required ones.
+        
+        Args:
+            quest_data: Quest data to look up
+            
+        Returns:
+            Tracker for the quest
+        """
+        quest_id = quest_data["quest_id"]
+        objectives = quest_data["objectives"]
+        progress = quest_data["progress"]
+        tracker = self._trackers.get(quest_id)
+        if tracker is not None and tracker.objectives is objectives and tracker.progress is progress:
+            self._trackers.move_to_end(quest_id)
+            return tracker
+        
+        required: Dict[str, int] = {}
+        for obj in objectives:
+            if not obj["is_optional"]:
+                required[obj["description"]] = max(required.get(obj["description"], 0), obj["count"])
+        remaining = sum(1 for description, count in required.items() if progress[description] < count)
+        tracker = _ProgressTracker(objectives, progress, required, remaining)
+        
+        self._trackers[quest_id] = tracker
+        self._trackers.move_to_end(quest_id)
+        if len(self._trackers) > MAX_TRACKED_QUESTS:
+            self._trackers.popitem(last=False)
+        return tracker
+    
     def update_quest_progress(self, quest_data: Dict[str, Any], objective: str, progress: int) -> Dict[str, Any]:
         """Update quest progress for a specific objective.
         
@@ -148,20 +213,32 @@ class QuestGenerator:
         Returns:
             Updated quest data
         """
-        if objective not in quest_data["progress"]:
+        progress_by_objective = quest_data["progress"]
+        if objective not in progress_by_objective:
             raise ValueError(f"Objective {objective} not found in quest")
         
-        quest_data["progress"][objective] = progress
+        # Only in-progress quests can complete, so any other status drops the tracker
+        if quest_data["status"] != QuestStatus.IN_PROGRESS.value:
+            self._trackers.pop(quest_data["quest_id"], None)
+            progress_by_objective[objective] = progress
+            return quest_data
         
-        # Update status if all objectives are complete
-        all_complete = all(
-            quest_data["progress"][obj["description"]] >= obj["count"]
-            for obj in quest_data["objectives"]
-            if not obj["is_optional"]
-        )
+        tracker = self._tracker(quest_data)
+        previous = progress_by_objective[objective]
+        progress_by_objective[objective] = progress
+        
+        # Only a required objective crossing its count changes the remaining total
+        count = tracker.required.get(objective)
+        if count is not None:
+            if previous < count <= progress:
+                tracker.remaining -= 1
+            elif progress < count <= previous:
+                tracker.remaining += 1
         
-        if all_complete and quest_data["status"] == QuestStatus.IN_PROGRESS.value:
+        # Update status if all objectives are complete
+        if tracker.remaining == 0:
             quest_data["status"] = QuestStatus.COMPLETED.value
-            quest_data["completion_time"] = datetime.now().isoformat()
+            quest_data["completion_time"] = iso_now()
+            self._trackers.pop(quest_data["quest_id"], None)
         
-        return quest_data 
\ No newline at end of file
+        return quest_data
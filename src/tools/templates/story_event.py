@@ -3,9 +3,15 @@ Story event template system for generating story events.
 """
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
+import sys
 from datetime import datetime
+from .copying import copy_json
+from .timestamps import iso_now
 from enum import Enum
 
+# Most recent player choices kept per event instance
+MAX_PLAYER_CHOICES = 256
+
 class EventType(Enum):
     """Types of story events."""
     DIALOGUE = "dialogue"
@@ -23,7 +29,11 @@ class EventImportance(Enum):
     MAJOR = "major"
     CRITICAL = "critical"
 
-@dataclass
+# Direct value-to-member lookups, cheaper than calling the enum classes
+_EVENT_TYPES = {member.value: member for member in EventType}
+_EVENT_IMPORTANCES = {member.value: member for member in EventImportance}
+
+@dataclass(slots=True, frozen=True)
 class StoryEventTemplate:
     """Template for generating story events."""
     title: str
@@ -39,18 +49,19 @@ class StoryEventTemplate:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert template to dictionary format."""
+        # Copy the containers so instances never share lists or dicts with the template
         return {
             "title": self.title,
             "description": self.description,
             "event_type": self.event_type.value,
             "importance": self.importance.value,
             "location": self.location,
-            "participants": self.participants,
-            "choices": self.choices,
-            "consequences": self.consequences,
-            "requirements": self.requirements,
+            "participants": list(self.participants),
+            "choices": copy_json(self.choices),
+            "consequences": copy_json(self.consequences),
+            "requirements": copy_json(self.requirements),
             "time_limit": self.time_limit,
-            "created_at": datetime.now().isoformat()
+            "created_at": iso_now()
         }
     
     @classmethod
@@ -59,9 +70,9 @@ class StoryEventTemplate:
         return cls(
             title=data["title"],
             description=data["description"],
-            event_type=EventType(data["event_type"]),
-            importance=EventImportance(data["importance"]),
-            location=data["location"],
+            event_type=_EVENT_TYPES[data["event_type"]],
+            importance=_EVENT_IMPORTANCES[data["importance"]],
+            location=sys.intern(data["location"]),
             participants=data["participants"],
             choices=data.get("choices"),
             consequences=data.get("consequences"),
@@ -85,6 +96,14 @@ class StoryEventGenerator:
         """
         self.templates[template_id] = template
     
+    def invalidate(self, template_id: str):
+        """Forget a registered story event template whose definition has changed.
+        
+        Args:
+            template_id: Identifier of the template to drop
+        """
+        self.templates.pop(template_id, None)
+    
     def generate_event(self, template_id: str, **kwargs) -> Dict[str, Any]:
         """Generate a story event instance from a template.
         
@@ -130,12 +149,13 @@ class StoryEventGenerator:
         event_data["status"] = status
         
         if status == "started":
-            event_data["start_time"] = datetime.now().isoformat()
+            event_data["start_time"] = iso_now()
         elif status in ["completed", "failed"]:
-            event_data["end_time"] = datetime.now().isoformat()
+            end_time = iso_now()
+            event_data["end_time"] = end_time
             if outcome:
                 event_data["outcomes"].append({
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": end_time,
                     **outcome
                 })
         
@@ -151,8 +171,13 @@ class StoryEventGenerator:
         Returns:
             Updated event data
         """
-        event_data["player_choices"].append({
-            "timestamp": datetime.now().isoformat(),
+        choices = event_data["player_choices"]
+        choices.append({
+            "timestamp": iso_now(),
             **choice
         })
+        
+        # Drop the oldest choices so a long-running event stays bounded
+        if len(choices) > MAX_PLAYER_CHOICES:
+            del choices[:-MAX_PLAYER_CHOICES]
         return event_data 
\ No newline at end of file
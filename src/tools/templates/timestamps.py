@@ -0,0 +1,28 @@
+"""
+Shared ISO 8601 timestamps for template instances.
+"""
+import time
+from datetime import datetime
+
+# Whole second the cached prefix belongs to, and its "YYYY-MM-DDTHH:MM:SS" form
+_cached_second = None
+_cached_prefix = ""
+
+def iso_now() -> str:
+    """Return the current local time in the same format as datetime.now().isoformat().
+    
+    The date and time-of-day part is formatted once per second and reused, so
+    stamping many instances in a burst only formats the microseconds.
+    
+    Returns:
+        ISO 8601 timestamp string
+    """
+    global _cached_second, _cached_prefix
+    second, remainder = divmod(time.time_ns(), 1_000_000_000)
+    if second != _cached_second:
+        _cached_prefix = datetime.fromtimestamp(second).isoformat()
+        _cached_second = second
+    microsecond = remainder // 1000
+    if microsecond:
+        return f"{_cached_prefix}.{microsecond:06d}"
+    return _cached_prefix
@@ -2,7 +2,8 @@
 Main menu scene for the game.
 """
 import pygame
-from ..core.scene import Scene
+from typing import Optional
+from ..core.scene import Scene, render_text
 from ..core.config import WHITE, BLACK
 
 class MenuScene(Scene):
@@ -13,10 +14,12 @@ class MenuScene(Scene):
             game: The main game instance
         """
         super().__init__(game)
-        self.font = pygame.font.Font(None, 36)
-        self.title = self.font.render("AI-Driven RPG Adventure", True, WHITE)
-        self.start_text = self.font.render("Press SPACE to Start", True, WHITE)
-        self.quit_text = self.font.render("Press ESC to Quit", True, WHITE)
+        self.title = render_text(36, "AI-Driven RPG Adventure", WHITE)
+        self.start_text = render_text(36, "Press SPACE to Start", WHITE)
+        self.quit_text = render_text(36, "Press ESC to Quit", WHITE)
+        
+        # Whole menu composed onto one screen-sized surface on first draw
+        self.menu_surface: Optional[pygame.Surface] = None
 
     def update(self):
         """Update the menu state."""
@@ -25,19 +28,36 @@ class MenuScene(Scene):
             # TODO: Change to game scene
             pass
 
+    def _compose(self, screen: pygame.Surface) -> pygame.Surface:
+        """Draw the background and all menu text onto one surface.
+        
+        Args:
+            screen: The screen the menu will be drawn on
+            
+        Returns:
+            The composed menu, in the screen's pixel format
+        """
+        size = screen.get_size()
+        # Matching the screen's format keeps the per-frame blit a plain copy
+        menu_surface = pygame.Surface(size, 0, screen)
+        menu_surface.fill(BLACK)
+        
+        # Center the text
+        center_x = size[0] // 2
+        for text, center_y in ((self.title, 200), (self.start_text, 300), (self.quit_text, 400)):
+            menu_surface.blit(text, text.get_rect(center=(center_x, center_y)))
+        
+        return menu_surface
+
     def draw(self, screen: pygame.Surface):
         """Draw the menu.
         
         Args:
             screen: The pygame surface to draw on
         """
-        screen.fill(BLACK)
-        
-        # Center the text
-        title_rect = self.title.get_rect(center=(screen.get_width() // 2, 200))
-        start_rect = self.start_text.get_rect(center=(screen.get_width() // 2, 300))
-        quit_rect = self.quit_text.get_rect(center=(screen.get_width() // 2, 400))
+        # Recompose only when the screen size changes
+        size = screen.get_size()
+        if self.menu_surface is None or self.menu_surface.get_size() != size:
+            self.menu_surface = self._compose(screen)
         
-        screen.blit(self.title, title_rect)
-        screen.blit(self.start_text, start_rect)
-        screen.blit(self.quit_text, quit_rect) 
\ No newline at end of file
+        screen.blit(self.menu_surface, (0, 0))
@@ -0,0 +1,149 @@
+"""
+SQLite storage for NPC and quest documents.
+"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS npcs (
+    id TEXT NOT NULL,
+    archived INTEGER NOT NULL DEFAULT 0,
+    json BLOB NOT NULL,
+    updated TEXT,
+    PRIMARY KEY (id, archived)
+);
+CREATE TABLE IF NOT EXISTS quests (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    json BLOB NOT NULL,
+    updated TEXT
+);
+"""
+
+class DocumentDB:
+    """Stores serialized NPC and quest documents in one SQLite file.
+    
+    Documents are passed in and out as already-serialized JSON bytes, so the
+    caller decides the encoding. Each write commits immediately unless a batch
+    is open, in which case everything commits together in commit().
+    
+    An NPC's active and archived documents are separate rows, so an NPC that
+    is saved again after being archived keeps its archive. The connection is
+    shared between threads, so every statement runs under one lock.
+    """
+    
+    def __init__(self, db_path: Path):
+        """Open (and create if needed) the document database.
+        
+        Args:
+            db_path: Path of the SQLite file
+        """
+        # The game state is built on a loader thread and then used from the
+        # main thread, so the connection can't be pinned to its creator
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self._batching = False
+        self._lock = threading.Lock()
+    
+    def begin(self):
+        """Hold commits back until commit() is called."""
+        with self._lock:
+            self._batching = True
+    
+    def commit(self):
+        """Commit everything written since begin()."""
+        with self._lock:
+            self._batching = False
+            self.conn.commit()
+    
+    def _written(self):
+        """Commit a single write unless a batch is open; the lock must be held."""
+        if not self._batching:
+            self.conn.commit()
+    
+    def put_npc(self, npc_id: str, data: bytes, updated: str):
+        """Store an active NPC document.
+        
+        Args:
+            npc_id: The NPC's unique identifier
+            data: Serialized NPC state
+            updated: Timestamp of the save
+        """
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO npcs VALUES (?, 0, ?, ?)", (npc_id, data, updated))
+            self._written()
+    
+    def get_npc(self, npc_id: str, archived: bool = False) -> Optional[bytes]:
+        """Fetch an NPC document.
+        
+        Args:
+            npc_id: The NPC's unique identifier
+            archived: Whether to look for an archived NPC instead of an active one
+            
+        Returns:
+            The serialized NPC state, or None if not found
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT json FROM npcs WHERE id = ? AND archived = ?",
+                                    (npc_id, int(archived))).fetchone()
+        return row[0] if row is not None else None
+    
+    def iter_npc_ids(self) -> Iterator[str]:
+        """Iterate over the IDs of active NPCs.
+        
+        Yields:
+            Each active NPC's ID
+        """
+        with self._lock:
+            rows = self.conn.execute("SELECT id FROM npcs WHERE archived = 0").fetchall()
+        for (npc_id,) in rows:
+            yield npc_id
+    
+    def archive_npc(self, npc_id: str, data: bytes, updated: str):
+        """Replace an NPC's archived document with its final state and drop the active one.
+        
+        Args:
+            npc_id: The NPC's unique identifier
+            data: Serialized NPC state including its archive stamp
+            updated: Timestamp of the archive
+        """
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO npcs VALUES (?, 1, ?, ?)", (npc_id, data, updated))
+            self.conn.execute("DELETE FROM npcs WHERE id = ? AND archived = 0", (npc_id,))
+            self._written()
+    
+    def put_quest(self, quest_id: str, status: Optional[str], data: bytes, updated: str):
+        """Store a quest document.
+        
+        Args:
+            quest_id: The quest's unique identifier
+            status: The quest's status
+            data: Serialized quest state
+            updated: Timestamp of the save
+        """
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO quests VALUES (?, ?, ?, ?)", (quest_id, status, data, updated))
+            self._written()
+    
+    def get_quest(self, quest_id: str) -> Optional[bytes]:
+        """Fetch a quest document.
+        
+        Args:
+            quest_id: The quest's unique identifier
+            
+        Returns:
+            The serialized quest state, or None if not found
+        """
+        with self._lock:
+            row = self.conn.execute("SELECT json FROM quests WHERE id = ?", (quest_id,)).fetchone()
+        return row[0] if row is not None else None
+    
+    def close(self):
+        """Commit outstanding writes and close the database."""
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
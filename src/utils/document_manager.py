@@ -1,72 +1,395 @@
 """
 Document manager for handling game state persistence.
 """
+import asyncio
 import json
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from .doc_db import DocumentDB
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Flags for writing a document file from scratch (O_BINARY only exists on Windows)
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+# Worker threads for the async save methods
+SAVE_WORKERS = 4
+
+# How long a timestamp is reused outside a batch, in nanoseconds
+STAMP_REUSE_NS = 1_000_000
+
+# zstd level for archived NPCs; archives are written once and rarely read
+ARCHIVE_COMPRESSION_LEVEL = 3
+
+# Deepest directories of the document tree; their parents come with them
+_LEAF_DIRECTORIES = (
+    "story/locations",
+    "npcs/active",
+    "npcs/history",
+    "quests/active",
+    "quests/completed",
+    "game_state",
+)
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a document to compact JSON bytes, using orjson when installed.
+    
+    Args:
+        obj: The document to serialize
+        
+    Returns:
+        UTF-8 encoded JSON without insignificant whitespace
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+def _loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when installed.
+    
+    Args:
+        data: UTF-8 encoded JSON
+        
+    Returns:
+        The parsed document
+    """
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _atomic_write_bytes(path: Path, data: bytes, sync: bool = False):
+    """Replace a file's contents so readers never see a partial write.
+    
+    The data goes to a temporary sibling which is then renamed over the
+    target, so a crash leaves either the old file or the new one.
+    
+    Args:
+        path: File to write
+        data: Complete new file contents
+        sync: Whether to fsync the data before the rename
+    """
+    # Per-thread temp name so concurrent saves of one document can't interleave
+    tmp_path = path.with_suffix(f"{path.suffix}.{threading.get_ident()}.tmp")
+    
+    # Documents are small and written whole, so skip the buffered io layer
+    fd = os.open(tmp_path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if sync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
 class DocumentManager:
     """Manages game documents and state persistence."""
     
-    def __init__(self, base_path: str = "docs"):
+    def __init__(self, base_path: str = "docs", use_database: bool = False):
         """Initialize the document manager.
         
         Args:
             base_path: Base path for document storage
+            use_database: Store NPCs and quests in one SQLite file instead of
+                one JSON file each
         """
         self.base_path = Path(base_path)
         self._ensure_directories()
+        self._migrate_story_history()
+        self._db: Optional[DocumentDB] = DocumentDB(self.base_path / "documents.db") if use_database else None
+        
+        # Guards the batch, stamp, cache and quest index state, which the async
+        # save methods touch from several pool threads at once
+        self._lock = threading.RLock()
+        
+        # Writes held back between begin_batch and commit_batch; None when not batching
+        self._pending: Optional[Dict[Path, bytes]] = None
+        self._pending_appends: Dict[Path, List[bytes]] = {}
+        self._pending_unlinks: Set[Path] = set()
+        self._pending_sync = False
+        
+        # Timestamp shared by saves in the same batch or millisecond
+        self._stamp: Optional[str] = None
+        self._stamp_ns = 0
+        
+        # Parsed documents keyed by path, valid while the file's mtime and size match
+        self._cache: Dict[Path, Tuple[int, int, Any]] = {}
+        
+        # Thread pool for the async save methods, created on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # Directory ("active" or "completed") holding each known quest
+        self._quest_status: Dict[str, str] = {} if self._db is not None else self._load_quest_index()
     
     def _ensure_directories(self):
         """Ensure all required directories exist."""
-        directories = [
-            "story",
-            "story/locations",
-            "npcs/active",
-            "npcs/history",
-            "quests/active",
-            "quests/completed",
-            "game_state"
-        ]
-        for directory in directories:
-            (self.base_path / directory).mkdir(parents=True, exist_ok=True)
-    
-    def save_story_state(self, state: Dict[str, Any]):
+        for directory in _LEAF_DIRECTORIES:
+            os.makedirs(self.base_path / directory, exist_ok=True)
+    
+    def _migrate_story_history(self):
+        """Convert a story history saved as one JSON array into the JSON Lines log."""
+        legacy_file = self.base_path / "story/history.json"
+        if not legacy_file.exists():
+            return
+        
+        history = _loads(legacy_file.read_bytes())
+        
+        # Older entries go first, ahead of anything already in the log
+        history_file = self.base_path / "story/history.jsonl"
+        existing = history_file.read_bytes() if history_file.exists() else b""
+        migrated_file = history_file.with_suffix(".jsonl.tmp")
+        with open(migrated_file, "wb") as f:
+            for entry in history:
+                f.write(_dumps(entry) + b"\n")
+            f.write(existing)
+        os.replace(migrated_file, history_file)
+        legacy_file.unlink()
+    
+    def _load_quest_index(self) -> Dict[str, str]:
+        """Load the quest directory index, rebuilding it from the quest folders if absent.
+        
+        Returns:
+            Mapping of quest ID to the directory holding it
+        """
+        index_file = self.base_path / "quests/_index.json"
+        if index_file.exists():
+            try:
+                return _loads(index_file.read_bytes())
+            except ValueError:
+                pass
+        
+        # Completed is scanned last so it wins over a leftover active copy
+        index: Dict[str, str] = {}
+        for directory in ("active", "completed"):
+            with os.scandir(self.base_path / "quests" / directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json"):
+                        index[entry.name[:-len(".json")]] = directory
+        return index
+    
+    def _set_quest_directory(self, quest_id: str, directory: Optional[str]):
+        """Record which directory holds a quest, rewriting the index when it changes.
+        
+        Args:
+            quest_id: The quest's unique identifier
+            directory: "active" or "completed", or None if the quest doesn't exist
+        """
+        # The snapshot is written under the lock so a newer one can't be
+        # overtaken by an older one from another thread
+        with self._lock:
+            if self._quest_status.get(quest_id) == directory:
+                return
+            if directory is None:
+                del self._quest_status[quest_id]
+            else:
+                self._quest_status[quest_id] = directory
+            self._write_bytes(self.base_path / "quests/_index.json", _dumps(self._quest_status))
+    
+    def begin_batch(self):
+        """Start holding writes back so commit_batch can flush them together.
+        
+        Saving the same document several times within a batch writes it
+        only once, and reads see the pending contents.
+        """
+        with self._lock:
+            if self._pending is None:
+                self._pending = {}
+                self._stamp = None
+                if self._db is not None:
+                    self._db.begin()
+    
+    def commit_batch(self):
+        """Write everything saved since begin_batch and stop batching."""
+        # Held throughout so a save from another thread can't land between
+        # the flush and be overwritten by an older pending copy
+        with self._lock:
+            pending, appends, sync = self._pending, self._pending_appends, self._pending_sync
+            unlinks = self._pending_unlinks
+            if pending is None:
+                return
+            self._pending = None
+            self._pending_appends = {}
+            self._pending_unlinks = set()
+            self._pending_sync = False
+            self._stamp = None
+            
+            for path, data in pending.items():
+                _atomic_write_bytes(path, data)
+                self._cache.pop(path, None)
+            for path, lines in appends.items():
+                self._append_bytes(path, b"".join(lines), sync)
+            
+            # Files are only removed once whatever replaces them (e.g. an archive) is written
+            for path in unlinks:
+                path.unlink(missing_ok=True)
+                self._cache.pop(path, None)
+            if self._db is not None:
+                self._db.commit()
+    
+    def _now(self) -> str:
+        """Get the current time as an ISO string for stamping saved documents.
+        
+        Every save in a batch shares one stamp; outside a batch a stamp is
+        reused for up to STAMP_REUSE_NS.
+        
+        Returns:
+            The timestamp
+        """
+        with self._lock:
+            now_ns = time.monotonic_ns()
+            if self._stamp is None or (self._pending is None and now_ns - self._stamp_ns > STAMP_REUSE_NS):
+                self._stamp = datetime.now().isoformat()
+                self._stamp_ns = now_ns
+            return self._stamp
+    
+    def _write_bytes(self, path: Path, data: bytes):
+        """Write a document, or hold it back if a batch is open.
+        
+        Args:
+            path: File to write
+            data: Complete new file contents
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending[path] = data
+                self._pending_unlinks.discard(path)
+                return
+        _atomic_write_bytes(path, data)
+        self._cache.pop(path, None)
+    
+    def _write_json(self, rel_path: str, state: Dict[str, Any], *, stamp_key: str = "last_updated") -> bytes:
+        """Stamp a document and write it under the base path.
+        
+        Args:
+            rel_path: File to write, relative to the base path
+            state: The document to stamp and save
+            stamp_key: Key that receives the save timestamp
+            
+        Returns:
+            The serialized document
+        """
+        state[stamp_key] = self._now()
+        path = self.base_path / rel_path
+        data = _dumps(state)
+        self._write_bytes(path, data)
+        return data
+    
+    def _append_bytes(self, path: Path, data: bytes, sync: bool = False):
+        """Append to a log file, or hold the data back if a batch is open.
+        
+        Args:
+            path: File to append to
+            data: Bytes to append
+            sync: Whether to fsync the file after appending
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending_appends.setdefault(path, []).append(data)
+                self._pending_sync = self._pending_sync or sync
+                return
+            with open(path, "ab") as f:
+                f.write(data)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+    
+    def _exists(self, path: Path) -> bool:
+        """Check whether a document exists on disk or is pending in the batch."""
+        with self._lock:
+            if self._pending is not None:
+                if path in self._pending:
+                    return True
+                if path in self._pending_unlinks:
+                    return False
+        return path.exists()
+    
+    def _read_json(self, path: Path) -> Optional[Any]:
+        """Read a document, preferring contents pending in the open batch.
+        
+        Documents read from disk are cached until the file changes, so the
+        returned object is shared and must be saved back after modification.
+        
+        Args:
+            path: File to read
+            
+        Returns:
+            The parsed document, or None if it doesn't exist
+        """
+        with self._lock:
+            if self._pending is not None:
+                if path in self._pending:
+                    return _loads(self._pending[path])
+                if path in self._pending_unlinks:
+                    return None
+        
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._cache.pop(path, None)
+            return None
+        
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        data = _loads(path.read_bytes())
+        self._cache[path] = (st.st_mtime_ns, st.st_size, data)
+        return data
+    
+    def save_story_state(self, state: Dict[str, Any], sync: bool = False):
         """Save the current story state.
         
         Args:
             state: The story state to save
+            sync: Whether to fsync the history log before returning
         """
-        # Add timestamp
-        state["last_updated"] = datetime.now().isoformat()
+        data = self._write_json("story/current_state.json", state)
         
-        # Save current state
-        with open(self.base_path / "story/current_state.json", "w") as f:
-            json.dump(state, f, indent=2)
+        # Append to history, one JSON document per line
+        self._append_bytes(self.base_path / "story/history.jsonl", data + b"\n", sync)
+    
+    def get_story_history(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over past story states, oldest first, without loading them all.
         
-        # Append to history
-        history_file = self.base_path / "story/history.json"
-        history = []
+        Yields:
+            Each saved story state
+        """
+        history_file = self.base_path / "story/history.jsonl"
         if history_file.exists():
-            with open(history_file, "r") as f:
-                history = json.load(f)
+            with open(history_file, "rb") as f:
+                for line in f:
+                    if line.strip():
+                        yield _loads(line)
         
-        history.append(state)
-        with open(history_file, "w") as f:
-            json.dump(history, f, indent=2)
+        # States saved in the open batch come last
+        with self._lock:
+            pending_lines = list(self._pending_appends.get(history_file, ()))
+        for line in pending_lines:
+            yield _loads(line)
     
     def get_story_state(self) -> Dict[str, Any]:
         """Get the current story state.
         
+        The result is cached and shared; save it back after modifying it.
+        
         Returns:
             The current story state
         """
-        state_file = self.base_path / "story/current_state.json"
-        if state_file.exists():
-            with open(state_file, "r") as f:
-                return json.load(f)
-        return {}
+        state = self._read_json(self.base_path / "story/current_state.json")
+        return state if state is not None else {}
     
     def save_npc_state(self, npc_id: str, state: Dict[str, Any]):
         """Save NPC state.
@@ -75,27 +398,48 @@ class DocumentManager:
             npc_id: The NPC's unique identifier
             state: The NPC's state to save
         """
-        # Add timestamp
-        state["last_updated"] = datetime.now().isoformat()
+        if self._db is not None:
+            state["last_updated"] = self._now()
+            self._db.put_npc(npc_id, _dumps(state), state["last_updated"])
+            return
         
-        # Save to active NPCs
-        with open(self.base_path / f"npcs/active/{npc_id}.json", "w") as f:
-            json.dump(state, f, indent=2)
+        self._write_json(f"npcs/active/{npc_id}.json", state)
     
     def get_npc_state(self, npc_id: str) -> Optional[Dict[str, Any]]:
         """Get NPC state.
         
+        The result is cached and shared; save it back after modifying it.
+        
         Args:
             npc_id: The NPC's unique identifier
             
         Returns:
             The NPC's state, or None if not found
         """
-        npc_file = self.base_path / f"npcs/active/{npc_id}.json"
-        if npc_file.exists():
-            with open(npc_file, "r") as f:
-                return json.load(f)
-        return None
+        if self._db is not None:
+            data = self._db.get_npc(npc_id)
+            return _loads(data) if data is not None else None
+        return self._read_json(self.base_path / f"npcs/active/{npc_id}.json")
+    
+    def iter_active_npcs(self) -> Iterator[Tuple[str, int]]:
+        """Iterate over active NPCs without reading their documents.
+        
+        Uses os.scandir so each entry's stat comes from the directory listing
+        where the platform provides it. In database mode the modification
+        time is reported as 0.
+        
+        Yields:
+            Each active NPC's ID and its document's modification time in nanoseconds
+        """
+        if self._db is not None:
+            for npc_id in self._db.iter_npc_ids():
+                yield npc_id, 0
+            return
+        
+        with os.scandir(self.base_path / "npcs/active") as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and Path(entry.path) not in self._pending_unlinks:
+                    yield entry.name[:-len(".json")], entry.stat(follow_symlinks=False).st_mtime_ns
     
     def archive_npc(self, npc_id: str):
         """Move NPC from active to history.
@@ -103,18 +447,62 @@ class DocumentManager:
         Args:
             npc_id: The NPC's unique identifier
         """
+        if self._db is not None:
+            state = self.get_npc_state(npc_id)
+            if state is not None:
+                state["archived_at"] = self._now()
+                self._db.archive_npc(npc_id, _dumps(state), state["archived_at"])
+            return
+        
         active_file = self.base_path / f"npcs/active/{npc_id}.json"
-        history_file = self.base_path / f"npcs/history/{npc_id}.json"
         
-        if active_file.exists():
-            with open(active_file, "r") as f:
-                state = json.load(f)
-            state["archived_at"] = datetime.now().isoformat()
+        # An NPC read earlier is usually still cached, so this is just a stat
+        state = self._read_json(active_file)
+        if state is not None:
+            # The cached document is shared, so the archive stamp goes on a copy
+            state = dict(state)
+            
+            # Archives are compressed when zstandard is installed
+            if zstandard is not None:
+                state["archived_at"] = self._now()
+                compressor = zstandard.ZstdCompressor(level=ARCHIVE_COMPRESSION_LEVEL)
+                self._write_bytes(self.base_path / f"npcs/history/{npc_id}.json.zst",
+                                  compressor.compress(_dumps(state)))
+            else:
+                self._write_json(f"npcs/history/{npc_id}.json", state, stamp_key="archived_at")
             
-            with open(history_file, "w") as f:
-                json.dump(state, f, indent=2)
+            # Inside a batch the active copy stays on disk until the archive is written
+            with self._lock:
+                if self._pending is not None:
+                    self._pending.pop(active_file, None)
+                    self._pending_unlinks.add(active_file)
+                    return
+            active_file.unlink(missing_ok=True)
+            self._cache.pop(active_file, None)
+    
+    def get_archived_npc_state(self, npc_id: str) -> Optional[Dict[str, Any]]:
+        """Get the state of an archived NPC, compressed or not.
+        
+        Args:
+            npc_id: The NPC's unique identifier
             
-            active_file.unlink()
+        Returns:
+            The archived NPC's state, or None if not found
+        """
+        if self._db is not None:
+            data = self._db.get_npc(npc_id, archived=True)
+            return _loads(data) if data is not None else None
+        
+        compressed_file = self.base_path / f"npcs/history/{npc_id}.json.zst"
+        if zstandard is not None:
+            with self._lock:
+                data = self._pending.get(compressed_file) if self._pending is not None else None
+            if data is None and compressed_file.exists():
+                data = compressed_file.read_bytes()
+            if data is not None:
+                return _loads(zstandard.ZstdDecompressor().decompress(data))
+        
+        return self._read_json(self.base_path / f"npcs/history/{npc_id}.json")
     
     def save_quest_state(self, quest_id: str, state: Dict[str, Any]):
         """Save quest state.
@@ -123,33 +511,47 @@ class DocumentManager:
             quest_id: The quest's unique identifier
             state: The quest's state to save
         """
-        # Add timestamp
-        state["last_updated"] = datetime.now().isoformat()
+        if self._db is not None:
+            state["last_updated"] = self._now()
+            self._db.put_quest(quest_id, state.get("status"), _dumps(state), state["last_updated"])
+            return
         
         # Determine if quest is active or completed
         directory = "active" if state.get("status") != "completed" else "completed"
+        self._set_quest_directory(quest_id, directory)
         
-        with open(self.base_path / f"quests/{directory}/{quest_id}.json", "w") as f:
-            json.dump(state, f, indent=2)
+        self._write_json(f"quests/{directory}/{quest_id}.json", state)
     
     def get_quest_state(self, quest_id: str) -> Optional[Dict[str, Any]]:
         """Get quest state.
         
+        The result is cached and shared; save it back after modifying it.
+        
         Args:
             quest_id: The quest's unique identifier
             
         Returns:
             The quest's state, or None if not found
         """
-        # Check active quests first
-        quest_file = self.base_path / f"quests/active/{quest_id}.json"
-        if not quest_file.exists():
-            # Check completed quests
-            quest_file = self.base_path / f"quests/completed/{quest_id}.json"
+        if self._db is not None:
+            data = self._db.get_quest(quest_id)
+            return _loads(data) if data is not None else None
+        
+        # Known quests go straight to their directory
+        directory = self._quest_status.get(quest_id)
+        if directory is not None:
+            state = self._read_json(self.base_path / f"quests/{directory}/{quest_id}.json")
+            if state is not None:
+                return state
         
-        if quest_file.exists():
-            with open(quest_file, "r") as f:
-                return json.load(f)
+        # Check active quests first, then completed ones
+        for directory in ("active", "completed"):
+            quest_file = self.base_path / f"quests/{directory}/{quest_id}.json"
+            if self._exists(quest_file):
+                self._set_quest_directory(quest_id, directory)
+                return self._read_json(quest_file)
+        
+        self._set_quest_directory(quest_id, None)
         return None
     
     def save_game_state(self, state: Dict[str, Any]):
@@ -158,20 +560,86 @@ class DocumentManager:
         Args:
             state: The game state to save
         """
-        # Add timestamp
-        state["last_updated"] = datetime.now().isoformat()
-        
-        with open(self.base_path / "game_state/world_state.json", "w") as f:
-            json.dump(state, f, indent=2)
+        self._write_json("game_state/world_state.json", state)
     
     def get_game_state(self) -> Dict[str, Any]:
         """Get overall game state.
         
+        The result is cached and shared; save it back after modifying it.
+        
         Returns:
             The current game state
         """
-        state_file = self.base_path / "game_state/world_state.json"
-        if state_file.exists():
-            with open(state_file, "r") as f:
-                return json.load(f)
-        return {} 
\ No newline at end of file
+        state = self._read_json(self.base_path / "game_state/world_state.json")
+        return state if state is not None else {}
+    
+    def export(self, relative_path: str) -> Optional[str]:
+        """Pretty-print a stored document for debugging.
+        
+        Documents are stored as compact JSON; this renders one indented.
+        
+        Args:
+            relative_path: Path of the document under the base path
+            
+        Returns:
+            The indented JSON, or None if the document doesn't exist
+        """
+        data = self._read_json(self.base_path / relative_path)
+        if data is None:
+            return None
+        return json.dumps(data, indent=2)
+    
+    def close(self):
+        """Flush any open batch and release the database and save threads."""
+        self.commit_batch()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    async def _run_in_executor(self, func, *args):
+        """Run a blocking save on the manager's thread pool.
+        
+        Args:
+            func: The save method to run
+            *args: Arguments for the save method
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=SAVE_WORKERS, thread_name_prefix="docsave")
+        await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    async def save_story_state_async(self, state: Dict[str, Any]):
+        """Save the current story state without blocking the event loop.
+        
+        Args:
+            state: The story state to save
+        """
+        await self._run_in_executor(self.save_story_state, state)
+    
+    async def save_npc_state_async(self, npc_id: str, state: Dict[str, Any]):
+        """Save NPC state without blocking the event loop.
+        
+        Args:
+            npc_id: The NPC's unique identifier
+            state: The NPC's state to save
+        """
+        await self._run_in_executor(self.save_npc_state, npc_id, state)
+    
+    async def save_quest_state_async(self, quest_id: str, state: Dict[str, Any]):
+        """Save quest state without blocking the event loop.
+        
+        Args:
+            quest_id: The quest's unique identifier
+            state: The quest's state to save
+        """
+        await self._run_in_executor(self.save_quest_state, quest_id, state)
+    
+    async def save_game_state_async(self, state: Dict[str, Any]):
+        """Save overall game state without blocking the event loop.
+        
+        Args:
+            state: The game state to save
+        """
+        await self._run_in_executor(self.save_game_state, state)
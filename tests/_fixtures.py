@@ -0,0 +1,20 @@
+"""
+Shared, expensive-to-build objects for the test scripts.
+"""
+import functools
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+@functools.lru_cache(maxsize=1)
+def shared_tile_indexer():
+    """Build the tile indexer once and hand the same instance to every test.
+    
+    Returns:
+        TileIndexer: The shared tile indexer
+    """
+    from src.core.tile_indexer import TileIndexer
+    return TileIndexer()
@@ -6,6 +6,7 @@ import sys
 import json
 import asyncio
 import logging
+import tempfile
 from pathlib import Path
 
 # Add src to Python path
@@ -14,12 +15,16 @@ sys.path.append(str(Path(__file__).parent.parent))
 from src.core.game import Game
 from src.core.ui import UIManager, Button, TextBox, Panel
 from src.core.game_state import GameState
-from src.core.scene import SceneManager, MainMenuScene, GameplayScene
+from src.core.scene import SceneManager, SceneID, MainMenuScene, GameplayScene
 
 def test_ui_system():
     """Test the UI system components."""
     print("Starting UI system test...")
     
+    # Run headless unless a display driver was chosen explicitly
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    
     # Initialize pygame
     import pygame
     pygame.init()
@@ -72,6 +77,30 @@ def test_ui_system():
     
     print("UI elements created and configured")
     
+    # Without the interactive flag, render and dispatch one event instead of running the timed loop
+    if not os.getenv("AIDV_UI_INTERACTIVE"):
+        ui_manager.render(screen)
+        ui_manager.handle_event(pygame.event.Event(pygame.MOUSEMOTION,
+                                                   {"pos": (0, 0), "rel": (0, 0), "buttons": (0, 0, 0)}))
+        
+        # A button moved after the panel was added must be clickable at its new position
+        new_game_btn.x, new_game_btn.y = 600, 500
+        ui_manager.handle_event(pygame.event.Event(pygame.MOUSEMOTION,
+                                                   {"pos": (700, 520), "rel": (0, 0), "buttons": (0, 0, 0)}))
+        ui_manager.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, {"pos": (700, 520), "button": 1}))
+        assert title_text.text == "Starting new game..."
+        
+        # Attributes assigned directly show up in the pre-rendered surfaces
+        load_game_btn.width, load_game_btn.color = 200, (10, 20, 30)
+        surface, _ = load_game_btn.get_fblit_entry()
+        assert surface.get_width() == 200 and surface.get_at((5, 5))[:3] == (10, 20, 30)
+        title_text.background_color = (90, 0, 0)
+        surface, _ = title_text.get_fblit_entry()
+        assert surface.get_at((5, 5))[:3] == (90, 0, 0)
+        pygame.quit()
+        print("UI system test completed")
+        return
+    
     # Main loop
     running = True
     clock = pygame.time.Clock()
@@ -134,6 +163,51 @@ def test_game_state():
     
     print("Game state tests passed!")
 
+def test_bulk_updates():
+    """Test batched quest and NPC updates, including malformed entries."""
+    print("Starting bulk update test...")
+    
+    import tempfile
+    from src.tools.templates.quest import QuestTemplate, QuestType, QuestObjective
+    from src.utils.document_manager import DocumentManager
+    
+    game_state = GameState()
+    with tempfile.TemporaryDirectory() as docs_dir:
+        game_state.document_manager = DocumentManager(docs_dir)
+        
+        # One quest with a required and an optional objective, and one NPC
+        game_state.template_manager.quest_generator.register_template("bulk_quest", QuestTemplate(
+            title="Bulk Quest",
+            description="Collect things",
+            quest_type=QuestType.SIDE,
+            objectives=[
+                QuestObjective(description="Collect pelts", target="pelt", count=3),
+                QuestObjective(description="Find herbs", target="herb", count=2, is_optional=True)
+            ],
+            rewards={},
+            prerequisites=[]
+        ))
+        quest = game_state.template_manager.generate_quest("bulk_quest")
+        quest["status"] = "in_progress"
+        game_state.document_manager.save_quest_state("bulk_quest", quest)
+        game_state.document_manager.save_npc_state("bulk_npc", {"interaction_history": []})
+        
+        game_state.update_quests_bulk([
+            {"quest_id": "bulk_quest", "objective": "Find herbs", "progress": 1},
+            {"quest_id": "bulk_quest", "objective": "Collect pelts"},
+            {"quest_id": "missing_quest", "objective": "Collect pelts", "progress": 1},
+            {"quest_id": "bulk_quest", "objective": "Collect pelts", "progress": 3}
+        ])
+        quest = game_state.document_manager.get_quest_state("bulk_quest")
+        assert quest["progress"] == {"Collect pelts": 3, "Find herbs": 1}
+        assert quest["status"] == "completed"
+        
+        game_state.record_npc_interactions_bulk({"bulk_npc": "Well met!", "other_npc": None})
+        history = game_state.document_manager.get_npc_state("bulk_npc")["interaction_history"]
+        assert [entry["text"] for entry in history] == ["Well met!"]
+    
+    print("Bulk update tests passed!")
+
 def test_scene_system():
     """Test the scene management system."""
     print("Starting scene system test...")
@@ -170,6 +244,320 @@ def test_scene_system():
     pygame.quit()
     print("Scene system tests passed!")
 
+def test_lazy_scene_registration():
+    """Test that scenes registered by factory are built on first entry."""
+    print("Starting lazy scene registration test...")
+    
+    import pygame
+    pygame.init()
+    
+    game_state = GameState()
+    scene_manager = SceneManager(game_state)
+    
+    # Register by class; nothing should be constructed yet
+    scene_manager.register_scene(SceneID.MAIN_MENU, MainMenuScene)
+    assert scene_manager.scenes[SceneID.MAIN_MENU] is None
+    
+    scene_manager.change_scene(SceneID.MAIN_MENU)
+    menu = scene_manager.current_scene
+    assert isinstance(menu, MainMenuScene)
+    
+    # Re-entering the scene reuses the same instance
+    scene_manager.change_scene("main_menu")
+    assert scene_manager.current_scene is menu
+    assert game_state.current_scene == "main_menu"
+    
+    pygame.quit()
+    print("Lazy scene registration tests passed!")
+
+def test_story_wrap():
+    """Test story text layout in the gameplay scene."""
+    print("Starting story wrap test...")
+    
+    import pygame
+    pygame.init()
+    
+    scene = GameplayScene(GameState())
+    
+    # Highlighted words are colored and every line fits the box
+    lines = scene._wrap("You arrive in *Eldergrove* at dusk. " * 10, 300)
+    assert len(lines) > 1
+    words = [word for line in lines for word in line]
+    assert ("Eldergrove", (255, 255, 0)) in words
+    assert ("arrive", (255, 255, 255)) in words
+    for line in lines:
+        width = sum(scene._text_width(word) for word, _ in line) + scene._space_w * (len(line) - 1)
+        assert width < 300
+    
+    pygame.quit()
+    print("Story wrap tests passed!")
+
+def test_scene_keywords():
+    """Test that scene keywords are found inside compound words."""
+    from _fixtures import shared_tile_indexer
+    from src.core.scene_description import SceneDescriber, SceneElement
+    
+    describer = SceneDescriber(shared_tile_indexer())
+    plain = describer.describe_scene("An empty field")
+    for description in ("A farmhouse", "A greenhouse", "A treehouse"):
+        composition = describer.describe_scene(description)
+        assert len(composition.structures) > 0, description
+    
+    # "Treehouse" holds two keywords, "Wildflowers" two from the same group
+    assert len(describer.describe_scene("A treehouse").features) > 0
+    assert describer.describe_scene("Wildflowers").base_terrain == SceneElement.GRASS_WILD
+    assert len(plain.structures) == 0 and len(plain.features) == 0
+    print("Scene keyword tests passed!")
+
+def test_document_db(tmp_path):
+    """Test the SQLite document backend through DocumentManager."""
+    print("Starting document database test...")
+    
+    from src.utils.document_manager import DocumentManager
+    
+    manager = DocumentManager(str(tmp_path), use_database=True)
+    
+    # Active NPCs round-trip and are listed
+    manager.save_npc_state("guard", {"mood": "calm"})
+    manager.save_npc_state("smith", {"mood": "busy"})
+    assert manager.get_npc_state("guard")["mood"] == "calm"
+    assert sorted(npc_id for npc_id, _ in manager.iter_active_npcs()) == ["guard", "smith"]
+    
+    # Archiving moves the NPC out of the active set
+    manager.archive_npc("guard")
+    assert manager.get_npc_state("guard") is None
+    assert manager.get_archived_npc_state("guard")["mood"] == "calm"
+    assert [npc_id for npc_id, _ in manager.iter_active_npcs()] == ["smith"]
+    
+    # Saving the NPC again keeps its archive
+    manager.save_npc_state("guard", {"mood": "back"})
+    assert manager.get_npc_state("guard")["mood"] == "back"
+    assert manager.get_archived_npc_state("guard")["mood"] == "calm"
+    
+    # Quests round-trip and are replaced on save
+    manager.save_quest_state("rats", {"status": "in_progress"})
+    manager.save_quest_state("rats", {"status": "completed"})
+    assert manager.get_quest_state("rats")["status"] == "completed"
+    assert manager.get_quest_state("missing") is None
+    
+    # Batched writes are visible to the same connection and committed together
+    manager.begin_batch()
+    manager.save_quest_state("wolves", {"status": "in_progress"})
+    manager.save_npc_state("bard", {"mood": "merry"})
+    assert manager.get_quest_state("wolves")["status"] == "in_progress"
+    manager.commit_batch()
+    manager.close()
+    
+    reopened = DocumentManager(str(tmp_path), use_database=True)
+    assert reopened.get_quest_state("wolves")["status"] == "in_progress"
+    assert reopened.get_npc_state("bard")["mood"] == "merry"
+    assert reopened.get_archived_npc_state("guard")["mood"] == "calm"
+    reopened.close()
+    print("Document database tests passed!")
+
+def test_concurrent_saves(tmp_path):
+    """Test that concurrent async saves keep the quest index complete."""
+    print("Starting concurrent save test...")
+    
+    from src.utils.document_manager import DocumentManager
+    
+    manager = DocumentManager(str(tmp_path))
+    
+    async def save_all():
+        await asyncio.gather(*(
+            manager.save_quest_state_async(f"quest_{i}", {"status": "in_progress" if i % 2 else "completed"})
+            for i in range(40)
+        ))
+    
+    asyncio.run(save_all())
+    manager.close()
+    
+    # Every quest made it into the index written by the last save
+    index = json.loads((tmp_path / "quests/_index.json").read_text())
+    assert len(index) == 40
+    
+    reopened = DocumentManager(str(tmp_path))
+    for i in range(40):
+        expected = "in_progress" if i % 2 else "completed"
+        assert reopened.get_quest_state(f"quest_{i}")["status"] == expected
+    reopened.close()
+    print("Concurrent save tests passed!")
+
+def test_npc_archive(tmp_path):
+    """Test archiving NPCs, compressed when zstandard is installed."""
+    print("Starting NPC archive test...")
+    
+    from src.utils import document_manager
+    from src.utils.document_manager import DocumentManager
+    
+    manager = DocumentManager(str(tmp_path))
+    manager.save_npc_state("guard", {"mood": "calm", "inventory": ["spear"]})
+    manager.archive_npc("guard")
+    
+    # The archive round-trips and the active copy is gone
+    archived = manager.get_archived_npc_state("guard")
+    assert archived["mood"] == "calm" and archived["inventory"] == ["spear"]
+    assert "archived_at" in archived
+    assert manager.get_npc_state("guard") is None
+    suffix = ".json.zst" if document_manager.zstandard is not None else ".json"
+    assert (tmp_path / f"npcs/history/guard{suffix}").exists()
+    
+    # Inside a batch the archive is readable before it reaches disk
+    manager.save_npc_state("smith", {"mood": "busy"})
+    manager.begin_batch()
+    manager.archive_npc("smith")
+    assert manager.get_archived_npc_state("smith")["mood"] == "busy"
+    assert manager.get_npc_state("smith") is None
+    assert (tmp_path / "npcs/active/smith.json").exists()
+    manager.commit_batch()
+    assert not (tmp_path / "npcs/active/smith.json").exists()
+    assert DocumentManager(str(tmp_path)).get_archived_npc_state("smith")["mood"] == "busy"
+    
+    assert manager.get_archived_npc_state("missing") is None
+    manager.close()
+    print("NPC archive tests passed!")
+
+def test_story_history(tmp_path):
+    """Test the JSON Lines story history and migration of the old JSON array."""
+    print("Starting story history test...")
+    
+    from src.utils.document_manager import DocumentManager
+    
+    # A history saved as one JSON array is converted on startup
+    (tmp_path / "story").mkdir(parents=True)
+    (tmp_path / "story/history.json").write_text(json.dumps([{"chapter": 1}, {"chapter": 2}]))
+    manager = DocumentManager(str(tmp_path))
+    assert not (tmp_path / "story/history.json").exists()
+    assert [state["chapter"] for state in manager.get_story_history()] == [1, 2]
+    
+    # Saves append one line each, after the migrated entries
+    manager.save_story_state({"chapter": 3})
+    manager.save_story_state({"chapter": 4}, sync=True)
+    assert manager.get_story_state()["chapter"] == 4
+    assert len((tmp_path / "story/history.jsonl").read_bytes().splitlines()) == 4
+    
+    # States saved in an open batch are listed last
+    manager.begin_batch()
+    manager.save_story_state({"chapter": 5})
+    assert [state["chapter"] for state in manager.get_story_history()] == [1, 2, 3, 4, 5]
+    manager.commit_batch()
+    
+    reopened = DocumentManager(str(tmp_path))
+    assert [state["chapter"] for state in reopened.get_story_history()] == [1, 2, 3, 4, 5]
+    manager.close()
+    reopened.close()
+    print("Story history tests passed!")
+
+def test_quest_index(tmp_path):
+    """Test the quest directory index."""
+    print("Starting quest index test...")
+    
+    from src.utils.document_manager import DocumentManager
+    
+    manager = DocumentManager(str(tmp_path))
+    index_file = tmp_path / "quests/_index.json"
+    
+    # Saving records each quest's directory and moves it on completion
+    manager.save_quest_state("rats", {"status": "in_progress"})
+    manager.save_quest_state("wolves", {"status": "in_progress"})
+    assert json.loads(index_file.read_text()) == {"rats": "active", "wolves": "active"}
+    manager.save_quest_state("rats", {"status": "completed"})
+    assert json.loads(index_file.read_text()) == {"rats": "completed", "wolves": "active"}
+    manager.close()
+    
+    # A new manager finds quests through the saved index
+    reopened = DocumentManager(str(tmp_path))
+    assert reopened.get_quest_state("rats")["status"] == "completed"
+    assert reopened.get_quest_state("wolves")["status"] == "in_progress"
+    assert reopened.get_quest_state("missing") is None
+    reopened.close()
+    
+    # Without the index it is rebuilt from the quest folders
+    index_file.unlink()
+    rebuilt = DocumentManager(str(tmp_path))
+    assert rebuilt.get_quest_state("rats")["status"] == "completed"
+    assert rebuilt.get_quest_state("wolves")["status"] == "in_progress"
+    rebuilt.close()
+    print("Quest index tests passed!")
+
+def test_active_npc_listing(tmp_path):
+    """Test listing active NPCs without reading their documents."""
+    print("Starting active NPC listing test...")
+    
+    from src.utils.document_manager import DocumentManager
+    
+    manager = DocumentManager(str(tmp_path))
+    assert list(manager.iter_active_npcs()) == []
+    
+    manager.save_npc_state("guard", {"mood": "calm"})
+    manager.save_npc_state("smith", {"mood": "busy"})
+    listed = dict(manager.iter_active_npcs())
+    assert sorted(listed) == ["guard", "smith"]
+    assert listed["guard"] == (tmp_path / "npcs/active/guard.json").stat().st_mtime_ns
+    
+    # An NPC archived in an open batch is no longer listed
+    manager.begin_batch()
+    manager.archive_npc("guard")
+    assert [npc_id for npc_id, _ in manager.iter_active_npcs()] == ["smith"]
+    manager.commit_batch()
+    assert [npc_id for npc_id, _ in manager.iter_active_npcs()] == ["smith"]
+    manager.close()
+    print("Active NPC listing tests passed!")
+
+def test_atomic_write(tmp_path):
+    """Test replacing document files without leaving partial or temporary files."""
+    print("Starting atomic write test...")
+    
+    from src.utils.document_manager import _atomic_write_bytes
+    
+    target = tmp_path / "state.json"
+    _atomic_write_bytes(target, b'{"turn":1}')
+    assert target.read_bytes() == b'{"turn":1}'
+    
+    # A shorter replacement leaves nothing of the old contents behind
+    _atomic_write_bytes(target, b"{}", sync=True)
+    assert target.read_bytes() == b"{}"
+    
+    # Large contents are written whole
+    payload = b"x" * (4 * 1024 * 1024)
+    _atomic_write_bytes(target, payload)
+    assert target.read_bytes() == payload
+    
+    assert [path.name for path in tmp_path.iterdir()] == ["state.json"]
+    print("Atomic write tests passed!")
+
+def test_document_cache(tmp_path):
+    """Test that parsed documents are reused until their file changes."""
+    print("Starting document cache test...")
+    
+    from src.utils.document_manager import DocumentManager
+    
+    manager = DocumentManager(str(tmp_path))
+    manager.save_game_state({"turn": 1})
+    state = manager.get_game_state()
+    assert state["turn"] == 1
+    assert manager.get_game_state() is state
+    
+    # Committing a batch only evicts the documents it wrote
+    manager.begin_batch()
+    manager.save_npc_state("guard", {"mood": "calm"})
+    manager.commit_batch()
+    assert manager.get_game_state() is state
+    
+    # Saving through the manager evicts the cached copy
+    manager.save_game_state({"turn": 2})
+    assert manager.get_game_state()["turn"] == 2
+    
+    # A file changed behind the manager's back is read again
+    (tmp_path / "game_state/world_state.json").write_text('{"turn": 30, "edited": true}')
+    assert manager.get_game_state() == {"turn": 30, "edited": True}
+    
+    # A deleted file is no longer served from the cache
+    (tmp_path / "game_state/world_state.json").unlink()
+    assert manager.get_game_state() == {}
+    manager.close()
+    print("Document cache tests passed!")
+
 def main():
     """Run all tests."""
     # Set up logging
@@ -186,9 +574,45 @@ def main():
         print("\n=== Testing game state ===")
         test_game_state()
         
+        print("\n=== Testing bulk updates ===")
+        test_bulk_updates()
+        
         print("\n=== Testing scene system ===")
         test_scene_system()
         
+        print("\n=== Testing lazy scene registration ===")
+        test_lazy_scene_registration()
+        
+        print("\n=== Testing story wrap ===")
+        test_story_wrap()
+        
+        print("\n=== Testing scene keywords ===")
+        test_scene_keywords()
+        
+        print("\n=== Testing document database ===")
+        test_document_db(Path(tempfile.mkdtemp()))
+        
+        print("\n=== Testing concurrent saves ===")
+        test_concurrent_saves(Path(tempfile.mkdtemp()))
+        
+        print("\n=== Testing NPC archive ===")
+        test_npc_archive(Path(tempfile.mkdtemp()))
+        
+        print("\n=== Testing story history ===")
+        test_story_history(Path(tempfile.mkdtemp()))
+        
+        print("\n=== Testing quest index ===")
+        test_quest_index(Path(tempfile.mkdtemp()))
+        
+        print("\n=== Testing active NPC listing ===")
+        test_active_npc_listing(Path(tempfile.mkdtemp()))
+        
+        print("\n=== Testing atomic write ===")
+        test_atomic_write(Path(tempfile.mkdtemp()))
+        
+        print("\n=== Testing document cache ===")
+        test_document_cache(Path(tempfile.mkdtemp()))
+        
         print("\nAll tests completed successfully!")
         
     except Exception as e:
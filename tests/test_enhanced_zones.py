@@ -3,6 +3,7 @@ Test script for the enhanced zone generation system.
 """
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the project root directory to Python path
@@ -14,14 +15,21 @@ def test_enhanced_zones():
     print("Testing enhanced zone generation...")
     
     # Import here to avoid circular imports
+    from src.core.enhanced_tilemap import EnhancedTileset
     from src.core.zone_tile_integration import EnhancedZoneManager
     
-    # Create the enhanced zone manager
-    zone_manager = EnhancedZoneManager()
+    # Create the enhanced zone manager on the organized tile folders
+    tileset = EnhancedTileset(os.path.join(project_root, "game", "assets", "images"))
+    zone_manager = EnhancedZoneManager(tileset)
     
-    # Generate a village zone
-    print("\nGenerating village zone...")
-    village_zone = zone_manager.generate_zone("village", (1, 3), "Eldergrove")
+    # The two zones are independent, so generate them side by side
+    print("\nGenerating village and forest zones...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        village_future = executor.submit(zone_manager.generate_zone, "village", (1, 3), "Eldergrove")
+        forest_future = executor.submit(zone_manager.generate_zone, "forest", (2, 5), "Darkwood")
+        village_zone, forest_zone = village_future.result(), forest_future.result()
+    assert village_zone is not None and forest_zone is not None
+    assert village_zone.zone_id != forest_zone.zone_id
     
     # Print zone info
     print(f"Generated zone: {village_zone.name} ({village_zone.zone_type})")
@@ -31,10 +39,6 @@ def test_enhanced_zones():
     print(f"NPCs: {len(village_zone.npcs)}")
     print(f"Quests: {len(village_zone.quests)}")
     
-    # Generate a forest zone
-    print("\nGenerating forest zone...")
-    forest_zone = zone_manager.generate_zone("forest", (2, 5), "Darkwood")
-    
     # Print zone info
     print(f"Generated zone: {forest_zone.name} ({forest_zone.zone_type})")
     print(f"Description: {forest_zone.description}")
@@ -66,7 +70,7 @@ def test_enhanced_zones():
     print("\nEnhanced zone generation test completed successfully.")
     print("You can now integrate this into your game using:")
     print("from src.core.zone_tile_integration import EnhancedZoneManager")
-    print("zone_manager = EnhancedZoneManager()")
+    print("zone_manager = EnhancedZoneManager(EnhancedTileset())")
     print("village = zone_manager.generate_zone('village', (1, 3))")
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ import sys
 from pathlib import Path
 import json
 import asyncio
+import tempfile
 from datetime import datetime
 
 # Add project root to Python path
@@ -13,6 +14,7 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from src.tools.template_manager import TemplateManager
+from src.utils.document_manager import DocumentManager
 from src.tools.templates.npc import NPCTemplate
 from src.tools.templates.quest import QuestTemplate, QuestType, QuestObjective
 from src.tools.templates.story_event import StoryEventTemplate, EventType, EventImportance
@@ -144,6 +146,19 @@ async def test_template_system():
         "details": "Player accepted the quest"
     })
     
+    # Persist the instances concurrently without blocking the event loop
+    with tempfile.TemporaryDirectory() as docs_dir:
+        document_manager = DocumentManager(docs_dir)
+        await asyncio.gather(
+            document_manager.save_npc_state_async(npc["instance_id"], npc),
+            document_manager.save_quest_state_async(quest["quest_id"], quest),
+            document_manager.save_story_state_async({"current_event": event})
+        )
+        assert document_manager.get_npc_state(npc["instance_id"])["name"] == npc["name"]
+        assert document_manager.get_quest_state(quest["quest_id"])["progress"] == quest["progress"]
+        assert document_manager.get_story_state()["current_event"]["event_id"] == event["event_id"]
+        document_manager.close()
+    
     # Print results
     print("\nGenerated NPC:")
     print(json.dumps(npc, indent=2))
@@ -154,5 +169,66 @@ async def test_template_system():
     print("\nGenerated Event:")
     print(json.dumps(event, indent=2))
 
+def test_instances_are_independent():
+    """Test that instances generated from one template share no mutable state."""
+    from src.tools.templates.npc import NPCGenerator
+    from src.tools.templates.quest import QuestGenerator
+    from src.tools.templates.story_event import StoryEventGenerator
+    
+    quest_generator = QuestGenerator()
+    quest_generator.register_template("gather", QuestTemplate(
+        title="Gather",
+        description="Gather things",
+        quest_type=QuestType.SIDE,
+        objectives=[QuestObjective(description="Collect scales", target="scale", count=5)],
+        rewards={"gold": 10, "items": ["potion"]},
+        prerequisites=[]
+    ))
+    first = quest_generator.generate_quest("gather")
+    second = quest_generator.generate_quest("gather")
+    first["objectives"][0]["current"] = 5
+    first["rewards"]["items"].append("ring")
+    first["prerequisites"].append("intro")
+    assert second["objectives"][0]["current"] == 0
+    assert second["rewards"]["items"] == ["potion"]
+    assert second["prerequisites"] == []
+    assert quest_generator.generate_quest("gather")["rewards"]["items"] == ["potion"]
+    
+    npc_generator = NPCGenerator()
+    npc_generator.register_template("merchant", NPCTemplate(
+        name="Merchant",
+        role="Merchant",
+        background="Sells things",
+        personality={"friendly": 0.8},
+        dialogue_style="formal",
+        appearance={"height": "tall"},
+        skills=["bargaining"],
+        relationships={"player": "neutral"}
+    ))
+    first = npc_generator.generate_npc("merchant")
+    second = npc_generator.generate_npc("merchant")
+    first["skills"].append("appraisal")
+    first["appearance"]["height"] = "short"
+    assert second["skills"] == ["bargaining"]
+    assert second["appearance"] == {"height": "tall"}
+    
+    event_generator = StoryEventGenerator()
+    event_generator.register_template("request", StoryEventTemplate(
+        title="Request",
+        description="A request",
+        event_type=EventType.DECISION,
+        importance=EventImportance.MINOR,
+        location="market",
+        participants=["merchant"],
+        choices=[{"id": "accept", "text": "Accept"}]
+    ))
+    first = event_generator.generate_event("request")
+    second = event_generator.generate_event("request")
+    first["choices"][0]["text"] = "Decline"
+    first["participants"].append("guard")
+    assert second["choices"][0]["text"] == "Accept"
+    assert second["participants"] == ["merchant"]
+
 if __name__ == "__main__":
-    asyncio.run(test_template_system()) 
\ No newline at end of file
+    asyncio.run(test_template_system())
+    test_instances_are_independent() 
\ No newline at end of file
@@ -9,14 +9,14 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
-from src.core.tile_indexer import TileIndexer
+from _fixtures import shared_tile_indexer
 
 def main():
     """Run the tile indexer test."""
     print("Testing the tile indexer system...")
     
     # Initialize the tile indexer
-    indexer = TileIndexer()
+    indexer = shared_tile_indexer()
     
     # Display all tile categories and counts
     print("\nAvailable tile categories:")
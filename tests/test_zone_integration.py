@@ -3,7 +3,8 @@ Test script for the zone-tile integration system that doesn't require pygame.
 """
 import os
 import sys
-import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add the project root directory to Python path
@@ -20,9 +21,20 @@ def test_zone_integration(no_graphics=True):
         # Create a simple mock for pygame to avoid the import error
         class MockPygame:
             class Surface:
+                # Stub surfaces carry no pixel state, so one per size is shared
+                _pool = {}
+                
                 def __init__(self, size):
                     self.size = size
                 
+                @classmethod
+                def of_size(cls, size):
+                    size = tuple(size)
+                    surface = cls._pool.get(size)
+                    if surface is None:
+                        surface = cls._pool[size] = cls(size)
+                    return surface
+                
                 def get_width(self):
                     return self.size[0]
                 
@@ -36,7 +48,7 @@ def test_zone_integration(no_graphics=True):
                     pass
                 
                 def subsurface(self, rect):
-                    return MockPygame.Surface((rect[2], rect[3]))
+                    return MockPygame.Surface.of_size((rect[2], rect[3]))
                 
                 def convert_alpha(self):
                     return self
@@ -50,11 +62,11 @@ def test_zone_integration(no_graphics=True):
             
             @staticmethod
             def image_load(path):
-                return MockPygame.Surface((32, 32))
+                return MockPygame.Surface.of_size((32, 32))
             
             @staticmethod
             def transform_scale(surface, size):
-                return MockPygame.Surface(size)
+                return MockPygame.Surface.of_size(size)
         
         # Create the mock module
         sys.modules['pygame'] = MockPygame
@@ -64,11 +76,11 @@ def test_zone_integration(no_graphics=True):
     print("Testing zone-tile integration...")
     
     # First, test the tile indexing system
-    from src.core.tile_indexer import TileIndexer
+    from _fixtures import shared_tile_indexer
     
     # Initialize the tile indexer
     print("Initializing tile indexer...")
-    indexer = TileIndexer()
+    indexer = shared_tile_indexer()
     
     # Show available categories
     print("\nAvailable tile categories:")
@@ -83,17 +95,8 @@ def test_zone_integration(no_graphics=True):
     config_path = os.path.join(project_root, "game", "assets", "images", "tileset_config.json")
     if not os.path.exists(config_path):
         print("Creating minimal tileset config...")
-        tile_config = {
-            "grass": [0, 1, 2],
-            "water": [3, 4, 5],
-            "trees": [6, 7, 8],
-            "mountains": [9, 10, 11],
-            "houses": [12, 13, 14],
-            "paths": [15, 16, 17]
-        }
         os.makedirs(os.path.dirname(config_path), exist_ok=True)
-        with open(config_path, 'w') as f:
-            json.dump(tile_config, f, indent=2)
+        shutil.copyfile(Path(__file__).parent / "data" / "tileset_config.json", config_path)
     
     # Now test zone integration
     try:
@@ -103,9 +106,12 @@ def test_zone_integration(no_graphics=True):
         # Create the enhanced zone generator
         generator = EnhancedZoneGenerator()
         
-        # Generate a village zone
-        print("Generating village zone...")
-        village_zone = generator.generate_zone("village", (1, 3), "Eldergrove")
+        # The two zones are independent, so generate them side by side
+        print("Generating village and forest zones...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            village_future = executor.submit(generator.generate_zone, "village", (1, 3), "Eldergrove")
+            forest_future = executor.submit(generator.generate_zone, "forest", (2, 5), "Darkwood")
+            village_zone, forest_zone = village_future.result(), forest_future.result()
         
         # Print zone info
         print(f"Generated zone: {village_zone.name} ({village_zone.zone_type})")
@@ -114,10 +120,6 @@ def test_zone_integration(no_graphics=True):
         print(f"Map dimensions: {village_zone.map.width}x{village_zone.map.height}")
         print(f"NPCs: {len(village_zone.npcs)}")
         
-        # Generate a forest zone
-        print("\nGenerating forest zone...")
-        forest_zone = generator.generate_zone("forest", (2, 5), "Darkwood")
-        
         # Print zone info
         print(f"Generated zone: {forest_zone.name} ({forest_zone.zone_type})")
         print(f"Description: {forest_zone.description}")
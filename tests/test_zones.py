@@ -5,6 +5,7 @@ import os
 import sys
 import pygame
 import asyncio
+from collections import deque
 from pathlib import Path
 
 # Add the project root directory to Python path
@@ -12,6 +13,19 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from src.core.zone import ZoneManager, Tileset
+from src.core.scene import render_text
+
+# Number of recent messages shown on screen
+MAX_MESSAGES = 5
+
+# Point size of the app's text, rendered through the shared text cache
+FONT_SIZE = 24
+
+# Direction of the connection leading back through each connection
+_REVERSE_DIR = {"north": "south", "south": "north", "east": "west", "west": "east"}
+
+# Keys that move the test character while held
+_ARROW_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
 
 class ZoneTestApp:
     """Test application for visualizing zones."""
@@ -47,12 +61,22 @@ class ZoneTestApp:
         
         # Test variables
         self.current_zone = None
+        self._conn_px = []  # (direction, x, y) of each connection marker in map pixels
         self.camera_x = 0
         self.camera_y = 0
-        self.font = pygame.font.Font(None, 24)
+        
+        # Camera limits and centering offsets for the current zone, set on entering it
+        self._cam_max_x = 0
+        self._cam_max_y = 0
+        self._cam_offset_x = 0
+        self._cam_offset_y = 0
         self.test_char_x = 0
         self.test_char_y = 0
-        self.messages = []
+        
+        # 1 while an arrow key is held, tracked from key events so update()
+        # doesn't need to poll the whole keyboard every frame
+        self._held = dict.fromkeys(_ARROW_KEYS, 0)
+        self.messages = deque(maxlen=MAX_MESSAGES)  # Only the latest are shown
         
         # Controls info
         self.controls = [
@@ -68,6 +92,11 @@ class ZoneTestApp:
         # Selected zones for connecting
         self.selected_zones = []
         
+        # Zones in creation order for Tab cycling, and each zone's position in it
+        self._zone_order = []
+        self._zone_positions = {}
+        self._current_zone_idx = -1
+        
         print("Zone System Test initialized")
     
     def generate_test_zone(self, zone_type):
@@ -76,8 +105,9 @@ class ZoneTestApp:
         name = None  # Let the generator name it
         
         zone = self.zone_manager.generate_zone(zone_type, level_range, name)
-        self.zone_manager.set_current_zone(zone.zone_id)
-        self.current_zone = zone
+        self._zone_positions[zone.zone_id] = len(self._zone_order)
+        self._zone_order.append(zone)
+        self._enter_zone(zone)
         
         # Place test character in the center of the zone
         self.test_char_x = zone.map.width // 2
@@ -111,15 +141,56 @@ class ZoneTestApp:
             zone2.map.height // 2
         )
         
+        self._update_connection_markers()
         self.messages.append(f"Connected {zone1.name} to {zone2.name}")
     
+    def _enter_zone(self, zone):
+        """Make a zone the current one.
+        
+        Args:
+            zone: The zone to switch to
+        """
+        self.zone_manager.set_current_zone(zone.zone_id)
+        self.current_zone = zone
+        self._current_zone_idx = self._zone_positions.get(zone.zone_id, -1)
+        self._update_connection_markers()
+        self._update_camera_bounds()
+    
+    def _update_camera_bounds(self):
+        """Recompute the camera limits and centering offsets for the current zone."""
+        if not self.current_zone or not self.current_zone.map:
+            return
+        zone_map = self.current_zone.map
+        tile_size = zone_map.tile_size
+        self._cam_max_x = max(0, zone_map.width * tile_size - 800)
+        self._cam_max_y = max(0, zone_map.height * tile_size - 600)
+        self._cam_offset_x = 400 - tile_size // 2
+        self._cam_offset_y = 300 - tile_size // 2
+    
+    def _update_connection_markers(self):
+        """Recompute where the current zone's connection markers sit on its map."""
+        if not self.current_zone or not self.current_zone.map:
+            self._conn_px = []
+            return
+        tile_size = self.current_zone.map.tile_size
+        self._conn_px = [(direction, connection["x"] * tile_size, connection["y"] * tile_size)
+                         for direction, connection in self.current_zone.connections.items()]
+    
     def handle_events(self):
         """Handle pygame events."""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type == pygame.KEYUP:
+                if event.key in self._held:
+                    self._held[event.key] = 0
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                # Key releases outside the window are never seen, so let go of everything
+                self._held = dict.fromkeys(_ARROW_KEYS, 0)
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+                if event.key in self._held:
+                    self._held[event.key] = 1
+                elif event.key == pygame.K_ESCAPE:
                     self.running = False
                 elif event.key == pygame.K_z:
                     # Generate village zone
@@ -140,31 +211,20 @@ class ZoneTestApp:
                     self.connect_zones()
                 elif event.key == pygame.K_TAB:
                     # Switch to the next zone
-                    zones = list(self.zone_manager.zones.values())
-                    if zones:
-                        current_index = zones.index(self.current_zone) if self.current_zone in zones else -1
-                        next_index = (current_index + 1) % len(zones)
-                        self.current_zone = zones[next_index]
-                        self.zone_manager.set_current_zone(self.current_zone.zone_id)
+                    if self._zone_order:
+                        next_index = (self._current_zone_idx + 1) % len(self._zone_order)
+                        self._enter_zone(self._zone_order[next_index])
                         self.messages.append(f"Switched to zone: {self.current_zone.name}")
     
     def update(self):
         """Update the test application state."""
-        keys = pygame.key.get_pressed()
+        keys = self._held
         
         if self.current_zone and self.current_zone.map:
-            # Move test character
-            new_x, new_y = self.test_char_x, self.test_char_y
+            # Move test character; opposite keys cancel out
+            new_x = self.test_char_x + keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+            new_y = self.test_char_y + keys[pygame.K_DOWN] - keys[pygame.K_UP]
             
-            if keys[pygame.K_UP]:
-                new_y -= 1
-            if keys[pygame.K_DOWN]:
-                new_y += 1
-            if keys[pygame.K_LEFT]:
-                new_x -= 1
-            if keys[pygame.K_RIGHT]:
-                new_x += 1
-                
             # Check map boundaries
             if 0 <= new_x < self.current_zone.map.width and 0 <= new_y < self.current_zone.map.height:
                 self.test_char_x, self.test_char_y = new_x, new_y
@@ -172,83 +232,70 @@ class ZoneTestApp:
             # Check for zone transitions
             self._check_zone_transitions()
             
-            # Update camera to follow character
+            # Center the camera on the character, within the map's boundaries
             tile_size = self.current_zone.map.tile_size
-            self.camera_x = self.test_char_x * tile_size - 400 + tile_size // 2
-            self.camera_y = self.test_char_y * tile_size - 300 + tile_size // 2
-            
-            # Limit camera to map boundaries
-            map_width = self.current_zone.map.width * tile_size
-            map_height = self.current_zone.map.height * tile_size
-            self.camera_x = max(0, min(self.camera_x, map_width - 800))
-            self.camera_y = max(0, min(self.camera_y, map_height - 600))
+            self.camera_x = min(max(self.test_char_x * tile_size - self._cam_offset_x, 0), self._cam_max_x)
+            self.camera_y = min(max(self.test_char_y * tile_size - self._cam_offset_y, 0), self._cam_max_y)
     
     def _check_zone_transitions(self):
         """Check if test character has reached a zone transition point."""
         if not self.current_zone:
             return
             
-        # Check all connections in the current zone
-        for direction, connection in self.current_zone.connections.items():
-            target_zone_id = connection["target_zone_id"]
-            connection_x = connection["x"]
-            connection_y = connection["y"]
-            
-            # Check if character is at the connection point
-            if (self.test_char_x == connection_x and 
-                self.test_char_y == connection_y):
-                
-                # Get the target zone
-                target_zone = self.zone_manager.get_zone(target_zone_id)
-                if target_zone:
-                    # Find the reverse connection point
-                    reverse_direction = {
-                        "north": "south",
-                        "south": "north",
-                        "east": "west",
-                        "west": "east"
-                    }.get(direction)
-                    
-                    # Find the entry point in the target zone
-                    entry_x, entry_y = 0, 0
-                    if reverse_direction in target_zone.connections:
-                        rev_conn = target_zone.connections[reverse_direction]
-                        if rev_conn["target_zone_id"] == self.current_zone.zone_id:
-                            entry_x = rev_conn["x"]
-                            entry_y = rev_conn["y"]
-                    
-                    # Switch to the new zone
-                    self.zone_manager.set_current_zone(target_zone_id)
-                    self.current_zone = target_zone
-                    
-                    # Position character at entry point
-                    self.test_char_x = entry_x
-                    self.test_char_y = entry_y
-                    
-                    # Add a message about entering the new zone
-                    self.messages.append(f"Entered {target_zone.name}")
-                    break
+        # Look up a connection at the character's tile
+        direction = self.current_zone.connection_points.get((self.test_char_x, self.test_char_y))
+        if direction is None:
+            return
+        
+        target_zone_id = self.current_zone.connections[direction]["target_zone_id"]
+        
+        # Get the target zone
+        target_zone = self.zone_manager.get_zone(target_zone_id)
+        if not target_zone:
+            return
+        
+        # Find the entry point in the target zone
+        reverse_direction = _REVERSE_DIR.get(direction)
+        entry_x, entry_y = 0, 0
+        if reverse_direction in target_zone.connections:
+            rev_conn = target_zone.connections[reverse_direction]
+            if rev_conn["target_zone_id"] == self.current_zone.zone_id:
+                entry_x = rev_conn["x"]
+                entry_y = rev_conn["y"]
+        
+        # Switch to the new zone
+        self._enter_zone(target_zone)
+        
+        # Position character at entry point
+        self.test_char_x = entry_x
+        self.test_char_y = entry_y
+        
+        # Add a message about entering the new zone
+        self.messages.append(f"Entered {target_zone.name}")
     
     def render(self):
         """Render the test application."""
         self.screen.fill((0, 0, 0))  # Black background
         
+        # Text is collected here and blitted in one batch after all shapes
+        ui_blits = []
+        
         # Render current zone if available
         if self.current_zone and self.current_zone.map:
             # Render the zone
             self.current_zone.render(self.screen, self.camera_x, self.camera_y)
             
             # Render zone connections
-            for direction, connection in self.current_zone.connections.items():
-                conn_x = connection["x"] * self.current_zone.map.tile_size - self.camera_x
-                conn_y = connection["y"] * self.current_zone.map.tile_size - self.camera_y
+            for direction, map_x, map_y in self._conn_px:
+                conn_x = map_x - self.camera_x
+                conn_y = map_y - self.camera_y
                 
                 # Draw connection point
                 pygame.draw.rect(self.screen, (255, 255, 0), 
                                  (conn_x, conn_y, self.current_zone.map.tile_size, self.current_zone.map.tile_size), 2)
                 
                 # Draw direction label
-                dir_label = self.font.render(direction, True, (255, 255, 0))
+                dir_label = render_text(FONT_SIZE, direction, (255, 255, 0))
                 self.screen.blit(dir_label, (conn_x, conn_y - 20))
             
             # Render test character
@@ -258,58 +305,68 @@ class ZoneTestApp:
                              (char_x, char_y, self.current_zone.map.tile_size, self.current_zone.map.tile_size))
             
             # Render zone info
-            zone_info = self.font.render(
+            zone_info = render_text(
+                FONT_SIZE,
                 f"Zone: {self.current_zone.name} ({self.current_zone.zone_type}) - Level {self.current_zone.level_range}", 
-                True, (255, 255, 255)
+                (255, 255, 255)
             )
-            self.screen.blit(zone_info, (10, 10))
+            ui_blits.append((zone_info, (10, 10)))
             
             # Render NPCs, enemies, and landmarks count
-            counts = self.font.render(
+            counts = render_text(
+                FONT_SIZE,
                 f"NPCs: {len(self.current_zone.npcs)} | Enemies: {len(self.current_zone.enemies)} | Landmarks: {len(self.current_zone.landmarks)}", 
-                True, (255, 255, 255)
+                (255, 255, 255)
             )
-            self.screen.blit(counts, (10, 40))
+            ui_blits.append((counts, (10, 40)))
             
             # Render player position
-            pos_info = self.font.render(
+            pos_info = render_text(
+                FONT_SIZE,
                 f"Position: ({self.test_char_x}, {self.test_char_y})", 
-                True, (255, 255, 255)
+                (255, 255, 255)
             )
-            self.screen.blit(pos_info, (10, 70))
+            ui_blits.append((pos_info, (10, 70)))
         else:
             # Render instructions if no zone is available
-            text = self.font.render("Press Z to generate a village zone or F for a forest zone", True, (255, 255, 255))
-            self.screen.blit(text, (self.screen.get_width() // 2 - text.get_width() // 2, 
-                                  self.screen.get_height() // 2))
+            text = render_text(FONT_SIZE, "Press Z to generate a village zone or F for a forest zone", (255, 255, 255))
+            ui_blits.append((text, (self.screen.get_width() // 2 - text.get_width() // 2,
+                                    self.screen.get_height() // 2)))
         
         # Render selected zones list
         if self.selected_zones:
-            selected_text = self.font.render(
+            selected_text = render_text(
+                FONT_SIZE,
                 f"Selected zones: {', '.join(zone.name for zone in self.selected_zones)}", 
-                True, (255, 255, 0)
+                (255, 255, 0)
             )
-            self.screen.blit(selected_text, (10, 100))
+            ui_blits.append((selected_text, (10, 100)))
         
         # Render controls
         for i, control in enumerate(self.controls):
-            ctrl = self.font.render(control, True, (200, 200, 200))
-            self.screen.blit(ctrl, (10, 400 + i * 25))
+            ctrl = render_text(FONT_SIZE, control, (200, 200, 200))
+            ui_blits.append((ctrl, (10, 400 + i * 25)))
         
         # Render messages
         if self.messages:
-            for i, message in enumerate(self.messages[-5:]):  # Show last 5 messages
-                msg = self.font.render(message, True, (0, 255, 0))
-                self.screen.blit(msg, (10, 130 + i * 25))
+            for i, message in enumerate(self.messages):
+                msg = render_text(FONT_SIZE, message, (0, 255, 0))
+                ui_blits.append((msg, (10, 130 + i * 25)))
         
+        self.screen.blits(ui_blits, doreturn=False)
+        
+        # The whole screen was repainted, so a full flip beats dirty-rect updates
         pygame.display.flip()
     
-    def run(self):
-        """Run the test application."""
+    async def run(self):
+        """Run the test application, yielding to the event loop every frame."""
         while self.running:
             self.handle_events()
             self.update()
             self.render()
+            
+            # Allow other tasks to run, as the game loop does
+            await asyncio.sleep(0)
             self.clock.tick(60)
         
         pygame.quit()
@@ -317,7 +374,7 @@ class ZoneTestApp:
 def main():
     """Run the zone system test."""
     app = ZoneTestApp()
-    app.run()
+    asyncio.run(app.run())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -6,8 +6,14 @@ import os
 import sys
 import json
 from pathlib import Path
+import numpy as np
 import pygame
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Initialize pygame
 pygame.init()
 
@@ -49,18 +55,24 @@ class TileConfigurator:
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Tile Configurator")
         
+        # Match the display's pixel format so the per-frame blit is a plain copy
+        self.tileset_image = self.tileset_image.convert_alpha()
+        
+        # The grid and selection outlines share one overlay that is blitted every
+        # frame and only redrawn, through its pixel array, when the selection
+        # changes; _grid_pixels keeps the bare grid to redraw from
+        self.overlay = self._build_grid_overlay()
+        self._grid_pixels = pygame.surfarray.array2d(self.overlay)
+        self._outline_mask = self._build_outline_mask()
+        
         # Set up the font
         self.font = pygame.font.Font(None, 24)
         
-        # Tile configurations
-        self.tile_types = {
-            "grass": [],
-            "water": [],
-            "trees": [],
-            "mountains": [],
-            "houses": [],
-            "paths": []
-        }
+        # Tile configurations: a sorted array of tile IDs per type, plus the
+        # type that owns each configured tile
+        self.tile_types = {}
+        self.tile_of = {}
+        self._set_tile_types({type_name: [] for type_name in TYPE_COLORS})
         
         # Current state
         self.current_type = "grass"
@@ -84,7 +96,8 @@ class TileConfigurator:
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self._handle_mouse_click(event)
             
-            # Render the screen
+            # Render the screen; every frame repaints all of it, so a full
+            # flip is cheaper than tracking dirty rects
             self.screen.fill(BG_COLOR)
             self._render_tileset()
             self._render_ui()
@@ -151,56 +164,118 @@ class TileConfigurator:
                     # Toggle the tile in the current type
                     self.selected_tile = tile_id
                     
-                    # Add or remove the tile from the current type
-                    if tile_id in self.tile_types[self.current_type]:
-                        self.tile_types[self.current_type].remove(tile_id)
-                    else:
-                        # Remove from other types first
-                        for type_name in self.tile_types:
-                            if tile_id in self.tile_types[type_name]:
-                                self.tile_types[type_name].remove(tile_id)
-                        
-                        # Add to current type
-                        self.tile_types[self.current_type].append(tile_id)
-                        self.tile_types[self.current_type].sort()
+                    # Take the tile away from whichever type has it
+                    owner = self.tile_of.pop(tile_id, None)
+                    if owner is not None:
+                        tile_ids = self.tile_types[owner]
+                        self.tile_types[owner] = np.delete(tile_ids, tile_ids.searchsorted(tile_id))
+                    
+                    # Clicking a tile of the current type just removes it
+                    if owner != self.current_type:
+                        tile_ids = self.tile_types[self.current_type]
+                        self.tile_types[self.current_type] = np.insert(
+                            tile_ids, tile_ids.searchsorted(tile_id), tile_id)
+                        self.tile_of[tile_id] = self.current_type
+                    
+                    self._redraw_tile(tile_id)
     
-    def _render_tileset(self):
-        """Render the tileset with grid and selections."""
-        # Draw the tileset
-        self.screen.blit(self.tileset_image, (-self.scroll_x, -self.scroll_y))
+    def _set_tile_types(self, tile_types):
+        """Replace the tile configuration.
+        
+        Args:
+            tile_types: Mapping of type name to a list of tile IDs
+        """
+        self.tile_types = {type_name: np.unique(np.asarray(tile_ids, dtype=np.int32))
+                           for type_name, tile_ids in tile_types.items()}
+        self.tile_of = {tile_id: type_name
+                        for type_name, tile_ids in self.tile_types.items()
+                        for tile_id in tile_ids.tolist()}
+        self._redraw_overlay()
+    
+    def _build_grid_overlay(self):
+        """Draw the tile grid for the whole tileset onto a transparent surface.
         
-        # Draw grid lines
-        for x in range(0, self.tileset_width * TILE_SIZE, TILE_SIZE):
-            pygame.draw.line(
-                self.screen, GRID_COLOR, 
-                (x - self.scroll_x, 0), 
-                (x - self.scroll_x, self.tileset_height * TILE_SIZE - self.scroll_y)
-            )
+        Returns:
+            The grid overlay, aligned with the tileset image
+        """
+        width = self.tileset_width * TILE_SIZE
+        height = self.tileset_height * TILE_SIZE
         
-        for y in range(0, self.tileset_height * TILE_SIZE, TILE_SIZE):
-            pygame.draw.line(
-                self.screen, GRID_COLOR,
-
-                (0, y - self.scroll_y), 
-                (self.tileset_width * TILE_SIZE - self.scroll_x, y - self.scroll_y)
-            )
+        # One extra pixel each way so the lines' end points are kept
+        overlay = pygame.Surface((width + 1, height + 1), pygame.SRCALPHA)
         
-        # Draw selections for each tile type
-        for type_name, tile_ids in self.tile_types.items():
-            color = TYPE_COLORS.get(type_name, (200, 200, 200))
+        # Every grid line at once, as strided column and row writes
+        pixels = pygame.surfarray.pixels2d(overlay)
+        grid_pixel = overlay.map_rgb(GRID_COLOR) & 0xFFFFFFFF
+        pixels[0:width:TILE_SIZE, :] = grid_pixel
+        pixels[:, 0:height:TILE_SIZE] = grid_pixel
+        del pixels
+        return overlay
+    
+    def _build_outline_mask(self):
+        """Work out which pixels of a tile its selection outline covers.
+        
+        Returns:
+            A TILE_SIZE x TILE_SIZE boolean array, indexed [x, y]
+        """
+        outline = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+        pygame.draw.rect(outline, (255, 255, 255), (0, 0, TILE_SIZE, TILE_SIZE), 2)
+        return pygame.surfarray.array_alpha(outline) > 0
+    
+    def _outline_pixel(self, type_name):
+        """Get the overlay pixel value for a tile type's outline.
+        
+        Args:
+            type_name: Name of the tile type
             
-            for tile_id in tile_ids:
-                tile_x = (tile_id % self.tileset_width) * TILE_SIZE - self.scroll_x
-                tile_y = (tile_id // self.tileset_width) * TILE_SIZE - self.scroll_y
-                
-                # Only draw if visible
-                if (0 <= tile_x < SCREEN_WIDTH and 0 <= tile_y < SCREEN_HEIGHT - 100 and
-                    tile_x + TILE_SIZE > 0 and tile_y + TILE_SIZE > 0):
-                    pygame.draw.rect(
-                        self.screen, color, 
-                        (tile_x, tile_y, TILE_SIZE, TILE_SIZE), 
-                        2
-                    )
+        Returns:
+            The color mapped to the overlay's pixel format
+        """
+        # map_rgb returns a signed int, while the pixel array is unsigned
+        return self.overlay.map_rgb(TYPE_COLORS.get(type_name, (200, 200, 200))) & 0xFFFFFFFF
+    
+    def _redraw_overlay(self):
+        """Redraw the outlines of every configured tile over the bare grid."""
+        num_tiles = self.tileset_width * self.tileset_height
+        width = self.tileset_width * TILE_SIZE
+        height = self.tileset_height * TILE_SIZE
+        
+        pixels = pygame.surfarray.pixels2d(self.overlay)
+        pixels[...] = self._grid_pixels
+        for type_name, tile_ids in self.tile_types.items():
+            # Expand a per-tile flag grid into the outline pixels of each flagged tile
+            tile_ids = tile_ids[tile_ids < num_tiles]
+            selected = np.zeros((self.tileset_width, self.tileset_height), dtype=bool)
+            selected[tile_ids % self.tileset_width, tile_ids // self.tileset_width] = True
+            pixels[:width, :height][np.kron(selected, self._outline_mask)] = self._outline_pixel(type_name)
+        
+        # Release the pixel array so the overlay can be blitted again
+        del pixels
+    
+    def _redraw_tile(self, tile_id):
+        """Redraw one tile's area of the overlay after its type changed.
+        
+        Args:
+            tile_id: ID of the tile to redraw
+        """
+        x = (tile_id % self.tileset_width) * TILE_SIZE
+        y = (tile_id // self.tileset_width) * TILE_SIZE
+        
+        pixels = pygame.surfarray.pixels2d(self.overlay)
+        region = pixels[x:x + TILE_SIZE, y:y + TILE_SIZE]
+        region[...] = self._grid_pixels[x:x + TILE_SIZE, y:y + TILE_SIZE]
+        owner = self.tile_of.get(tile_id)
+        if owner is not None:
+            region[self._outline_mask] = self._outline_pixel(owner)
+        
+        # Release the pixel array so the overlay can be blitted again
+        del region, pixels
+    
+    def _render_tileset(self):
+        """Render the tileset with grid and selections."""
+        offset = (-self.scroll_x, -self.scroll_y)
+        self.screen.blit(self.tileset_image, offset)
+        self.screen.blit(self.overlay, offset)
     
     def _render_ui(self):
         """Render the UI elements."""
@@ -226,8 +301,15 @@ class TileConfigurator:
         """Save the tile configurations to a file."""
         config_path = os.path.splitext(self.tileset_path)[0] + "_config.json"
         
-        with open(config_path, "w") as f:
-            json.dump(self.tile_types, f, indent=2)
+        # orjson writes the ID arrays directly; both paths keep the file indented
+        # so it stays readable and diffable
+        if orjson is not None:
+            with open(config_path, "wb") as f:
+                f.write(orjson.dumps(self.tile_types, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(config_path, "w") as f:
+                json.dump({type_name: tile_ids.tolist() for type_name, tile_ids in self.tile_types.items()},
+                          f, indent=2)
         
         print(f"Configuration saved to: {config_path}")
     
@@ -237,7 +319,7 @@ class TileConfigurator:
         
         if os.path.exists(config_path):
             with open(config_path, "r") as f:
-                self.tile_types = json.load(f)
+                self._set_tile_types(json.load(f))
             
             print(f"Configuration loaded from: {config_path}")
         else:
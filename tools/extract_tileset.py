@@ -18,8 +18,9 @@ def save_tileset(src_path, dest_path):
     # Create directory if it doesn't exist
     os.makedirs(os.path.dirname(dest_path), exist_ok=True)
     
-    # Copy the file
-    shutil.copy(src_path, dest_path)
+    # Copy just the contents; copyfile uses the kernel's zero-copy path
+    # (sendfile on Linux, fcopyfile on macOS) where available
+    shutil.copyfile(src_path, dest_path)
     print(f"Tileset saved to: {dest_path}")
 
 def main():